@@ -0,0 +1,125 @@
+import argparse
+import sys
+
+from benchmarks.baseline import find_regressions, load_baseline, save_baseline
+from benchmarks.suite import BENCHMARKS, MAP_KINDS, iter_cases, run_benchmarks
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time the parsers, the DP matrix, the radars and the invaders on "
+        "synthetic samples, and compare the timings with a baseline.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 300, 1000],
+        help="The widths (and heights) of the maps, e.g. 100 1000 10000.",
+    )
+    parser.add_argument(
+        "--densities",
+        type=float,
+        nargs="+",
+        default=[0.1, 0.3, 0.5],
+        help="The ratios of signal bits of the noise of the maps.",
+    )
+    parser.add_argument(
+        "--invaders",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="The numbers of invaders to scan the maps for.",
+    )
+    parser.add_argument(
+        "--flip-rates",
+        type=float,
+        nargs="+",
+        default=[0.0],
+        help="The ratios of bits of the placed invaders flipped by the noise.",
+    )
+    parser.add_argument(
+        "--signal-thresholds",
+        type=float,
+        nargs="+",
+        default=[None],
+        help="The signal thresholds of the scanners, to trade recall for speed. "
+        "The default one of BasicScanner if not provided.",
+    )
+    parser.add_argument(
+        "--kind",
+        choices=sorted(MAP_KINDS),
+        default="ascii",
+        help="The representation of the maps and invaders.",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=[benchmark.name for benchmark in BENCHMARKS],
+        help="Only run these benchmarks.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--save", metavar="PATH", help="Save the timings as a baseline."
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="Compare the timings with a baseline, and fail on regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="How much slower than the baseline a benchmark may get, e.g. 0.1 for 10%%.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks, and compare them with a baseline if asked to.
+    :return: The exit status, 1 if a benchmark regressed.
+    """
+    args = parse_args(argv)
+    benchmarks = [
+        benchmark
+        for benchmark in BENCHMARKS
+        if args.only is None or benchmark.name in args.only
+    ]
+    cases = list(
+        iter_cases(
+            args.sizes,
+            args.densities,
+            args.invaders,
+            args.kind,
+            args.seed,
+            args.flip_rates,
+            args.signal_thresholds,
+        )
+    )
+    # load the baseline first, so that a wrong path fails before the timings
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    def report(name: str, results: dict[str, float]):
+        line = f"{name}: best {results['best']:.6f}s, median {results['median']:.6f}s"
+        if "recall" in results:
+            line += f", recall {results['recall']:.2%}"
+        print(line)
+
+    results = run_benchmarks(cases, benchmarks, args.repeat, report)
+    if args.save:
+        save_baseline(args.save, results)
+
+    if baseline is None:
+        return 0
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for name, ratio in regressions.items():
+        print(f"REGRESSION {name}: {ratio:.2f}x the baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
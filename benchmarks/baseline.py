@@ -0,0 +1,79 @@
+import json
+import os
+import platform
+
+from benchmarks.suite import SAMPLE_VERSION
+from core.exceptions import InvalidBaselineException
+
+BASELINE_VERSION = 2
+
+
+def save_baseline(path: str | os.PathLike, results: dict[str, dict[str, float]]):
+    """
+    Save the timings of a benchmark run as a JSON baseline, along with the Python
+    version, the machine and the version of the samples they were measured with.
+    :param path: The path of the baseline.
+    :param results: The timings, by benchmark name.
+    """
+    baseline = {
+        "version": BASELINE_VERSION,
+        "sample_version": SAMPLE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_baseline(path: str | os.PathLike) -> dict[str, dict[str, float]]:
+    """
+    Load the timings of a JSON baseline, which must have been measured on the
+    current version of the samples to be comparable.
+    :param path: The path of the baseline.
+    :return: The timings, by benchmark name.
+    """
+    with open(path) as file:
+        try:
+            baseline = json.load(file)
+        except json.JSONDecodeError as error:
+            raise InvalidBaselineException(f"{path} is not valid JSON: {error}")
+
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_VERSION:
+        raise InvalidBaselineException(
+            f"{path} is not a baseline of version {BASELINE_VERSION}."
+        )
+    # the baselines saved before the samples were versioned used the first version
+    sample_version = baseline.get("sample_version", 1)
+    if sample_version != SAMPLE_VERSION:
+        raise InvalidBaselineException(
+            f"{path} was measured on samples of version {sample_version}, not "
+            f"{SAMPLE_VERSION}, save a new baseline."
+        )
+    return baseline["results"]
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> dict[str, float]:
+    """
+    Compare the best timings of a run with the ones of a baseline. The benchmarks
+    missing from either of them are not compared.
+    :param results: The timings of the run, by benchmark name.
+    :param baseline: The timings of the baseline, by benchmark name.
+    :param tolerance: How much slower a benchmark may get before it is a regression,
+    e.g. 0.1 for 10%.
+    :return: The ratio of the timing of the run to the one of the baseline, of each
+    benchmark that got slower than the tolerance allows.
+    """
+    regressions = {}
+    for name, timings in results.items():
+        if name not in baseline:
+            continue
+        ratio = timings["best"] / baseline[name]["best"]
+        if ratio > 1 + tolerance:
+            regressions[name] = ratio
+    return regressions
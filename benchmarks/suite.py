@@ -0,0 +1,332 @@
+from collections.abc import Callable, Iterator
+from itertools import product
+from statistics import median
+from time import perf_counter
+from typing import Any
+
+from core.mixins import DynamicProgrammingMixin
+from invaders.array import ArrayAsciiInvader
+from invaders.ascii import AsciiInvader
+from invaders.base import Invader
+from maps.array import ArrayAsciiMap, ArrayAsciiSphericalMap
+from maps.ascii import AsciiMap, AsciiSphericalMap
+from maps.bitset import BitsetAsciiMap, BitsetAsciiSphericalMap
+from maps.synthetic import SyntheticSample, SyntheticSampleGenerator
+from radars.area import DPAreaRadar
+from radars.spherical import DPSphericalRadar
+from scanners.basic import BasicScanner
+
+KNOWN_INVADERS = [
+    "--o-----o--\n"
+    "---o---o---\n"
+    "--ooooooo--\n"
+    "-oo-ooo-oo-\n"
+    "ooooooooooo\n"
+    "o-ooooooo-o\n"
+    "o-o-----o-o\n"
+    "---oo-oo---\n",
+    "---oo---\n"
+    "--oooo--\n"
+    "-oooooo-\n"
+    "oo-oo-oo\n"
+    "oooooooo\n"
+    "--o--o--\n"
+    "-o-oo-o-\n"
+    "o-o--o-o\n",
+]
+
+# the version of the samples generated by the cases, to bump whenever they change so
+# that the timings of older baselines are not compared with ones on other samples
+SAMPLE_VERSION = 2
+
+# the (area map, spherical map, invader) classes of each kind of representation
+MAP_KINDS = {
+    "ascii": (AsciiMap, AsciiSphericalMap, AsciiInvader),
+    "bitset": (BitsetAsciiMap, BitsetAsciiSphericalMap, AsciiInvader),
+    "array": (ArrayAsciiMap, ArrayAsciiSphericalMap, ArrayAsciiInvader),
+}
+
+
+class BenchmarkCase:
+    """
+    The parameters of a benchmark run: a square synthetic sample of `size` x `size`
+    cells, with a background made of `density` signal bits and invaders whose bits
+    are flipped with a `flip_rate`, scanned for `invaders` invaders by scanners with
+    a `signal_threshold` (the default one of `BasicScanner` if None).
+    """
+
+    __slots__ = (
+        "size",
+        "density",
+        "invaders",
+        "kind",
+        "seed",
+        "flip_rate",
+        "signal_threshold",
+    )
+
+    def __init__(
+        self,
+        size: int,
+        density: float,
+        invaders: int,
+        kind: str = "ascii",
+        seed: int = 0,
+        flip_rate: float = 0.0,
+        signal_threshold: float | None = None,
+    ):
+        self.size = size
+        self.density = density
+        self.invaders = invaders
+        self.kind = kind
+        self.seed = seed
+        self.flip_rate = flip_rate
+        self.signal_threshold = signal_threshold
+
+    @property
+    def map_classes(self) -> tuple[type[AsciiMap], type[AsciiMap]]:
+        area_map_class, spherical_map_class, _ = MAP_KINDS[self.kind]
+        return area_map_class, spherical_map_class
+
+    def get_invaders(self) -> list[Invader]:
+        """
+        The known invaders and then their other orientations, as many as requested.
+        """
+        *_, invader_class = MAP_KINDS[self.kind]
+        known_invaders = [invader_class(pattern) for pattern in KNOWN_INVADERS]
+        invaders = known_invaders + [
+            variant
+            for invader in known_invaders
+            for name, variant in invader.variants.items()
+            if name != "identity"
+        ]
+        return invaders[: self.invaders]
+
+    def get_sample(self) -> SyntheticSample:
+        """
+        Generate the radar sample of the case, with one of the known invaders in a
+        random orientation every 100 x 100 cells or so. The sample does not depend on
+        the invaders searched for, so that all the cases of a map share it.
+        """
+        generator = SyntheticSampleGenerator(
+            [AsciiInvader(pattern) for pattern in KNOWN_INVADERS],
+            background_density=self.density,
+            false_positive_rate=self.flip_rate,
+            false_negative_rate=self.flip_rate,
+            orientations=True,
+            seed=self.seed,
+        )
+        return generator.generate(
+            self.size, self.size, max(1, self.size * self.size // 10000)
+        )
+
+    def get_sample_key(self) -> tuple:
+        return self.size, self.density, self.flip_rate, self.seed
+
+    def get_name(self, benchmark: "Benchmark") -> str:
+        parameters = [f"{name}={getattr(self, name)}" for name in benchmark.parameters]
+        return f"{benchmark.name}[{self.kind},{','.join(parameters)}]"
+
+
+class Benchmark:
+    """
+    An operation to time. `setup` prepares its input from a case and its sample, out
+    of the timing, and `run` is the timed operation, called with that input. When
+    provided, `measure` computes more results from the input once it ran, e.g. the
+    recall of radars.
+
+    `parameters` are the parameters of the cases the benchmark depends on, it is only
+    run once for the cases that only differ by other ones.
+    """
+
+    __slots__ = ("name", "setup", "run", "parameters", "measure")
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[BenchmarkCase, SyntheticSample], Any],
+        run: Callable[[Any], Any],
+        parameters: tuple[str, ...] = ("size", "density", "flip_rate", "invaders"),
+        measure: Callable[[Any, SyntheticSample], dict[str, float]] | None = None,
+    ):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.parameters = parameters
+        self.measure = measure
+
+
+MAP_PARAMETERS = ("size", "density", "flip_rate")
+SCANNER_PARAMETERS = (*MAP_PARAMETERS, "invaders", "signal_threshold")
+
+
+def setup_map_string(case: BenchmarkCase, sample: SyntheticSample):
+    area_map_class, _ = case.map_classes
+    return area_map_class, sample.ascii_string
+
+
+def parse_map(prepared: tuple[type[AsciiMap], str]):
+    map_class, map_string = prepared
+    map_class(map_string)
+
+
+def setup_map(case: BenchmarkCase, sample: SyntheticSample):
+    area_map_class, _ = case.map_classes
+    return sample.to_map(area_map_class)
+
+
+def setup_area_radars(case: BenchmarkCase, sample: SyntheticSample):
+    return setup_radars(case, sample, spherical=False)
+
+
+def setup_spherical_radars(case: BenchmarkCase, sample: SyntheticSample):
+    return setup_radars(case, sample, spherical=True)
+
+
+def setup_radars(case: BenchmarkCase, sample: SyntheticSample, spherical: bool):
+    area_map_class, spherical_map_class = case.map_classes
+    map_ = sample.to_map(spherical_map_class if spherical else area_map_class)
+    radar_class = DPSphericalRadar if spherical else DPAreaRadar
+    return [
+        radar_class(map_, BasicScanner(inv, signal_threshold=case.signal_threshold))
+        for inv in case.get_invaders()
+    ]
+
+
+def scan_radars(radars: list[DPAreaRadar]):
+    for radar in radars:
+        radar.scan()
+
+
+def measure_recall(
+    radars: list[DPAreaRadar], sample: SyntheticSample
+) -> dict[str, float]:
+    """
+    Compute the ratio of the placed invaders searched for that the radars found.
+    """
+    identified_invaders = [
+        inv for radar in radars for inv in radar.get_identified_invaders()
+    ]
+    invaders = [radar.scanner.invader_target for radar in radars]
+    return {"recall": sample.compute_recall(identified_invaders, invaders)}
+
+
+def setup_frames(case: BenchmarkCase, sample: SyntheticSample):
+    """
+    Cut the frames of the invaders along the diagonal of the map.
+    """
+    area_map_class, _ = case.map_classes
+    map_ = sample.to_map(area_map_class)
+    frames = []
+    for invader in case.get_invaders():
+        for i in range(min(map_.width - invader.width, map_.height - invader.height)):
+            x_end, y_end = i + invader.width - 1, i + invader.height - 1
+            frames.append((invader, map_.get_frame_at(i, i, x_end, y_end)))
+    return frames
+
+
+def match_frames(frames: list[tuple[Invader, Any]]):
+    for invader, frame in frames:
+        invader.match_against_frame(frame)
+
+
+BENCHMARKS = [
+    Benchmark("parse_map", setup_map_string, parse_map, MAP_PARAMETERS),
+    Benchmark(
+        "compute_dp_matrix",
+        setup_map,
+        DynamicProgrammingMixin.compute_dp_matrix,
+        MAP_PARAMETERS,
+    ),
+    Benchmark(
+        "dp_area_radar_scan",
+        setup_area_radars,
+        scan_radars,
+        SCANNER_PARAMETERS,
+        measure_recall,
+    ),
+    Benchmark(
+        "dp_spherical_radar_scan",
+        setup_spherical_radars,
+        scan_radars,
+        SCANNER_PARAMETERS,
+        measure_recall,
+    ),
+    Benchmark(
+        "match_against_frame",
+        setup_frames,
+        match_frames,
+        (*MAP_PARAMETERS, "invaders"),
+    ),
+]
+
+
+def time_benchmark(
+    benchmark: Benchmark, case: BenchmarkCase, sample: SyntheticSample, repeat: int
+) -> dict[str, float]:
+    """
+    Time a benchmark `repeat` times, each time on a freshly prepared input, since
+    radars only scan once and maps memoize what is derived from them.
+    :return: The best and median timings, in seconds, along with the measures of the
+    benchmark if any.
+    """
+    timings = []
+    for _ in range(repeat):
+        prepared = benchmark.setup(case, sample)
+        start = perf_counter()
+        benchmark.run(prepared)
+        timings.append(perf_counter() - start)
+    results = {"best": min(timings), "median": median(timings), "repeat": repeat}
+    if benchmark.measure is not None:
+        results.update(benchmark.measure(prepared, sample))
+    return results
+
+
+def iter_cases(
+    sizes: list[int],
+    densities: list[float],
+    invaders: list[int],
+    kind: str = "ascii",
+    seed: int = 0,
+    flip_rates: list[float] = (0.0,),
+    signal_thresholds: list[float | None] = (None,),
+) -> Iterator[BenchmarkCase]:
+    for size, density, flip_rate, invaders_count, signal_threshold in product(
+        sizes, densities, flip_rates, invaders, signal_thresholds
+    ):
+        yield BenchmarkCase(
+            size, density, invaders_count, kind, seed, flip_rate, signal_threshold
+        )
+
+
+def run_benchmarks(
+    cases: list[BenchmarkCase],
+    benchmarks: list[Benchmark] = BENCHMARKS,
+    repeat: int = 3,
+    report: Callable[[str, dict[str, float]], None] | None = None,
+) -> dict[str, dict[str, float]]:
+    """
+    Time every benchmark on every case. A benchmark is only timed once for the cases
+    that only differ by parameters it does not depend on.
+    :param cases: The cases to run the benchmarks on.
+    :param benchmarks: The benchmarks to run.
+    :param repeat: The number of times each benchmark is timed.
+    :param report: A function called with the name and results of each benchmark as
+    soon as it is timed.
+    :return: The results, by benchmark name.
+    """
+    results = {}
+    samples = {}
+    for case in cases:
+        sample_key = case.get_sample_key()
+        if sample_key not in samples:
+            samples[sample_key] = case.get_sample()
+        sample = samples[sample_key]
+        for benchmark in benchmarks:
+            name = case.get_name(benchmark)
+            if name in results:
+                continue
+            results[name] = time_benchmark(benchmark, case, sample, repeat)
+            if report is not None:
+                report(name, results[name])
+    return results
@@ -0,0 +1,121 @@
+import os
+from pathlib import Path
+
+from core.mixins import DynamicProgrammingMixin
+from core.utils import np, require_numpy
+from maps.base import Map
+
+
+class SummedAreaTableCache:
+    """
+    A directory of summed-area tables (the DP matrices of `DynamicProgrammingMixin`),
+    each in its own `.npy` file named after the content hash of its map and its
+    padding, so that the tables of a map are computed only once across processes.
+
+    Tables are memory-mapped when they are loaded for NumPy-backed maps, and turned
+    back into lists for the other ones. Every use of a table refreshes the
+    modification time of its file, and the least recently used files are evicted
+    once the directory grows bigger than `max_size` bytes.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    extension = ".npy"
+
+    def __init__(self, directory: str | os.PathLike, max_size: int = 1 << 30):
+        require_numpy("The summed-area table cache")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+
+    @classmethod
+    def next_to(cls, sample_path: str | os.PathLike, max_size: int = 1 << 30):
+        """
+        Build a cache in a hidden directory next to a radar sample file.
+        :param sample_path: The path of the radar sample.
+        :param max_size: The maximum size of the cache, in bytes.
+        :return: The cache.
+        """
+        return cls(Path(sample_path).parent / ".sat-cache", max_size)
+
+    def get_path(self, content_hash: str, pad_width: int, pad_height: int) -> Path:
+        return (
+            self.directory / f"{content_hash}-{pad_width}x{pad_height}{self.extension}"
+        )
+
+    def get_dp_matrix(
+        self, map_: Map, pad_width: int = 0, pad_height: int = 0
+    ) -> list[list[int]]:
+        """
+        Load the DP matrix of the map from the cache, computing and saving it first if
+        it is not there yet, or if its file is corrupted.
+        :param map_: The map.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
+        :return: The DP matrix, as a copy-on-write memory map for NumPy-backed maps,
+        and as lists otherwise.
+        """
+        path = self.get_path(map_.content_hash, pad_width, pad_height)
+        try:
+            # a copy-on-write mapping lets radars update the matrix without touching
+            # the file
+            dp_matrix = np.load(path, mmap_mode="c", allow_pickle=False)
+        except (OSError, ValueError):
+            dp_matrix = None
+
+        expected_shape = (map_.height + pad_height, map_.width + pad_width)
+        if dp_matrix is None or dp_matrix.shape != expected_shape:
+            dp_matrix = DynamicProgrammingMixin.compute_dp_matrix(
+                map_, pad_width, pad_height
+            )
+            self.store(path, dp_matrix)
+            return dp_matrix
+
+        os.utime(path)
+        representation = map_.get_binary_representation()
+        if isinstance(representation, np.ndarray):
+            return dp_matrix
+        return dp_matrix.tolist()
+
+    def store(self, path: Path, dp_matrix: list[list[int]]):
+        """
+        Save a DP matrix, and evict the least recently used ones if the cache is full.
+        :param path: The path of the file to save it to.
+        :param dp_matrix: The DP matrix.
+        """
+        array = np.asarray(dp_matrix)
+        if array.dtype == object or array.dtype.itemsize > 4:
+            # lists of Python ints are stored as small as their largest value allows
+            dtype = np.int32 if array.size and array.max() < 2**31 else np.int64
+            array = array.astype(dtype)
+
+        # write to a temporary file first, so that concurrent readers never see a
+        # partially written file
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "wb") as file:
+            np.save(file, array, allow_pickle=False)
+        os.replace(temporary_path, path)
+        self.evict(keep=path)
+
+    def evict(self, keep: Path | None = None):
+        """
+        Remove the least recently used files until the cache fits in `max_size`.
+        :param keep: A file that must not be removed, e.g. the one just saved.
+        """
+        entries = []
+        for path in self.directory.glob(f"*{self.extension}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # removed by another process in the meantime
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total_size -= size
@@ -24,3 +24,31 @@ class MapTooSmallException(Exception):
 
 class NoSignalException(Exception):
     pass
+
+
+class NonRectangularMatrixException(Exception):
+    pass
+
+
+class MissingDependencyException(Exception):
+    pass
+
+
+class InvalidMapChangeException(Exception):
+    pass
+
+
+class InvalidCompiledInvaderException(Exception):
+    pass
+
+
+class IncompatibleMapViewException(Exception):
+    pass
+
+
+class InvalidBaselineException(Exception):
+    pass
+
+
+class NoScannerException(Exception):
+    pass
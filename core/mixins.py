@@ -1,5 +1,13 @@
-from core.exceptions import InvalidAsciiCharacterException
-from core.types import Frame
+from collections.abc import Iterator
+from itertools import accumulate
+from operator import add
+
+from core.exceptions import (
+    InvalidAsciiCharacterException,
+    NonRectangularMatrixException,
+)
+from core.types import Frame, PackedFrame
+from core.utils import np, require_numpy
 from maps.base import Map
 
 
@@ -22,18 +30,275 @@ class AsciiToBinaryMixin:
         if not ascii_string:
             return Frame([])
 
-        matrix = []
-        for row in ascii_string.split("\n"):
-            matrix_row = []
-            for char in row:
-                if char not in "-o":
-                    raise InvalidAsciiCharacterException(
-                        f"Found {char} character. Only `o` and `-` are allowed."
-                    )
+        translation = bytes.maketrans(b"-o", b"\x00\x01")
+        return Frame(
+            [
+                list(row.encode("ascii").translate(translation))
+                for row in AsciiToBinaryMixin.split_ascii_string(ascii_string)
+            ]
+        )
 
-                matrix_row.append(int(char == "o"))
-            matrix.append(matrix_row)
-        return Frame(matrix)
+    @staticmethod
+    def convert_packed_rows_to_bytes(rows: list[int], width: int) -> bytes:
+        """
+        Converts rows packed into integers, where bit `j` holds column `j`, into one
+        byte of value 0 or 1 per cell, row after row.
+
+        :param rows: The packed rows.
+        :param width: The number of columns.
+        :return: The converted cells.
+        """
+        if not rows:
+            return b""
+
+        # pack all the rows into one integer, the first row in the lowest bits, so that
+        # its binary string is formatted at once; that string starts with its highest
+        # bit, i.e. the last column of the last row
+        packed_rows = 0
+        for row in reversed(rows):
+            packed_rows = (packed_rows << width) | row
+        translation = bytes.maketrans(b"01", b"\x00\x01")
+        return (
+            f"{packed_rows:0{width * len(rows)}b}"[::-1].encode().translate(translation)
+        )
+
+    @staticmethod
+    def convert_packed_rows_to_binary_matrix(rows: list[int], width: int) -> Frame:
+        """
+        Converts rows packed into integers, where bit `j` holds column `j`, into a
+        binary matrix.
+
+        :param rows: The packed rows.
+        :param width: The number of columns.
+        :return: The converted binary matrix.
+        """
+        cells = AsciiToBinaryMixin.convert_packed_rows_to_bytes(rows, width)
+        return Frame(
+            [
+                list(cells[start : start + width])
+                for start in range(0, len(cells), width)
+            ]
+        )
+
+    @staticmethod
+    def split_ascii_string(ascii_string: str) -> list[str]:
+        """
+        Split an ASCII string into rows, validating all of its characters at once
+        with a single set difference, and making sure all rows have the same length.
+
+        :param ascii_string: The ASCII string to split.
+        :return: The rows of the ASCII string.
+        """
+        invalid_chars = set(ascii_string) - set("-o\n")
+        if invalid_chars:
+            index = min(ascii_string.index(char) for char in invalid_chars)
+            y = ascii_string.count("\n", 0, index)
+            x = index - ascii_string.rfind("\n", 0, index) - 1
+            raise InvalidAsciiCharacterException(
+                f"Found {ascii_string[index]} character at row {y}, column {x}. "
+                f"Only `o` and `-` are allowed."
+            )
+
+        rows = ascii_string.split("\n")
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise NonRectangularMatrixException("All rows should have the same length.")
+        return rows
+
+    @staticmethod
+    def get_ascii_buffer_bounds(buffer: bytes) -> tuple[int, int]:
+        """
+        Find where the cells of an ASCII map start and end in a buffer, skipping the
+        `~` fences and the blank space around them.
+
+        :param buffer: A bytes-like object (e.g. a memory-mapped file) holding the map.
+        :return: The start (inclusive) and end (exclusive) offsets of the cells.
+        """
+        start, end = 0, len(buffer)
+        while start < end and buffer[start] in b" ~\r\n":
+            start += 1
+        while end > start and buffer[end - 1] in b" ~\r\n":
+            end -= 1
+        return start, end
+
+    @staticmethod
+    def split_ascii_buffer(buffer: bytes) -> list[bytes]:
+        """
+        Split the cells of an ASCII map held in a buffer into rows, validating them in
+        bulk: each row is checked with a single `bytes.translate` call.
+
+        :param buffer: A bytes-like object (e.g. a memory-mapped file) holding the map.
+        :return: The rows of the map, as bytes.
+        """
+        start, end = AsciiToBinaryMixin.get_ascii_buffer_bounds(buffer)
+        if start == end:
+            return []
+
+        rows = buffer[start:end].split(b"\n")
+        width = len(rows[0].rstrip(b"\r"))
+        for y, row in enumerate(rows):
+            row = rows[y] = row.rstrip(b"\r")
+            invalid_chars = row.translate(None, b"-o")
+            if invalid_chars:
+                x = row.index(invalid_chars[:1])
+                raise InvalidAsciiCharacterException(
+                    f"Found {chr(invalid_chars[0])} character at row {y}, column {x}. "
+                    f"Only `o` and `-` are allowed."
+                )
+            if len(row) != width:
+                raise NonRectangularMatrixException(
+                    "All rows should have the same length."
+                )
+        return rows
+
+    @staticmethod
+    def convert_ascii_buffer_to_binary_matrix(buffer: bytes) -> Frame:
+        """
+        Converts an ASCII map held in a buffer (e.g. a memory-mapped file) into a binary
+        matrix. Each row is translated at once with `bytes.translate`, instead of one
+        character at a time.
+
+        :param buffer: A bytes-like object holding the map, `~` fences included.
+        :return: The converted binary matrix.
+        """
+        translation = bytes.maketrans(b"-o", b"\x00\x01")
+        return Frame(
+            [
+                list(row.translate(translation))
+                for row in AsciiToBinaryMixin.split_ascii_buffer(buffer)
+            ]
+        )
+
+
+class AsciiToArrayMixin(AsciiToBinaryMixin):
+    @staticmethod
+    def convert_ascii_to_binary_matrix(ascii_string: str) -> Frame:
+        """
+        Converts an ASCII string into a NumPy binary matrix (``uint8``), following the
+        same rules as `AsciiToBinaryMixin`. Each cell takes a single byte, instead of
+        a pointer to a boxed Python int.
+
+        :param ascii_string: The ASCII string to convert.
+        :return: The converted binary matrix, as a 2D NumPy array.
+        """
+        numpy = require_numpy("NumPy-backed grids")
+        if not ascii_string:
+            return numpy.zeros((0, 0), dtype=numpy.uint8)
+
+        rows = AsciiToBinaryMixin.split_ascii_string(ascii_string)
+
+        cells = numpy.frombuffer("".join(rows).encode("ascii"), dtype=numpy.uint8)
+        return (cells == ord("o")).astype(numpy.uint8).reshape(len(rows), len(rows[0]))
+
+    @staticmethod
+    def convert_packed_rows_to_binary_matrix(rows: list[int], width: int) -> Frame:
+        numpy = require_numpy("NumPy-backed grids")
+        return numpy.array(
+            AsciiToBinaryMixin.convert_packed_rows_to_binary_matrix(rows, width),
+            dtype=numpy.uint8,
+        ).reshape(len(rows), width)
+
+    @staticmethod
+    def convert_ascii_buffer_to_binary_matrix(buffer: bytes) -> Frame:
+        """
+        Converts an ASCII map held in a buffer (e.g. a memory-mapped file) into a NumPy
+        binary matrix, without building intermediate Python strings or lists.
+
+        The row stride is detected from the first newline, the bytes of the buffer are
+        viewed as a 2D grid with that stride, and the whole grid (cells and line
+        separators) is validated with vectorized comparisons.
+
+        :param buffer: A bytes-like object holding the map, `~` fences included.
+        :return: The converted binary matrix, as a 2D NumPy array.
+        """
+        numpy = require_numpy("NumPy-backed grids")
+        start, end = AsciiToBinaryMixin.get_ascii_buffer_bounds(buffer)
+        if start == end:
+            return numpy.zeros((0, 0), dtype=numpy.uint8)
+
+        first_newline = buffer.find(b"\n", start, end)
+        first_row_end = end if first_newline == -1 else first_newline
+        stride = first_row_end - start + 1
+        width = first_row_end - start - (buffer[first_row_end - 1] == ord("\r"))
+        rows_count, remainder = divmod(end - start - width, stride)
+        if remainder:
+            raise NonRectangularMatrixException("All rows should have the same length.")
+        rows_count += 1
+
+        cells = numpy.frombuffer(
+            buffer, dtype=numpy.uint8, count=end - start, offset=start
+        )
+        separators = numpy.lib.stride_tricks.as_strided(
+            cells[width:], shape=(rows_count - 1, stride - width), strides=(stride, 1)
+        )
+        separator_start, separator_end = start + width, start + stride
+        expected_separator = numpy.frombuffer(
+            buffer[separator_start:separator_end], dtype=numpy.uint8
+        )
+        if (separators != expected_separator).any():
+            raise NonRectangularMatrixException("All rows should have the same length.")
+
+        grid = numpy.lib.stride_tricks.as_strided(
+            cells, shape=(rows_count, width), strides=(stride, 1)
+        )
+        is_signal = grid == ord("o")
+        is_invalid = ~(is_signal | (grid == ord("-")))
+        if is_invalid.any():
+            y, x = numpy.argwhere(is_invalid)[0].tolist()
+            raise InvalidAsciiCharacterException(
+                f"Found {chr(grid[y, x])} character at row {y}, column {x}. "
+                f"Only `o` and `-` are allowed."
+            )
+        return is_signal.view(numpy.uint8)
+
+
+class AsciiToBitsetMixin(AsciiToBinaryMixin):
+    @staticmethod
+    def convert_ascii_to_binary_matrix(ascii_string: str) -> PackedFrame:
+        """
+        Converts an ASCII string into a bit-packed binary matrix, following the same
+        rules as `AsciiToBinaryMixin`. Each row is stored as a single integer, where
+        bit `j` holds column `j`, so a row takes roughly one bit per cell.
+
+        :param ascii_string: The ASCII string to convert.
+        :return: The converted binary matrix, as a `PackedFrame`.
+        """
+        if not ascii_string:
+            return PackedFrame([], 0)
+
+        rows = AsciiToBinaryMixin.split_ascii_string(ascii_string)
+
+        # reverse each row, so that column `j` ends up in bit `j` of the integer
+        translation = str.maketrans("-o", "01")
+        return PackedFrame(
+            [int(row[::-1].translate(translation) or "0", 2) for row in rows],
+            len(rows[0]),
+        )
+
+    @staticmethod
+    def convert_packed_rows_to_binary_matrix(
+        rows: list[int], width: int
+    ) -> PackedFrame:
+        return PackedFrame(list(rows), width)
+
+    @staticmethod
+    def convert_ascii_buffer_to_binary_matrix(buffer: bytes) -> PackedFrame:
+        """
+        Converts an ASCII map held in a buffer (e.g. a memory-mapped file) into a
+        bit-packed binary matrix. Each row is translated and packed at once.
+
+        :param buffer: A bytes-like object holding the map, `~` fences included.
+        :return: The converted binary matrix, as a `PackedFrame`.
+        """
+        rows = AsciiToBinaryMixin.split_ascii_buffer(buffer)
+        if not rows:
+            return PackedFrame([], 0)
+
+        translation = bytes.maketrans(b"-o", b"01")
+        return PackedFrame(
+            [int(row[::-1].translate(translation) or b"0", 2) for row in rows],
+            len(rows[0]),
+        )
 
 
 class BinaryToAsciiMixin:
@@ -47,17 +312,18 @@ class BinaryToAsciiMixin:
         :param binary_matrix: The matrix to convert to ASCII string.
         :return: The converted ASCII string.
         """
-        ascii_string = ""
-        for row in binary_matrix:
-            ascii_string = (
-                f"{ascii_string}{''.join('o' if bit else '-' for bit in row)}\n"
-            )
-        return ascii_string
+        translation = bytes.maketrans(b"\x00\x01", b"-o")
+        return "".join(
+            f"{bytes(map(bool, row)).translate(translation).decode()}\n"
+            for row in binary_matrix
+        )
 
 
 class DynamicProgrammingMixin:
     @staticmethod
-    def compute_dp_matrix(map_: Map) -> list[list[int]]:
+    def compute_dp_matrix(
+        map_: Map, pad_width: int = 0, pad_height: int = 0
+    ) -> list[list[int]]:
         """
         Compute the Dynamic Programming (DP) matrix in which each cell contains the cumulative
         number of signal bits (1s) of the frame that has (0,0) as the top left corner and
@@ -75,22 +341,204 @@ class DynamicProgrammingMixin:
         2 2 4 5 6
         3 4 6 7 9
 
+        The map can also be padded toroidally, i.e. extended on the right with its first
+        `pad_width` columns and at the bottom with its first `pad_height` rows, so that
+        the frames that wrap around a spherical map are plain rectangles of the matrix.
+
         :param map_: The map to process.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
         :return: The DP populated matrix.
         """
+        representation = map_.get_binary_representation()
+        if np is not None and isinstance(representation, np.ndarray):
+            if pad_width or pad_height:
+                representation = np.pad(
+                    representation, ((0, pad_height), (0, pad_width)), mode="wrap"
+                )
+            # int32 is enough to count the signal bits of maps up to ~2 billion cells
+            dtype = np.int32 if representation.size < 2**31 else np.int64
+            return representation.cumsum(axis=0, dtype=dtype).cumsum(axis=1)
+
         dp_matrix = []
-        # create a longer list to simplify DP logic around first row
-        dp_prev_row = [0] * (map_.width + 1)
-        for row in map_.get_binary_representation():
-            # create a longer list to simplify DP logic around first element
-            dp_row = [0] * (len(row) + 1)
-            cumulative_row = dp_row[:]  # make a copy
-
-            for i, bit in enumerate(row):
-                cumulative_row[i + 1] = cumulative_row[i] + bit
-                dp_row[i + 1] = dp_prev_row[i + 1] + bit + cumulative_row[i]
-
-            dp_matrix.append(dp_row[1:])
+        dp_prev_row = [0] * (map_.width + pad_width)
+        for row in DynamicProgrammingMixin.iter_padded_rows(
+            map_, pad_width, pad_height
+        ):
+            # each cell is the cell above it plus the cumulative sum of the row so far
+            dp_row = list(map(add, dp_prev_row, accumulate(row)))
+            dp_matrix.append(dp_row)
             dp_prev_row = dp_row
 
         return dp_matrix
+
+    @staticmethod
+    def update_dp_matrix(
+        dp_matrix: list[list[int]],
+        map_: Map,
+        from_row: int,
+        pad_width: int = 0,
+        pad_height: int = 0,
+    ):
+        """
+        Update in place the DP matrix of a map whose cells changed, from the first row
+        holding a changed cell. The rows above it do not depend on the changed cells,
+        while the ones below it all do, padded rows included.
+        :param dp_matrix: The DP matrix, as computed by `compute_dp_matrix`.
+        :param map_: The map, with the changes applied.
+        :param from_row: The first row of the map holding a changed cell.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
+        """
+        representation = map_.get_binary_representation()
+        if np is not None and isinstance(representation, np.ndarray):
+            rows = np.arange(from_row, map_.height + pad_height) % map_.height
+            block = representation[rows]
+            if pad_width:
+                block = np.concatenate((block, block[:, :pad_width]), axis=1)
+            block = block.cumsum(axis=0, dtype=dp_matrix.dtype).cumsum(axis=1)
+            if from_row:
+                block += dp_matrix[from_row - 1]
+            dp_matrix[from_row:] = block
+            return
+
+        if from_row:
+            dp_prev_row = dp_matrix[from_row - 1]
+        else:
+            dp_prev_row = [0] * (map_.width + pad_width)
+        rows = DynamicProgrammingMixin.iter_padded_rows(
+            map_, pad_width, pad_height, from_row=from_row
+        )
+        for y, row in enumerate(rows, start=from_row):
+            dp_row = list(map(add, dp_prev_row, accumulate(row)))
+            dp_matrix[y] = dp_row
+            dp_prev_row = dp_row
+
+    @staticmethod
+    def iter_padded_rows(
+        map_: Map, pad_width: int = 0, pad_height: int = 0, from_row: int = 0
+    ) -> Iterator[list[int]]:
+        """
+        Iterate over the rows of the map, padded toroidally as in `compute_dp_matrix`.
+        :param map_: The map to process.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
+        :param from_row: The index of the first padded row to yield.
+        :return: A generator of rows, as lists.
+        """
+        representation = map_.get_binary_representation()
+        height = len(representation)
+        for y in range(from_row, height + min(pad_height, height)):
+            # rows are indexed rather than iterated, so skipped rows are not unpacked
+            row = representation[y % height]
+            if np is not None and isinstance(row, np.ndarray):
+                row = row.tolist()
+            if pad_width:
+                row = [*row, *row[:pad_width]]
+            yield row
+
+    @staticmethod
+    def compute_rows_prefix_sums(
+        map_: Map, pad_width: int = 0, pad_height: int = 0
+    ) -> list[list[int]]:
+        """
+        Compute, for each row of the map, the cumulative number of signal bits of its
+        cells, starting with 0. The amount of signal bits of row `y` between columns
+        `x_start` and `x_end` (exclusive) is `prefix_sums[y][x_end] - prefix_sums[y][x_start]`.
+
+        For instance, this map:
+
+        1 0 1 1 0
+        1 1 0 0 1
+
+        Will result in the following prefix sums:
+
+        0 1 1 2 3 3
+        0 1 2 2 2 3
+
+        :param map_: The map to process.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
+        :return: The prefix sums, one list per row.
+        """
+        return [
+            [0, *accumulate(row)]
+            for row in DynamicProgrammingMixin.iter_padded_rows(
+                map_, pad_width, pad_height
+            )
+        ]
+
+    @staticmethod
+    def compute_columns_prefix_sums(
+        map_: Map, pad_width: int = 0, pad_height: int = 0
+    ) -> list[list[int]]:
+        """
+        Compute, for each column of the map, the cumulative number of signal bits of its
+        cells, starting with 0. The amount of signal bits of column `x` between rows
+        `y_start` and `y_end` (exclusive) is `prefix_sums[y_end][x] - prefix_sums[y_start][x]`.
+
+        For instance, this map:
+
+        1 0 1 1 0
+        1 1 0 0 1
+
+        Will result in the following prefix sums:
+
+        0 0 0 0 0
+        1 0 1 1 0
+        2 1 1 1 1
+
+        :param map_: The map to process.
+        :param pad_width: The number of columns to wrap around on the right.
+        :param pad_height: The number of rows to wrap around at the bottom.
+        :return: The prefix sums, one list per row.
+        """
+        prefix_sums = [[0] * (map_.width + pad_width)]
+        for row in DynamicProgrammingMixin.iter_padded_rows(
+            map_, pad_width, pad_height
+        ):
+            prefix_sums.append(list(map(add, prefix_sums[-1], row)))
+        return prefix_sums
+
+    @staticmethod
+    def compute_window_signal_bits_amounts(
+        dp_matrix: list[list[int]], width: int, height: int
+    ) -> list[list[int]]:
+        """
+        Compute the number of signal bits of every `width` x `height` frame of the map
+        at once, using the DP matrix. The cell at [y][x] of the result holds the amount
+        of signal bits in the frame whose top left corner is at (x, y).
+
+        Each amount is computed with the same four lookups described in
+        `DPAreaRadar.compute_frame_signal_bits_amount`, but for NumPy-backed DP matrices
+        the whole map is processed with a single vectorized expression.
+
+        :param dp_matrix: The DP matrix of the map.
+        :param width: The width of the frames.
+        :param height: The height of the frames.
+        :return: The matrix of signal bits amounts, one per frame.
+        """
+        if np is not None and isinstance(dp_matrix, np.ndarray):
+            # pad the DP matrix with a row and a column of zeros on top and on the left
+            padded = np.zeros(
+                (dp_matrix.shape[0] + 1, dp_matrix.shape[1] + 1), dtype=dp_matrix.dtype
+            )
+            padded[1:, 1:] = dp_matrix
+            return (
+                padded[height:, width:]
+                - padded[:-height, width:]
+                - padded[height:, :-width]
+                + padded[:-height, :-width]
+            )
+
+        padded = [[0] * (len(dp_matrix[0]) + 1)]
+        padded.extend([0, *row] for row in dp_matrix)
+        amounts = []
+        for top, bottom in zip(padded, padded[height:]):
+            amounts.append(
+                [
+                    d - c - b + a
+                    for a, b, c, d in zip(top, top[width:], bottom, bottom[width:])
+                ]
+            )
+        return amounts
@@ -1,3 +1,95 @@
 from typing import NewType
 
 Frame = NewType("Frame", list[list[int]])
+
+
+class PackedFrame:
+    """
+    A frame whose rows are packed into integers, where bit `j` of a row holds
+    the value of column `j`.
+
+    Iterating over it or indexing it yields regular rows of 0 and 1, so it can be
+    used wherever a `Frame` is expected, while bit-aware code can work on `rows`.
+    """
+
+    __slots__ = ("rows", "width")
+
+    def __init__(self, rows: list[int], width: int):
+        self.rows = rows
+        self.width = width
+
+    def unpack_row(self, row: int) -> list[int]:
+        return [(row >> j) & 1 for j in range(self.width)]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index: int) -> list[int]:
+        return self.unpack_row(self.rows[index])
+
+    def __iter__(self):
+        for row in self.rows:
+            yield self.unpack_row(row)
+
+    def __eq__(self, other):
+        return list(self) == [list(row) for row in other]
+
+
+class FrameView:
+    """
+    A frame that references the representation of the map it was cut from, instead
+    of holding a copy of its cells. Coordinates wrap around the map borders, so it
+    covers the frames of spherical maps as well.
+
+    Rows are sliced only when they are accessed, and a standalone copy of the frame
+    is only built when `materialize` is called (or when the view is pickled).
+    """
+
+    __slots__ = ("representation", "x_start", "y_start", "width", "height")
+
+    def __init__(
+        self,
+        representation: Frame,
+        x_start: int,
+        y_start: int,
+        width: int,
+        height: int,
+    ):
+        self.representation = representation
+        self.x_start = x_start
+        self.y_start = y_start
+        self.width = width
+        self.height = height
+
+    def materialize(self) -> Frame:
+        return Frame(list(self))
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, index: int) -> list[int]:
+        if index < 0:
+            index += self.height
+        if not 0 <= index < self.height:
+            raise IndexError("Frame row index out of range")
+
+        row = self.representation[(self.y_start + index) % len(self.representation)]
+        x_start = self.x_start
+        x_end = x_start + self.width
+        if x_end <= len(row):
+            return row[x_start:x_end]
+        return row[x_start:] + row[: x_end - len(row)]
+
+    def __iter__(self):
+        for index in range(self.height):
+            yield self[index]
+
+    def __eq__(self, other):
+        return list(self) == [list(row) for row in other]
+
+    def __reduce__(self):
+        # only the cells of the frame are pickled, not the whole map
+        return list, (self.materialize(),)
+
+    def __repr__(self):
+        return f"FrameView({self.materialize()})"
@@ -0,0 +1,21 @@
+from core.exceptions import MissingDependencyException
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def require_numpy(feature: str):
+    """
+    Make sure the optional NumPy dependency is available before using a feature
+    that relies on it.
+
+    :param feature: The name of the feature that needs NumPy, used in the error message.
+    :return: The numpy module.
+    """
+    if np is None:
+        raise MissingDependencyException(
+            f"{feature} requires numpy. Install it with `poetry install --extras numpy`."
+        )
+    return np
@@ -0,0 +1,33 @@
+from core.exceptions import EmptyFrameException, NonMatchingFramesException
+from core.mixins import AsciiToArrayMixin
+from core.types import Frame
+from core.utils import np
+from invaders.ascii import AsciiInvader
+
+
+class ArrayAsciiInvader(AsciiToArrayMixin, AsciiInvader):
+    """
+    An invader represented as ASCII characters, stored as a NumPy array under the hood.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    def match_against_frame(self, frame: Frame) -> float:
+        self.validate_frame(frame)
+        matched_bits = int((np.asarray(frame) == self.pattern).sum())
+        return matched_bits / self.number_of_total_bits
+
+    def match_against_frame_with_threshold(
+        self, frame: Frame, similarity_threshold: float
+    ) -> float:
+        # the vectorized comparison of the whole frame costs less than stopping early
+        return self.match_against_frame(frame)
+
+    def validate_frame(self, frame: Frame):
+        if len(frame) == 0:
+            raise EmptyFrameException()
+        if np.shape(frame) != self.pattern.shape:
+            raise NonMatchingFramesException()
+
+    def compute_number_of_signal_bits(self) -> int:
+        return int(self.pattern.sum())
@@ -3,39 +3,77 @@ from core.exceptions import (
     NonMatchingFramesException,
     EmptyInvaderException,
 )
-from core.mixins import AsciiToBinaryMixin
+from core.mixins import AsciiToBinaryMixin, BinaryToAsciiMixin
 from core.types import Frame
 from invaders.base import Invader
+from invaders.compiled import CompiledInvader, CompiledPattern
 
 
-class AsciiInvader(AsciiToBinaryMixin, Invader):
+class AsciiInvader(AsciiToBinaryMixin, BinaryToAsciiMixin, Invader):
     """
     An invader represented as ASCII characters.
     """
 
+    # the compiled form the invader was loaded from, if any
+    compiled: CompiledInvader | None = None
+
     def __init__(self, ascii_string: str):
         cleaned_ascii_string = ascii_string.strip("~\n")
         binary_matrix = self.convert_ascii_to_binary_matrix(cleaned_ascii_string)
 
-        if not binary_matrix:
+        if len(binary_matrix) == 0:
             raise EmptyInvaderException("An Invader's pattern should not be empty.")
 
         super().__init__(binary_matrix)
 
+    @classmethod
+    def from_binary_matrix(cls, binary_matrix: Frame) -> "AsciiInvader":
+        return cls(cls.convert_binary_matrix_to_ascii(binary_matrix))
+
+    @classmethod
+    def from_compiled(cls, compiled: CompiledInvader) -> "AsciiInvader":
+        """
+        Build an invader from its compiled form, without parsing any ASCII nor
+        computing its derived data. Its orientations are built from the compiled form
+        as well, the first time they are needed.
+        :param compiled: The compiled invader.
+        :return: The invader.
+        """
+        invader = cls.from_compiled_pattern(compiled.identity)
+        invader.compiled = compiled
+        return invader
+
+    @classmethod
+    def from_compiled_pattern(cls, pattern: CompiledPattern) -> "AsciiInvader":
+        return cls.from_precomputed(
+            cls.convert_packed_rows_to_binary_matrix(pattern.rows, pattern.width),
+            pattern.number_of_signal_bits,
+            pattern.match_order,
+        )
+
+    def compute_variants(self) -> dict[str, Invader]:
+        if self.compiled is None:
+            return super().compute_variants()
+        return {
+            name: self if name == "identity" else self.from_compiled_pattern(pattern)
+            for name, pattern in self.compiled.patterns.items()
+        }
+
     def match_against_frame(self, frame: Frame) -> float:
         self.validate_frame(frame)
         return super().match_against_frame(frame)
 
+    def match_against_frame_with_threshold(
+        self, frame: Frame, similarity_threshold: float
+    ) -> float:
+        self.validate_frame(frame)
+        return super().match_against_frame_with_threshold(frame, similarity_threshold)
+
     def validate_frame(self, frame: Frame):
-        if not frame:
+        if len(frame) == 0:
             raise EmptyFrameException()
         if len(frame) != len(self.pattern) or len(frame[0]) != len(self.pattern[0]):
             raise NonMatchingFramesException()
 
     def pretty_representation(self):
-        ascii_string = ""
-        for row in self.pattern:
-            ascii_string = (
-                f"{ascii_string}{''.join('o' if bit else '-' for bit in row)}\n"
-            )
-        return ascii_string
+        return self.convert_binary_matrix_to_ascii(self.pattern)
@@ -1,4 +1,6 @@
+import hashlib
 from abc import ABC, abstractmethod
+from operator import eq, ne
 
 from core.exceptions import NoSignalException
 from core.types import Frame
@@ -33,6 +35,9 @@ class Invader(PrettyRepresentationABC, ABC):
         self._number_of_signal_bits = self.compute_number_of_signal_bits()
         self._number_of_total_bits = self.compute_number_of_total_bits()
         self._signal_ratio = self.number_of_signal_bits / self.number_of_total_bits
+        self._match_order = self.compute_match_order()
+        self._max_mismatched_bits: dict[float, int] = {}
+        self._variants: dict[str, "Invader"] | None = None
 
         if self._number_of_signal_bits == 0:
             raise NoSignalException(
@@ -55,6 +60,23 @@ class Invader(PrettyRepresentationABC, ABC):
     def signal_ratio(self) -> float:
         return self._signal_ratio
 
+    @property
+    def match_order(self) -> list[int]:
+        return self._match_order
+
+    @property
+    def variants(self) -> dict[str, "Invader"]:
+        """
+        The distinct orientations of the invader, computed on first access.
+        """
+        if self._variants is None:
+            self._variants = self.compute_variants()
+        return self._variants
+
+    @property
+    def content_hash(self) -> str:
+        return self.compute_content_hash(self.pattern)
+
     @property
     def width(self):
         return len(self.pattern[0])
@@ -74,13 +96,157 @@ class Invader(PrettyRepresentationABC, ABC):
         """
         matched_bits = 0
 
-        for i, row in enumerate(frame):
-            for j, bit in enumerate(row):
-                if frame[i][j] == self.pattern[i][j]:
-                    matched_bits += 1
+        for frame_row, pattern_row in zip(frame, self.pattern):
+            matched_bits += sum(map(eq, frame_row, pattern_row))
 
         return matched_bits / self.number_of_total_bits
 
+    def match_against_frame_with_threshold(
+        self, frame: Frame, similarity_threshold: float
+    ) -> float:
+        """
+        Same as `match_against_frame`, but the rows are compared in `match_order`, and
+        the comparison stops as soon as the frame cannot reach the similarity threshold
+        anymore.
+
+        :param frame: The area of the map that has the size of the invader.
+        :param similarity_threshold: The similarity ratio the frame has to reach.
+        :return: The probability that the invader is represented in the frame, or, if
+        the frame was rejected early, a ratio below the similarity threshold.
+        """
+        max_mismatched_bits = self.get_max_mismatched_bits(similarity_threshold)
+        mismatched_bits = 0
+
+        for index in self.match_order:
+            mismatched_bits += sum(map(ne, frame[index], self.pattern[index]))
+            if mismatched_bits > max_mismatched_bits:
+                break
+
+        return (self.number_of_total_bits - mismatched_bits) / self.number_of_total_bits
+
+    def get_max_mismatched_bits(self, similarity_threshold: float) -> int:
+        """
+        Compute how many bits of a frame can mismatch the pattern while keeping its
+        similarity ratio at or above the threshold.
+        :param similarity_threshold: The similarity ratio the frame has to reach.
+        :return: The maximum number of mismatched bits, -1 if no frame can qualify.
+        """
+        if similarity_threshold not in self._max_mismatched_bits:
+            total_bits = self.number_of_total_bits
+            # start from a slight overestimate and go down, so that the result agrees
+            # with the ratio comparison regardless of floating point rounding
+            max_mismatched_bits = min(
+                total_bits, int((1 - similarity_threshold) * total_bits) + 1
+            )
+            while (
+                max_mismatched_bits >= 0
+                and (total_bits - max_mismatched_bits) / total_bits
+                < similarity_threshold
+            ):
+                max_mismatched_bits -= 1
+            self._max_mismatched_bits[similarity_threshold] = max_mismatched_bits
+
+        return self._max_mismatched_bits[similarity_threshold]
+
+    def compute_match_order(self) -> list[int]:
+        """
+        Compute the order in which the rows of the pattern are compared to a frame, so
+        that frames that are not the invader are rejected as early as possible.
+
+        Frames that reach matching are the ones whose signal ratio is close to the one
+        of the invader, so they are modelled as random noise with that density. Under
+        this model, a signal bit of the pattern mismatches with probability
+        `1 - signal_ratio` and a blank one with probability `signal_ratio`, and the
+        rows with the most expected mismatches come first.
+
+        :return: The indices of the rows of the pattern, in matching order.
+        """
+        signal_ratio = self.signal_ratio
+        expected_mismatches = [
+            signal_bits * (1 - signal_ratio) + (self.width - signal_bits) * signal_ratio
+            for signal_bits in (int(sum(row)) for row in self.pattern)
+        ]
+        return sorted(range(self.height), key=lambda index: -expected_mismatches[index])
+
+    @classmethod
+    def from_precomputed(
+        cls, binary_matrix: Frame, number_of_signal_bits: int, match_order: list[int]
+    ) -> "Invader":
+        """
+        Build an invader whose derived data was computed beforehand, e.g. loaded from
+        a compiled invader, without computing it again.
+        :param binary_matrix: The pattern of the invader.
+        :param number_of_signal_bits: The amount of 1s in the pattern.
+        :param match_order: The order in which the rows of the pattern are matched.
+        :return: The invader.
+        """
+        invader = cls.__new__(cls)
+        invader._pattern = binary_matrix
+        invader._number_of_signal_bits = number_of_signal_bits
+        invader._number_of_total_bits = invader.compute_number_of_total_bits()
+        invader._signal_ratio = number_of_signal_bits / invader._number_of_total_bits
+        invader._match_order = match_order
+        invader._max_mismatched_bits = {}
+        invader._variants = None
+        return invader
+
+    @staticmethod
+    def compute_content_hash(binary_matrix: Frame) -> str:
+        """
+        Compute the SHA-256 of the size and bits of a pattern, which is the same
+        whatever the kind of invader storing it.
+        :param binary_matrix: The pattern.
+        :return: The hexadecimal digest.
+        """
+        digest = hashlib.sha256(
+            f"{len(binary_matrix[0])}x{len(binary_matrix)}\n".encode()
+        )
+        for row in binary_matrix:
+            digest.update(bytes(map(int, row)))
+        return digest.hexdigest()
+
+    @classmethod
+    def from_binary_matrix(cls, binary_matrix: Frame) -> "Invader":
+        """
+        Build an invader of the same kind from a matrix of 0 and 1.
+        :param binary_matrix: The pattern of the invader, as a list of rows.
+        :return: The invader.
+        """
+        raise NotImplementedError("Method not implemented.")
+
+    def compute_variants(self) -> dict[str, "Invader"]:
+        """
+        Compute the 8 orientations of the invader, i.e. its rotations by 0, 90, 180 and
+        270 degrees clockwise, and the ones of its mirror image. Symmetric invaders
+        have fewer distinct orientations, and an orientation that has the same pattern
+        as a previous one is left out.
+
+        :return: The distinct orientations by name, starting with the invader itself
+        as "identity".
+        """
+        pattern = [list(map(int, row)) for row in self.pattern]
+        mirrored_pattern = [row[::-1] for row in pattern]
+        patterns = {}
+        for name, rotated_pattern in (
+            ("identity", pattern),
+            ("mirror", mirrored_pattern),
+        ):
+            prefix = "mirror_" if name == "mirror" else ""
+            for angle in (0, 90, 180, 270):
+                patterns[f"{prefix}rotate_{angle}" if angle else name] = rotated_pattern
+                # rotate clockwise: the bottom row becomes the first column
+                rotated_pattern = [
+                    list(column) for column in zip(*rotated_pattern[::-1])
+                ]
+
+        variants = {"identity": self}
+        seen_patterns = [pattern]
+        for name, variant_pattern in patterns.items():
+            if variant_pattern not in seen_patterns:
+                seen_patterns.append(variant_pattern)
+                variants[name] = self.from_binary_matrix(variant_pattern)
+        return variants
+
     def compute_number_of_signal_bits(self) -> int:
         """
         Compute the amount of 1s in the invader pattern.
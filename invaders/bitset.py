@@ -0,0 +1,66 @@
+from core.exceptions import EmptyFrameException, NonMatchingFramesException
+from core.mixins import AsciiToBitsetMixin
+from core.types import Frame, PackedFrame
+from invaders.ascii import AsciiInvader
+
+
+class BitsetAsciiInvader(AsciiToBitsetMixin, AsciiInvader):
+    """
+    An invader represented as ASCII characters, with each row packed into an integer.
+
+    Matching a frame is done row by row with a XOR and a popcount, instead of
+    comparing every cell.
+    """
+
+    @property
+    def row_masks(self) -> list[int]:
+        return self.pattern.rows
+
+    @property
+    def width(self):
+        return self.pattern.width
+
+    def match_against_frame(self, frame: Frame | PackedFrame) -> float:
+        self.validate_frame(frame)
+        mismatched_bits = sum(
+            (frame_row ^ pattern_row).bit_count()
+            for frame_row, pattern_row in zip(self.pack_frame(frame), self.row_masks)
+        )
+        return (self.number_of_total_bits - mismatched_bits) / self.number_of_total_bits
+
+    def match_against_frame_with_threshold(
+        self, frame: Frame | PackedFrame, similarity_threshold: float
+    ) -> float:
+        self.validate_frame(frame)
+        max_mismatched_bits = self.get_max_mismatched_bits(similarity_threshold)
+        frame_rows = self.pack_frame(frame)
+        row_masks = self.row_masks
+        mismatched_bits = 0
+
+        for index in self.match_order:
+            mismatched_bits += (frame_rows[index] ^ row_masks[index]).bit_count()
+            if mismatched_bits > max_mismatched_bits:
+                break
+
+        return (self.number_of_total_bits - mismatched_bits) / self.number_of_total_bits
+
+    def validate_frame(self, frame: Frame | PackedFrame):
+        if len(frame) == 0:
+            raise EmptyFrameException()
+        frame_width = frame.width if isinstance(frame, PackedFrame) else len(frame[0])
+        if len(frame) != self.height or frame_width != self.width:
+            raise NonMatchingFramesException()
+
+    @staticmethod
+    def pack_frame(frame: Frame | PackedFrame) -> list[int]:
+        """
+        Get the packed rows of a frame, packing them if the frame is a regular one.
+        :param frame: The frame to pack.
+        :return: The rows of the frame, packed into integers.
+        """
+        if isinstance(frame, PackedFrame):
+            return frame.rows
+        return [sum(int(bit) << j for j, bit in enumerate(row)) for row in frame]
+
+    def compute_number_of_signal_bits(self) -> int:
+        return sum(row.bit_count() for row in self.pattern.rows)
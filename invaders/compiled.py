@@ -0,0 +1,368 @@
+import hashlib
+import os
+import struct
+import zlib
+from pathlib import Path
+
+from core.exceptions import InvalidCompiledInvaderException
+from core.mixins import BinaryToAsciiMixin
+from invaders.base import Invader
+
+
+class CompiledPattern:
+    """
+    The pattern of an orientation of an invader, packed one integer per row where bit
+    `j` holds column `j`, along with the data derived from it.
+    """
+
+    __slots__ = ("width", "height", "rows", "number_of_signal_bits", "match_order")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rows: list[int],
+        number_of_signal_bits: int,
+        match_order: list[int],
+    ):
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.number_of_signal_bits = number_of_signal_bits
+        self.match_order = match_order
+
+    @classmethod
+    def from_invader(cls, invader: Invader) -> "CompiledPattern":
+        rows = [
+            sum(int(bit) << j for j, bit in enumerate(row)) for row in invader.pattern
+        ]
+        return cls(
+            invader.width,
+            invader.height,
+            rows,
+            invader.number_of_signal_bits,
+            list(invader.match_order),
+        )
+
+
+class CompiledInvader:
+    """
+    An invader and its distinct orientations, with everything derived from their
+    patterns, in a compact binary form that is loaded without parsing nor computing
+    anything.
+
+    The binary form is made of a header (magic bytes, version and number of patterns),
+    followed by, for each pattern starting with the identity one: its name, width,
+    height, number of signal bits, match order and rows, each row taking as many bytes
+    as needed for its bits.
+    """
+
+    MAGIC = b"INVC"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBB")
+    PATTERN_HEADER = struct.Struct("<HHI")
+    # the struct formats of the rows that fit in a C integer, unpacked all at once
+    ROW_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+    def __init__(self, patterns: dict[str, CompiledPattern] | None):
+        self._patterns = patterns
+        # the binary form of a lazily loaded invader, decoded on first access
+        self._data: bytes | None = None
+
+    @property
+    def patterns(self) -> dict[str, CompiledPattern]:
+        if self._patterns is None:
+            self._patterns = self.decode_patterns(self._data)
+        return self._patterns
+
+    @property
+    def identity(self) -> CompiledPattern:
+        """
+        The pattern of the invader itself, decoded alone if the other ones were not
+        decoded yet.
+        """
+        if self._patterns is not None:
+            return self._patterns["identity"]
+        name, pattern, _ = self.decode_pattern(self._data, self.HEADER.size)
+        if name != "identity":
+            raise InvalidCompiledInvaderException(
+                "The compiled invader is truncated or corrupted."
+            )
+        return pattern
+
+    @classmethod
+    def from_invader(cls, invader: Invader) -> "CompiledInvader":
+        return cls(
+            {
+                name: CompiledPattern.from_invader(variant)
+                for name, variant in invader.variants.items()
+            }
+        )
+
+    def to_bytes(self) -> bytes:
+        chunks = [self.HEADER.pack(self.MAGIC, self.VERSION, len(self.patterns))]
+        # the identity pattern comes first, so that it can be decoded alone
+        for name, pattern in sorted(
+            self.patterns.items(), key=lambda item: item[0] != "identity"
+        ):
+            encoded_name = name.encode()
+            row_size = (pattern.width + 7) // 8
+            chunks.append(bytes([len(encoded_name)]) + encoded_name)
+            chunks.append(
+                self.PATTERN_HEADER.pack(
+                    pattern.width, pattern.height, pattern.number_of_signal_bits
+                )
+            )
+            chunks.append(struct.pack(f"<{pattern.height}H", *pattern.match_order))
+            chunks.extend(row.to_bytes(row_size, "little") for row in pattern.rows)
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, lazy: bool = False) -> "CompiledInvader":
+        """
+        :param data: The binary form of the invader.
+        :param lazy: Whether to only check the header, and decode the patterns when
+        they are first accessed.
+        :return: The compiled invader.
+        """
+        if not lazy:
+            return cls(cls.decode_patterns(data))
+        cls.decode_header(data)
+        compiled = cls(None)
+        compiled._data = data
+        return compiled
+
+    @classmethod
+    def decode_header(cls, data: bytes) -> int:
+        """
+        :return: The number of patterns of the compiled invader.
+        """
+        try:
+            magic, version, number_of_patterns = cls.HEADER.unpack_from(data)
+        except struct.error as error:
+            raise InvalidCompiledInvaderException(
+                "The compiled invader is truncated or corrupted."
+            ) from error
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise InvalidCompiledInvaderException(
+                "Not a compiled invader, or compiled by another version."
+            )
+        return number_of_patterns
+
+    @classmethod
+    def decode_pattern(
+        cls, data: bytes, offset: int
+    ) -> tuple[str, CompiledPattern, int]:
+        """
+        :return: The name and the pattern at the offset, and the offset of the next
+        pattern.
+        """
+        try:
+            name_size = data[offset]
+            name = data[offset + 1 : offset + 1 + name_size].decode()
+            offset += 1 + name_size
+            width, height, number_of_signal_bits = cls.PATTERN_HEADER.unpack_from(
+                data, offset
+            )
+            offset += cls.PATTERN_HEADER.size
+            match_order = list(struct.unpack_from(f"<{height}H", data, offset))
+            offset += 2 * height
+            row_size = (width + 7) // 8
+            if row_size in cls.ROW_FORMATS:
+                rows = list(
+                    struct.unpack_from(
+                        f"<{height}{cls.ROW_FORMATS[row_size]}", data, offset
+                    )
+                )
+            else:
+                rows = [
+                    int.from_bytes(data[start : start + row_size], "little")
+                    for start in range(offset, offset + height * row_size, row_size)
+                ]
+            offset += height * row_size
+        except (struct.error, IndexError, UnicodeDecodeError) as error:
+            raise InvalidCompiledInvaderException(
+                "The compiled invader is truncated or corrupted."
+            ) from error
+        if offset > len(data):
+            raise InvalidCompiledInvaderException(
+                "The compiled invader is truncated or corrupted."
+            )
+        pattern = CompiledPattern(
+            width, height, rows, number_of_signal_bits, match_order
+        )
+        return name, pattern, offset
+
+    @classmethod
+    def decode_patterns(cls, data: bytes) -> dict[str, CompiledPattern]:
+        number_of_patterns = cls.decode_header(data)
+        offset = cls.HEADER.size
+        patterns = {}
+        for _ in range(number_of_patterns):
+            name, patterns[name], offset = cls.decode_pattern(data, offset)
+
+        if offset != len(data) or "identity" not in patterns:
+            raise InvalidCompiledInvaderException(
+                "The compiled invader is truncated or corrupted."
+            )
+        return patterns
+
+
+class InvaderCache:
+    """
+    A library of compiled invaders bundled in a single file, read once and indexed by
+    the SHA-256 of the ASCII pattern of each invader, so that getting an invader from
+    it neither parses its ASCII nor reads a file. Only the pattern of the invader is
+    decoded then, its orientations are decoded the first time they are needed.
+
+    The bundle is made of a header (magic bytes and version), followed by one record
+    per invader: the digest of its ASCII pattern, its content hash (see
+    `Invader.content_hash`), the size and CRC-32 of its compiled form, and its compiled
+    form. The invaders compiled on a cache miss are appended to it, and the records
+    that are truncated or corrupted are ignored, so that they are compiled again.
+    """
+
+    MAGIC = b"INVB"
+    VERSION = 1
+    HEADER = struct.Struct("<4sB")
+    RECORD_HEADER = struct.Struct("<32s32sII")
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        # the (content digest, compiled form) of the invaders by ASCII digest, and the
+        # ASCII digests by content hash, once the bundle is read
+        self._records: dict[bytes, tuple[bytes, bytes]] | None = None
+        self._ascii_digests: dict[str, bytes] = {}
+        # whether the bundle is missing or invalid, and must be written from scratch
+        self._rewrite = False
+
+    @staticmethod
+    def compute_ascii_digest(ascii_string: str) -> bytes:
+        return hashlib.sha256(ascii_string.strip("~\n").encode()).digest()
+
+    def read(self):
+        """
+        Read the records of the bundle, if they were not read yet.
+        """
+        if self._records is not None:
+            return
+        self._records = {}
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            self._rewrite = True
+            return
+        if data[: self.HEADER.size] != self.HEADER.pack(self.MAGIC, self.VERSION):
+            self._rewrite = True
+            return
+
+        offset = self.HEADER.size
+        while offset < len(data):
+            try:
+                (
+                    ascii_digest,
+                    content_digest,
+                    size,
+                    checksum,
+                ) = self.RECORD_HEADER.unpack_from(data, offset)
+            except struct.error:
+                self._rewrite = True
+                break
+            offset += self.RECORD_HEADER.size
+            compiled = data[offset : offset + size]
+            offset += size
+            if len(compiled) != size or zlib.crc32(compiled) != checksum:
+                # the records after a corrupted one cannot be found reliably
+                self._rewrite = True
+                break
+            self.add_record(ascii_digest, content_digest, compiled)
+
+    def add_record(self, ascii_digest: bytes, content_digest: bytes, compiled: bytes):
+        self._records[ascii_digest] = (content_digest, compiled)
+        self._ascii_digests[content_digest.hex()] = ascii_digest
+
+    def pack_record(self, ascii_digest: bytes) -> bytes:
+        content_digest, compiled = self._records[ascii_digest]
+        return (
+            self.RECORD_HEADER.pack(
+                ascii_digest, content_digest, len(compiled), zlib.crc32(compiled)
+            )
+            + compiled
+        )
+
+    def store(self, invader: Invader, ascii_string: str | None = None) -> str:
+        """
+        Compile the invader and add it to the bundle.
+        :param invader: The invader to compile.
+        :param ascii_string: The ASCII pattern the invader will be requested with, by
+        default the one of its pattern.
+        :return: The content hash the invader can be loaded with.
+        """
+        if ascii_string is None:
+            ascii_string = BinaryToAsciiMixin.convert_binary_matrix_to_ascii(
+                invader.pattern
+            )
+        ascii_digest = self.compute_ascii_digest(ascii_string)
+        content_hash = invader.content_hash
+        self.read()
+        self.add_record(
+            ascii_digest,
+            bytes.fromhex(content_hash),
+            CompiledInvader.from_invader(invader).to_bytes(),
+        )
+
+        if not self._rewrite:
+            # a single write, so that concurrent appends do not interleave
+            with open(self.path, "ab") as file:
+                file.write(self.pack_record(ascii_digest))
+            return content_hash
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so that concurrent readers never see a
+        # partially written bundle
+        temporary_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temporary_path.write_bytes(
+            self.HEADER.pack(self.MAGIC, self.VERSION)
+            + b"".join(map(self.pack_record, self._records))
+        )
+        os.replace(temporary_path, self.path)
+        self._rewrite = False
+        return content_hash
+
+    def load(self, content_hash: str, invader_class: type[Invader]) -> Invader | None:
+        """
+        Load a compiled invader, along with its orientations.
+        :param content_hash: The content hash of the invader pattern.
+        :param invader_class: The kind of invader to build.
+        :return: The invader, or None if it is not in the cache.
+        """
+        self.read()
+        ascii_digest = self._ascii_digests.get(content_hash)
+        if ascii_digest is None:
+            return None
+        _, compiled = self._records[ascii_digest]
+        return invader_class.from_compiled(
+            CompiledInvader.from_bytes(compiled, lazy=True)
+        )
+
+    def get(self, ascii_string: str, invader_class: type[Invader]) -> Invader:
+        """
+        Load the invader with the provided pattern from the cache, compiling and adding
+        it first if it is not there yet, or if its record is corrupted.
+        :param ascii_string: The pattern of the invader, as ASCII characters.
+        :param invader_class: The kind of invader to build.
+        :return: The invader.
+        """
+        self.read()
+        record = self._records.get(self.compute_ascii_digest(ascii_string))
+        if record is not None:
+            try:
+                return invader_class.from_compiled(
+                    CompiledInvader.from_bytes(record[1], lazy=True)
+                )
+            except InvalidCompiledInvaderException:
+                pass
+
+        invader = invader_class(ascii_string)
+        self.store(invader, ascii_string)
+        return invader
@@ -1,7 +1,6 @@
 from invaders.ascii import AsciiInvader
 from maps.ascii import AsciiMap, AsciiSphericalMap
-from radars.area import DPAreaRadar
-from radars.spherical import DPSphericalRadar
+from radars.multi import MultiTargetDPAreaRadar, MultiTargetDPSphericalRadar
 from scanners.basic import BasicScanner
 
 if __name__ == "__main__":
@@ -90,31 +89,19 @@ o--oo------o-----oo--o-oo------------oo--o------o--o-------------oo----o--------
     print("Invader 1 ASCII representation:")
     print(invader.pretty_representation())
 
-    # searching for first invader pattern with an area radar
+    # searching for both invader patterns with an area radar,
+    # sharing a single pass over the map
     scanner = BasicScanner(invader)
-    radar = DPAreaRadar(map_, scanner)
-    radar.scan()
-    identified_invaders = radar.get_identified_invaders()
-    for inv in identified_invaders:
-        print(inv.pretty_representation())
-
-    # searching for the second invader pattern with an area radar
     scanner2 = BasicScanner(invader2)
-    radar2 = DPAreaRadar(map_, scanner2)
-    radar2.scan()
-    invader2_frames_coords = radar2.get_identified_invaders()
-    for inv in invader2_frames_coords:
+    radar = MultiTargetDPAreaRadar(map_, [scanner, scanner2])
+    radar.scan()
+    for inv in radar.get_identified_invaders():
         print(inv.pretty_representation())
 
-    # searching for first invader pattern with a spherical radar
-    spherical_map = AsciiSphericalMap(map_string)
-    spherical_radar = DPSphericalRadar(spherical_map, scanner)
+    # searching for both invader patterns with a spherical radar,
+    # on a spherical view of the same parsed map
+    spherical_map = map_.view_as(AsciiSphericalMap)
+    spherical_radar = MultiTargetDPSphericalRadar(spherical_map, [scanner, scanner2])
     spherical_radar.scan()
     for inv in spherical_radar.get_identified_invaders():
         print(inv.pretty_representation())
-
-    # searching for the second invader pattern with a spherical radar
-    spherical_radar2 = DPSphericalRadar(spherical_map, scanner2)
-    spherical_radar2.scan()
-    for inv in spherical_radar2.get_identified_invaders():
-        print(inv.pretty_representation())
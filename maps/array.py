@@ -0,0 +1,50 @@
+from collections.abc import Iterator
+
+from core.mixins import AsciiToArrayMixin
+from core.types import Frame
+from core.utils import np
+from maps.ascii import AsciiMap, AsciiSphericalMap
+
+
+class ArrayAsciiMap(AsciiToArrayMixin, AsciiMap):
+    """
+    A map represented as ASCII characters, stored as a NumPy array under the hood.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    def get_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Frame:
+        return self.representation[y_start : y_end + 1, x_start : x_end + 1]
+
+    def iter_rows_bytes(self) -> Iterator[bytes]:
+        # the cells are contiguous bytes already, hash them in one go
+        yield np.ascontiguousarray(self.representation, dtype=np.uint8).tobytes()
+
+
+class ArrayAsciiSphericalMap(ArrayAsciiMap, AsciiSphericalMap):
+    """
+    A spherical map represented as ASCII characters, stored as a NumPy array under the hood.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    def get_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Frame:
+        """
+        Allows retrieval of frames assuming the map is spherical and coordinates
+        can wrap. Frames that do not wrap are returned as views of the map, while
+        wrapped ones are gathered with modular indexing.
+
+        :param x_start: X coordinate of top-left corner of the frame.
+        :param y_start: Y coordinate of top-left corner of the frame.
+        :param x_end: X coordinate of bottom-right corner of the frame.
+        :param y_end: Y coordinate of bottom-right corner of the frame.
+        :return: The frame.
+        """
+        if x_start <= x_end and y_start <= y_end:
+            return super().get_frame_at(x_start, y_start, x_end, y_end)
+
+        frame_height = (y_end - y_start) % self.height + 1
+        frame_width = (x_end - x_start) % self.width + 1
+        rows = (np.arange(frame_height) + y_start) % self.height
+        cols = (np.arange(frame_width) + x_start) % self.width
+        return self.representation[np.ix_(rows, cols)]
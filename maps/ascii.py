@@ -1,6 +1,9 @@
+import mmap
+import os
+
 from core.exceptions import EmptyMapException
 from core.mixins import AsciiToBinaryMixin, BinaryToAsciiMixin
-from core.types import Frame
+from core.types import Frame, FrameView
 from maps.base import Map
 
 
@@ -14,15 +17,52 @@ class AsciiMap(AsciiToBinaryMixin, BinaryToAsciiMixin, Map):
         binary_matrix = self.convert_ascii_to_binary_matrix(cleaned_ascii_string)
         super().__init__(binary_matrix)
 
-        if not binary_matrix:
+        if len(binary_matrix) == 0:
+            raise EmptyMapException("A Map should not be empty.")
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike):
+        """
+        Build a map from a radar sample file. The file is memory-mapped and its bytes
+        are converted to the binary matrix in bulk, without reading it into a string.
+        :param path: The path of the radar sample.
+        :return: The map.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise EmptyMapException("A Map should not be empty.")
+            # the mapping stays valid once the file is closed, and is released as soon
+            # as the conversion no longer references it
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        binary_matrix = cls.convert_ascii_buffer_to_binary_matrix(buffer)
+        return cls.from_binary_matrix(binary_matrix)
+
+    @classmethod
+    def from_binary_matrix(cls, binary_matrix: Frame):
+        """
+        Build a map directly from its binary matrix, skipping the ASCII parsing.
+        :param binary_matrix: The binary matrix of the map, in the representation
+        used by the map class.
+        :return: The map.
+        """
+        if len(binary_matrix) == 0:
             raise EmptyMapException("A Map should not be empty.")
 
-    def get_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Frame:
-        frame = Frame([])
-        for i in range(y_start, y_end + 1):
-            row = self.representation[i][x_start:x_end + 1]
-            frame.append(row)
-        return frame
+        map_ = cls.__new__(cls)
+        Map.__init__(map_, binary_matrix)
+        return map_
+
+    def get_frame_at(
+        self, x_start: int, y_start: int, x_end: int, y_end: int
+    ) -> FrameView:
+        return FrameView(
+            self.representation,
+            x_start,
+            y_start,
+            x_end - x_start + 1,
+            y_end - y_start + 1,
+        )
 
     def print_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int):
         frame = self.get_frame_at(x_start, y_start, x_end, y_end)
@@ -35,7 +75,9 @@ class AsciiSphericalMap(AsciiMap, Map):
     A map represented as ASCII characters.
     """
 
-    def get_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Frame:
+    def get_frame_at(
+        self, x_start: int, y_start: int, x_end: int, y_end: int
+    ) -> FrameView:
         """
         Allows retrieval of frames assuming the map is spherical and coordinates
         can wrap (i.e. x_end and y_end coordinates can be smaller than x_start and
@@ -47,21 +89,10 @@ class AsciiSphericalMap(AsciiMap, Map):
         :param y_end: Y coordinate of bottom-right corner of the frame.
         :return: The frame.
         """
-        frame = Frame([])
-        if y_start <= y_end:
-            for row in self.representation[y_start:y_end + 1]:
-                frame.append(self.get_row_subset(row, x_start, x_end))
-        else:
-            for row in self.representation[y_start:]:
-                frame.append(self.get_row_subset(row, x_start, x_end))
-            for row in self.representation[:y_end + 1]:
-                frame.append(self.get_row_subset(row, x_start, x_end))
-
-        return frame
-
-    @staticmethod
-    def get_row_subset(row: list[int], x_start: int, x_end: int):
-        if x_start <= x_end:
-            return row[x_start:x_end + 1]
-        else:
-            return row[x_start:] + row[: x_end + 1]
+        return FrameView(
+            self.representation,
+            x_start,
+            y_start,
+            (x_end - x_start) % self.width + 1,
+            (y_end - y_start) % self.height + 1,
+        )
@@ -1,7 +1,14 @@
+import hashlib
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Any, TypeVar
 
+from core.exceptions import IncompatibleMapViewException, InvalidMapChangeException
 from core.types import Frame
 
+T = TypeVar("T")
+MapT = TypeVar("MapT", bound="Map")
+
 
 class Map(ABC):
     """
@@ -19,10 +26,67 @@ class Map(ABC):
     101111000011101
     101000001000001
     000110110000000
+
+    The structures derived from the cells of the map, e.g. the DP matrix of the DP
+    radars, are memoized on the map with `get_derived`, so that all the radars built
+    on it compute them once. They are dropped whenever cells of the map change.
     """
 
     def __init__(self, representation: Frame):
         self.representation = representation
+        self._derived: dict[Hashable, Any] = {}
+
+    def __getstate__(self):
+        # the derived structures can be rebuilt, and may be much bigger than the map
+        state = self.__dict__.copy()
+        state["_derived"] = {}
+        return state
+
+    def get_derived(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """
+        Get a structure derived from the cells of the map, computing it first if it was
+        not computed yet, or if the map changed since.
+        :param key: The key of the structure, along with the parameters it depends on,
+        e.g. ("dp_matrix", pad_width, pad_height).
+        :param factory: The function computing the structure.
+        :return: The structure, shared by everything that asks for the same key.
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            derived = self._derived[key] = factory()
+            return derived
+
+    def set_derived(self, key: Hashable, derived: Any):
+        """
+        Memoize a derived structure, e.g. one that was updated along with the map.
+        """
+        self._derived[key] = derived
+
+    def invalidate_derived(self):
+        # cleared in place, since the views of the map share the dictionary
+        self._derived.clear()
+
+    def view_as(self, map_class: type[MapT]) -> MapT:
+        """
+        Build a map of another class on the same cells, e.g. the spherical view of an
+        area map, without parsing the sample again. The views share their cells and
+        their derived structures, so a change made through one of them is seen by all.
+        :param map_class: The class of the view, storing its cells the same way.
+        :return: The view.
+        """
+        # the classes read their cells the same way only if they store them the same way
+        reading_methods = ("get_cell", "iter_rows_bytes")
+        if any(
+            getattr(type(self), method) is not getattr(map_class, method)
+            for method in reading_methods
+        ):
+            raise IncompatibleMapViewException(
+                f"{map_class.__name__} does not store its cells as {type(self).__name__}."
+            )
+        view = map_class.__new__(map_class)
+        view.__dict__.update(self.__dict__)
+        return view
 
     @abstractmethod
     def print_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int):
@@ -39,9 +103,75 @@ class Map(ABC):
     def height(self):
         return len(self.representation)
 
+    @property
+    def content_hash(self) -> str:
+        """
+        The SHA-256 of the size and cells of the map, which is the same whatever the
+        kind of map storing them.
+        """
+        digest = hashlib.sha256(f"{self.width}x{self.height}\n".encode())
+        for row in self.iter_rows_bytes():
+            digest.update(row)
+        return digest.hexdigest()
+
+    def iter_rows_bytes(self) -> Iterator[bytes]:
+        """
+        Iterate over the rows of the map, as one byte of value 0 or 1 per cell.
+        """
+        for row in self.representation:
+            yield bytes(row)
+
     @abstractmethod
     def get_frame_at(self, x_start: int, y_start: int, x_end: int, y_end: int) -> Frame:
         raise NotImplementedError("Method not implemented.")
 
+    def get_cell(self, x: int, y: int) -> int:
+        return self.representation[y][x]
+
+    def set_cell(self, x: int, y: int, value: int):
+        """
+        Write a cell, without dropping the structures derived from the map: use
+        `apply_changes` to change the cells of a map that radars were built on.
+        """
+        self.representation[y][x] = value
+
+    def validate_changes(self, changes: Iterable[tuple[int, int, int]]):
+        """
+        Check a batch of changes as a whole, so that an invalid one is rejected
+        before any cell of the map is written.
+        :param changes: The (x, y, value) of the changed cells.
+        """
+        for x, y, value in changes:
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise InvalidMapChangeException(
+                    f"Cell ({x}, {y}) is outside of the map."
+                )
+            if value not in (0, 1):
+                raise InvalidMapChangeException("A cell can only be set to 0 or 1.")
+
+    def apply_changes(
+        self, changes: Iterable[tuple[int, int, int]]
+    ) -> list[tuple[int, int]]:
+        """
+        Update the map in place with the cells that changed since it was read, e.g.
+        the cells flipped by a radar between two ticks. The map is left unchanged if
+        any of the changes is invalid.
+        :param changes: The (x, y, value) of the changed cells.
+        :return: The (x, y) of the cells whose value actually changed, in order.
+        """
+        changes = list(changes)
+        self.validate_changes(changes)
+        changed_cells = []
+        try:
+            for x, y, value in changes:
+                if self.get_cell(x, y) != value:
+                    self.set_cell(x, y, value)
+                    changed_cells.append((x, y))
+        finally:
+            # even if writing a cell failed, the derived structures may be out of date
+            if changed_cells:
+                self.invalidate_derived()
+        return changed_cells
+
     def __str__(self):
         return "\n".join(["".join(map(str, row)) for row in self.representation])
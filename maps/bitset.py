@@ -0,0 +1,73 @@
+from collections.abc import Iterator
+
+from core.mixins import AsciiToBitsetMixin
+from core.types import PackedFrame
+from maps.ascii import AsciiMap, AsciiSphericalMap
+
+
+class BitsetAsciiMap(AsciiToBitsetMixin, AsciiMap):
+    """
+    A map represented as ASCII characters, with each row packed into an integer.
+
+    Frames are extracted with shifts and masks and returned as `PackedFrame`s.
+    """
+
+    @property
+    def width(self):
+        return self.representation.width
+
+    def iter_rows_bytes(self) -> Iterator[bytes]:
+        # the rows are unpacked in one go
+        yield self.convert_packed_rows_to_bytes(self.representation.rows, self.width)
+
+    def get_cell(self, x: int, y: int) -> int:
+        return (self.representation.rows[y] >> x) & 1
+
+    def set_cell(self, x: int, y: int, value: int):
+        if value:
+            self.representation.rows[y] |= 1 << x
+        else:
+            self.representation.rows[y] &= ~(1 << x)
+
+    def get_frame_at(
+        self, x_start: int, y_start: int, x_end: int, y_end: int
+    ) -> PackedFrame:
+        frame_width = x_end - x_start + 1
+        mask = (1 << frame_width) - 1
+        rows = [
+            (row >> x_start) & mask
+            for row in self.representation.rows[y_start : y_end + 1]
+        ]
+        return PackedFrame(rows, frame_width)
+
+
+class BitsetAsciiSphericalMap(BitsetAsciiMap, AsciiSphericalMap):
+    """
+    A spherical map represented as ASCII characters, with each row packed into an integer.
+    """
+
+    def get_frame_at(
+        self, x_start: int, y_start: int, x_end: int, y_end: int
+    ) -> PackedFrame:
+        """
+        Allows retrieval of frames assuming the map is spherical and coordinates
+        can wrap. Rows are rotated right by `x_start` bits, so that a wrapped frame
+        is a plain mask of the low bits of the rotated row.
+
+        :param x_start: X coordinate of top-left corner of the frame.
+        :param y_start: Y coordinate of top-left corner of the frame.
+        :param x_end: X coordinate of bottom-right corner of the frame.
+        :param y_end: Y coordinate of bottom-right corner of the frame.
+        :return: The frame.
+        """
+        map_width, map_height = self.width, self.height
+        frame_width = (x_end - x_start) % map_width + 1
+        frame_height = (y_end - y_start) % map_height + 1
+        mask = (1 << frame_width) - 1
+
+        rows = []
+        for i in range(frame_height):
+            row = self.representation.rows[(y_start + i) % map_height]
+            rotated_row = (row >> x_start) | (row << (map_width - x_start))
+            rows.append(rotated_row & mask)
+        return PackedFrame(rows, frame_width)
@@ -0,0 +1,54 @@
+from collections.abc import Iterable, Iterator
+
+from core.exceptions import EmptyMapException, NonRectangularMatrixException
+from core.mixins import AsciiToBinaryMixin
+
+
+class AsciiStreamMap(AsciiToBinaryMixin):
+    """
+    A map represented as ASCII characters, whose rows are read one at a time from
+    a file or an iterator of lines, instead of being loaded in memory all at once.
+
+    Unlike a regular `Map`, it can only be read sequentially, once, by a streaming radar.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self.lines = lines
+        self.width = None
+
+    @classmethod
+    def from_file(cls, path: str):
+        """
+        Build a map that streams the rows of a radar sample file.
+        :param path: The path of the radar sample.
+        :return: The map.
+        """
+        return cls(cls.read_lines(path))
+
+    @staticmethod
+    def read_lines(path: str) -> Iterator[str]:
+        with open(path) as file:
+            yield from file
+
+    def iter_rows(self) -> Iterator[list[int]]:
+        """
+        Convert the lines of the map into binary rows, one at a time, skipping blank
+        lines and `~` fences.
+        :return: A generator of binary rows.
+        """
+        for line in self.lines:
+            line = line.strip(" \r\n")
+            if not line.strip("~"):
+                continue
+
+            [row] = self.convert_ascii_to_binary_matrix(line)
+            if self.width is None:
+                self.width = len(row)
+            elif len(row) != self.width:
+                raise NonRectangularMatrixException(
+                    "All rows should have the same length."
+                )
+            yield row
+
+        if self.width is None:
+            raise EmptyMapException("A Map should not be empty.")
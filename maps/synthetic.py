@@ -0,0 +1,310 @@
+import json
+import os
+import random
+from collections.abc import Iterable
+from pathlib import Path
+
+from core.exceptions import MapTooSmallException
+from invaders.base import IdentifiedInvader, Invader
+from maps.ascii import AsciiMap, AsciiSphericalMap
+
+
+class PlacedInvader:
+    """
+    The ground truth of an invader placed on a synthetic sample: which invader, in
+    which orientation, where, and how many of its bits were flipped by the noise.
+    """
+
+    __slots__ = (
+        "invader_index",
+        "orientation",
+        "content_hash",
+        "frame_coords",
+        "flipped_bits",
+    )
+
+    def __init__(
+        self,
+        invader_index: int,
+        orientation: str,
+        content_hash: str,
+        frame_coords: [[int, int], [int, int]],
+        flipped_bits: int,
+    ):
+        self.invader_index = invader_index
+        self.orientation = orientation
+        self.content_hash = content_hash
+        self.frame_coords = frame_coords
+        self.flipped_bits = flipped_bits
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SyntheticSample:
+    """
+    A generated radar sample, along with the invaders that were placed on it.
+    """
+
+    def __init__(
+        self,
+        ascii_string: str,
+        spherical: bool,
+        placed_invaders: list[PlacedInvader],
+        noise: dict[str, float],
+    ):
+        self.ascii_string = ascii_string
+        self.spherical = spherical
+        self.placed_invaders = placed_invaders
+        self.noise = noise
+
+    def to_map(self, map_class: type[AsciiMap] | None = None) -> AsciiMap:
+        """
+        Parse the sample.
+        :param map_class: The class of the map, by default `AsciiSphericalMap` for
+        spherical samples and `AsciiMap` otherwise.
+        :return: The map.
+        """
+        if map_class is None:
+            map_class = AsciiSphericalMap if self.spherical else AsciiMap
+        return map_class(self.ascii_string)
+
+    def get_ground_truth(self) -> dict:
+        rows = self.ascii_string.split("\n")
+        return {
+            "width": len(rows[0]),
+            "height": len(rows),
+            "spherical": self.spherical,
+            "noise": self.noise,
+            "invaders": [placed.to_dict() for placed in self.placed_invaders],
+        }
+
+    def save(
+        self,
+        sample_path: str | os.PathLike,
+        ground_truth_path: str | os.PathLike | None = None,
+    ):
+        """
+        Save the sample as a radar sample file, readable with `AsciiMap.from_file`,
+        and its ground truth as a JSON file.
+        :param sample_path: The path of the radar sample.
+        :param ground_truth_path: The path of the ground truth, by default the one of
+        the sample with a `.json` suffix.
+        """
+        if ground_truth_path is None:
+            ground_truth_path = Path(sample_path).with_suffix(".json")
+        with open(sample_path, "w") as file:
+            file.write(self.ascii_string)
+            file.write("\n")
+        with open(ground_truth_path, "w") as file:
+            json.dump(self.get_ground_truth(), file, indent=2)
+            file.write("\n")
+
+    @classmethod
+    def load(
+        cls,
+        sample_path: str | os.PathLike,
+        ground_truth_path: str | os.PathLike | None = None,
+    ) -> "SyntheticSample":
+        if ground_truth_path is None:
+            ground_truth_path = Path(sample_path).with_suffix(".json")
+        with open(sample_path) as file:
+            ascii_string = file.read().rstrip("\n")
+        with open(ground_truth_path) as file:
+            ground_truth = json.load(file)
+        placed_invaders = [
+            PlacedInvader(**placed) for placed in ground_truth["invaders"]
+        ]
+        return cls(
+            ascii_string,
+            ground_truth["spherical"],
+            placed_invaders,
+            ground_truth["noise"],
+        )
+
+    def compute_recall(
+        self,
+        identified_invaders: Iterable[IdentifiedInvader],
+        invaders: Iterable[Invader] | None = None,
+    ) -> float:
+        """
+        Compute the ratio of placed invaders that were identified, i.e. that have an
+        identified invader in the same orientation at the same coordinates.
+        :param identified_invaders: The identified invaders of a radar.
+        :param invaders: The invaders the radar searched for, if only the placed
+        invaders in one of these orientations should be counted.
+        :return: The recall, 1.0 if no invader was counted.
+        """
+        placed_invaders = self.placed_invaders
+        if invaders is not None:
+            content_hashes = {invader.content_hash for invader in invaders}
+            placed_invaders = [
+                placed
+                for placed in placed_invaders
+                if placed.content_hash in content_hashes
+            ]
+        if not placed_invaders:
+            return 1.0
+
+        identified = {
+            (inv.original_invader.content_hash, tuple(inv.frame_coords_on_map[0]))
+            for inv in identified_invaders
+        }
+        found = sum(
+            (placed.content_hash, tuple(placed.frame_coords[0])) in identified
+            for placed in placed_invaders
+        )
+        return found / len(placed_invaders)
+
+
+class SyntheticSampleGenerator:
+    """
+    Generates radar samples of any size, with known invaders placed at random.
+
+    The background of the sample is noise made of `background_density` signal bits.
+    The invaders are placed in a random orientation (if `orientations` is set) where
+    they do not overlap each other, and each of their bits is then flipped by the
+    noise: signal bits are lost with a `false_negative_rate`, and empty bits become
+    signal with a `false_positive_rate`. On spherical samples, invaders may wrap
+    around the borders of the map.
+    """
+
+    max_placement_attempts = 100
+
+    def __init__(
+        self,
+        invaders: list[Invader],
+        background_density: float = 0.1,
+        false_positive_rate: float = 0.0,
+        false_negative_rate: float = 0.0,
+        orientations: bool = False,
+        spherical: bool = False,
+        seed: int | None = None,
+    ):
+        self.invaders = invaders
+        self.background_density = background_density
+        self.false_positive_rate = false_positive_rate
+        self.false_negative_rate = false_negative_rate
+        self.orientations = orientations
+        self.spherical = spherical
+        self.random = random.Random(seed)
+
+    def generate_background(self, width: int, height: int) -> list[bytearray]:
+        """
+        :return: The rows of the background, one byte of value 0 or 1 per cell.
+        """
+        weights = (1 - self.background_density, self.background_density)
+        return [
+            bytearray(self.random.choices(b"\x00\x01", weights, k=width))
+            for _ in range(height)
+        ]
+
+    def choose_variant(self, invader: Invader) -> tuple[str, list[list[int]]]:
+        variants = invader.variants if self.orientations else {"identity": invader}
+        orientation = self.random.choice(list(variants))
+        pattern = [list(map(int, row)) for row in variants[orientation].pattern]
+        return orientation, pattern
+
+    def get_cells(
+        self, x: int, y: int, width: int, height: int, map_width: int, map_height: int
+    ) -> list[tuple[int, int]]:
+        """
+        :return: The (x, y) of the cells of the frame, row by row, wrapped around the
+        map borders.
+        """
+        return [
+            ((x + i) % map_width, (y + j) % map_height)
+            for j in range(height)
+            for i in range(width)
+        ]
+
+    def choose_position(
+        self,
+        width: int,
+        height: int,
+        map_width: int,
+        map_height: int,
+        occupied_cells: set[tuple[int, int]],
+    ) -> tuple[int, int]:
+        """
+        Choose the top left corner of an invader, so that it does not overlap the
+        invaders placed before it.
+        """
+        max_x, max_y = map_width - width, map_height - height
+        if self.spherical:
+            max_x, max_y = map_width - 1, map_height - 1
+        if max_x < 0 or max_y < 0:
+            raise MapTooSmallException("An invader is bigger than the map.")
+
+        for _ in range(self.max_placement_attempts):
+            x, y = self.random.randint(0, max_x), self.random.randint(0, max_y)
+            cells = self.get_cells(x, y, width, height, map_width, map_height)
+            if occupied_cells.isdisjoint(cells):
+                return x, y
+        raise MapTooSmallException("There is no room left on the map for an invader.")
+
+    def place_invader(
+        self,
+        rows: list[bytearray],
+        invader_index: int,
+        occupied_cells: set[tuple[int, int]],
+    ) -> PlacedInvader:
+        """
+        Place an invader on the rows of the sample, flipping its bits with the noise.
+        """
+        invader = self.invaders[invader_index]
+        orientation, pattern = self.choose_variant(invader)
+        width, height = len(pattern[0]), len(pattern)
+        map_width, map_height = len(rows[0]), len(rows)
+        x, y = self.choose_position(
+            width, height, map_width, map_height, occupied_cells
+        )
+
+        flipped_bits = 0
+        cells = self.get_cells(x, y, width, height, map_width, map_height)
+        bits = (bit for row in pattern for bit in row)
+        for (cell_x, cell_y), bit in zip(cells, bits):
+            flip_rate = self.false_negative_rate if bit else self.false_positive_rate
+            if self.random.random() < flip_rate:
+                bit = 1 - bit
+                flipped_bits += 1
+            rows[cell_y][cell_x] = bit
+        occupied_cells.update(cells)
+
+        frame_coords = [
+            [x, y],
+            [(x + width - 1) % map_width, (y + height - 1) % map_height],
+        ]
+        return PlacedInvader(
+            invader_index,
+            orientation,
+            Invader.compute_content_hash(pattern),
+            frame_coords,
+            flipped_bits,
+        )
+
+    def generate(
+        self, width: int, height: int, number_of_invaders: int
+    ) -> SyntheticSample:
+        """
+        Generate a sample, cycling through the invaders to place.
+        :param width: The width of the sample.
+        :param height: The height of the sample.
+        :param number_of_invaders: The number of invaders to place on it.
+        :return: The sample and its ground truth.
+        """
+        rows = self.generate_background(width, height)
+        occupied_cells = set()
+        placed_invaders = [
+            self.place_invader(rows, i % len(self.invaders), occupied_cells)
+            for i in range(number_of_invaders)
+        ]
+
+        translation = bytes.maketrans(b"\x00\x01", b"-o")
+        ascii_string = "\n".join(row.translate(translation).decode() for row in rows)
+        noise = {
+            "background_density": self.background_density,
+            "false_positive_rate": self.false_positive_rate,
+            "false_negative_rate": self.false_negative_rate,
+        }
+        return SyntheticSample(ascii_string, self.spherical, placed_invaders, noise)
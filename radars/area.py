@@ -1,4 +1,11 @@
+from collections.abc import Iterable, Iterator
+from heapq import heappush, heapreplace
+from itertools import islice, product
+
+from core.cache import SummedAreaTableCache
 from core.mixins import DynamicProgrammingMixin
+from core.types import Frame, FrameView
+from core.utils import np
 from invaders.base import IdentifiedInvader
 from maps.base import Map
 from radars.base import Radar
@@ -9,15 +16,47 @@ class DPAreaRadar(DynamicProgrammingMixin, Radar):
     """
     A Radar that treats the provided Map as a rectangular area of space.
     Uses dynamic programming to improve performance of search.
+
+    When `bulk` is set, the signal bits of all frames are computed at once from the
+    DP matrix (vectorized for NumPy-backed maps), and only the frames that are worth
+    processing are visited.
+
+    The DP matrix is memoized on the map and shared with the other radars built on
+    it. When a `dp_cache` is provided, the DP matrix is loaded from it rather than
+    computed, if the same map was already scanned.
     """
 
-    def __init__(self, map_: Map, scanner: Scanner):
+    def __init__(
+        self,
+        map_: Map,
+        scanner: Scanner,
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
         super().__init__(map_, scanner)
-        self.dp_matrix = self.compute_dp_matrix(map_)
+        self.bulk = bulk
+        self.dp_padding = self.get_dp_matrix_padding()
+        if dp_cache is None:
+            self.dp_matrix = map_.get_derived(
+                ("dp_matrix", *self.dp_padding),
+                lambda: self.compute_dp_matrix(map_, *self.dp_padding),
+            )
+        else:
+            self.dp_matrix = map_.get_derived(
+                ("dp_matrix", *self.dp_padding),
+                lambda: dp_cache.get_dp_matrix(map_, *self.dp_padding),
+            )
         self.current_coords = [0, 0]
         self.map_scanned = False
         self.identified_invaders: list[IdentifiedInvader] = []
 
+    def get_dp_matrix_padding(self) -> tuple[int, int]:
+        """
+        Frames never wrap around a rectangular area, so the DP matrix is not padded.
+        :return: The number of columns and rows to pad the DP matrix with.
+        """
+        return 0, 0
+
     def get_next_frame_coords(self) -> [[int, int], [int, int]]:
         """
         Compute the coordinates of the next available frame within the map.
@@ -94,28 +133,360 @@ class DPAreaRadar(DynamicProgrammingMixin, Radar):
 
         return d_signal_bits - c_signal_bits - b_signal_bits + a_signal_bits
 
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        """
+        Compute the coordinates of the frame whose top left corner is at (x, y).
+        :param x: X coordinate of the top left corner of the frame.
+        :param y: Y coordinate of the top left corner of the frame.
+        :return: A list made of the coordinates of the top left and bottom right points.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [[x, y], [x + invader_width - 1, y + invader_height - 1]]
+
+    def compute_frames_signal_bits_amounts(self) -> list[list[int]]:
+        """
+        Compute the number of signal bits of every frame of the map at once.
+        :return: A matrix where the cell at [y][x] holds the signal bits amount of the
+        frame whose top left corner is at (x, y).
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return self.compute_window_signal_bits_amounts(
+            self.dp_matrix, invader_width, invader_height
+        )
+
+    def is_worth_processing_frame(self, signal_bits_in_frame: int) -> bool:
+        """
+        Decide, with the help of the scanner, whether a frame is worth processing.
+        :param signal_bits_in_frame: The amount of signal bits in the frame.
+        :return: A boolean whether the frame should undergo processing.
+        """
+        return self.scanner.is_worth_processing_frame(signal_bits_in_frame)
+
+    def get_candidate_frames_coords(self):
+        """
+        Yield the coordinates of the frames that, based on the signal threshold, are
+        worth analyzing more in-depth.
+        :return: A generator of frame coordinates.
+        """
+        if self.bulk:
+            yield from self.get_bulk_candidate_frames_coords()
+            return
+
+        pruned_frames = 0
+        while frame_coords := self.get_next_frame_coords():
+            frame_signal_bits_amount = self.compute_frame_signal_bits_amount(
+                frame_coords
+            )
+            if self.is_worth_processing_frame(frame_signal_bits_amount):
+                yield frame_coords
+            else:
+                pruned_frames += 1
+        self.record_pruned_frames(pruned_frames)
+
+    def get_bulk_candidate_frames_coords(self):
+        """
+        Same as `get_candidate_frames_coords`, but the signal bits of all frames are
+        computed in one pass and the scanner is queried once per possible amount of
+        signal bits rather than once per frame.
+        :return: A generator of frame coordinates.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        amounts = self.compute_frames_signal_bits_amounts()
+        is_worth_processing = [
+            self.is_worth_processing_frame(amount)
+            for amount in range(invader_width * invader_height + 1)
+        ]
+
+        if np is not None and isinstance(amounts, np.ndarray):
+            ys, xs = np.nonzero(np.asarray(is_worth_processing)[amounts])
+            self.record_pruned_frames(amounts.size - len(xs))
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                yield self.get_frame_coords_at(x, y)
+            return
+
+        pruned_frames = 0
+        for y, row in enumerate(amounts):
+            for x, amount in enumerate(row):
+                if is_worth_processing[amount]:
+                    yield self.get_frame_coords_at(x, y)
+                else:
+                    pruned_frames += 1
+        self.record_pruned_frames(pruned_frames)
+
+    def record_pruned_frames(self, number_of_frames: int):
+        """
+        Let the scanner know how many frames were not worth processing.
+        :param number_of_frames: The number of frames that were pruned.
+        """
+        self.scanner.record_pruned_frames(number_of_frames)
+
+    def match_frame_coords(
+        self, frame_coords: [[int, int], [int, int]]
+    ) -> list[IdentifiedInvader]:
+        """
+        Analyze the frame with the provided coordinates in-depth.
+        :param frame_coords: The coordinates of the frame to process.
+        :return: The identified invader if the frame is similar enough to the invader
+        target, nothing otherwise.
+        """
+        [x_start, y_start], [x_end, y_end] = frame_coords
+        frame = self.map.get_frame_at(x_start, y_start, x_end, y_end)
+        similarity_ratio = self.scanner.process_frame(frame)
+        if similarity_ratio >= self.scanner.similarity_threshold:
+            identified_invader = self.identified_invader_class(
+                self.scanner.invader_target,
+                frame,
+                similarity_ratio,
+                frame_coords,
+            )
+            return [identified_invader]
+        return []
+
+    def process_frame_coords(self, frame_coords: [[int, int], [int, int]]):
+        """
+        Analyze the frame with the provided coordinates in-depth and keep it as an
+        identified invader if it is similar enough to the invader target.
+        :param frame_coords: The coordinates of the frame to process.
+        """
+        self.identified_invaders.extend(self.match_frame_coords(frame_coords))
+
+    def iter_identified_invaders(self) -> Iterator[IdentifiedInvader]:
+        """
+        Scan the map one frame at a time and yield the identified invaders as soon as
+        they are found.
+        :return: A generator of identified invaders, in scan order.
+        """
+        for frame_coords in self.get_candidate_frames_coords():
+            yield from self.match_frame_coords(frame_coords)
+
+    def get_scanners(self) -> list[Scanner]:
+        return [self.scanner]
+
+    def iter_top_identified_invaders(self, top_k: int) -> Iterator[IdentifiedInvader]:
+        """
+        Scan the map and keep only the `top_k` most similar identified invaders in a
+        bounded heap. Once the heap is full, the similarity threshold of the scanners
+        is raised to the least similarity ratio of the heap, so that the frames that
+        cannot make it into the heap are rejected, or pruned, earlier. The thresholds
+        are restored once the scan is over.
+        :param top_k: The number of identified invaders to keep.
+        :return: A generator of the identified invaders, from the most to the least
+        similar one, ties being in scan order.
+        """
+        if top_k <= 0:
+            return
+
+        scanners = self.get_scanners()
+        similarity_thresholds = [scanner.similarity_threshold for scanner in scanners]
+        # the scan order breaks ties, the first identified invader being the greatest
+        heap: list[tuple[float, int, IdentifiedInvader]] = []
+        try:
+            for order, identified_invader in enumerate(self.iter_identified_invaders()):
+                item = (identified_invader.similarity_ratio, -order, identified_invader)
+                if len(heap) < top_k:
+                    heappush(heap, item)
+                elif item > heap[0]:
+                    heapreplace(heap, item)
+                else:
+                    continue
+
+                if len(heap) == top_k:
+                    cutoff = heap[0][0]
+                    for scanner in scanners:
+                        if scanner.similarity_threshold < cutoff:
+                            scanner.set_similarity_threshold(cutoff)
+        finally:
+            for scanner, similarity_threshold in zip(scanners, similarity_thresholds):
+                scanner.set_similarity_threshold(similarity_threshold)
+
+        for _, _, identified_invader in sorted(heap, reverse=True):
+            yield identified_invader
+
+    def iter_scan(
+        self, limit: int | None = None, top_k: int | None = None
+    ) -> Iterator[IdentifiedInvader]:
+        """
+        Scan the map and yield the identified invaders as they are found, without
+        keeping them in the radar.
+        :param limit: If set, stop the scan once `limit` identified invaders were
+        yielded.
+        :param top_k: If set, only yield the `top_k` most similar identified invaders,
+        from the most to the least similar one, once the scan is over.
+        :return: A generator of identified invaders.
+        """
+        if top_k is None:
+            identified_invaders = self.iter_identified_invaders()
+        else:
+            identified_invaders = self.iter_top_identified_invaders(top_k)
+        yield from islice(identified_invaders, limit)
+
     def scan(self):
         """
         Scan the map one frame at a time and decide, based on the signal threshold,
         whether the frame should be analyzed more in-depth
         :return:
         """
-        while frame_coords := self.get_next_frame_coords():
+        self.identified_invaders.extend(self.iter_scan())
+
+    def get_overlapping_frames_starts(
+        self, position: int, length: int, size: int
+    ) -> Iterable[int]:
+        """
+        Compute the positions, on one axis, of the frames that contain the provided one.
+        :param position: The position of the cell on the axis.
+        :param length: The length of the frames on the axis.
+        :param size: The size of the map on the axis.
+        :return: The starting positions of the frames.
+        """
+        return range(max(0, position - length + 1), min(position, size - length) + 1)
+
+    def get_frames_overlapping_cells(
+        self, cells: Iterable[tuple[int, int]], frame_size: tuple[int, int]
+    ) -> set[tuple[int, int]]:
+        """
+        Compute the top left corners of the frames of the provided size that contain
+        at least one of the provided cells.
+        """
+        invader_width, invader_height = frame_size
+        map_width, map_height = self.map.width, self.map.height
+        top_lefts = set()
+        for x, y in cells:
+            top_lefts.update(
+                product(
+                    self.get_overlapping_frames_starts(x, invader_width, map_width),
+                    self.get_overlapping_frames_starts(y, invader_height, map_height),
+                )
+            )
+        return top_lefts
+
+    def get_frame_sizes(self) -> list[tuple[int, int]]:
+        return [tuple(self.scanner.required_frame_coords)]
+
+    def get_scan_order_key(self, identified_invader: IdentifiedInvader) -> tuple:
+        [x, y], _ = identified_invader.frame_coords_on_map
+        return y, x
+
+    @staticmethod
+    def detach_frame(frame: Frame) -> Frame:
+        """
+        Copy a frame that references the map, so it is not altered by later changes.
+        """
+        if isinstance(frame, FrameView):
+            return frame.materialize()
+        if np is not None and isinstance(frame, np.ndarray):
+            return frame.copy()
+        return frame
+
+    @staticmethod
+    def get_frame_cells(frame: Frame) -> list[list[int]]:
+        return [list(map(int, row)) for row in frame]
+
+    def update_signal_tables(self, from_row: int):
+        """
+        Update the precomputed tables of the radar once the map changed.
+        :param from_row: The first row of the map holding a changed cell.
+        """
+        self.update_dp_matrix(self.dp_matrix, self.map, from_row, *self.dp_padding)
+        # the radars sharing the DP matrix see the update, the other ones are dropped
+        self.map.set_derived(("dp_matrix", *self.dp_padding), self.dp_matrix)
+
+    def rescan_frames(self, frames_top_lefts: dict[tuple[int, int], set]):
+        """
+        Process again the frames with the provided top left corners, in scan order.
+        :param frames_top_lefts: The top left corners of the frames, by frame size.
+        """
+        pruned_frames = 0
+        top_lefts = frames_top_lefts[tuple(self.scanner.required_frame_coords)]
+        for x, y in sorted(top_lefts, key=lambda top_left: (top_left[1], top_left[0])):
+            frame_coords = self.get_frame_coords_at(x, y)
             frame_signal_bits_amount = self.compute_frame_signal_bits_amount(
                 frame_coords
             )
-            if self.scanner.is_worth_processing_frame(frame_signal_bits_amount):
-                [x_start, y_start], [x_end, y_end] = frame_coords
-                frame = self.map.get_frame_at(x_start, y_start, x_end, y_end)
-                similarity_ratio = self.scanner.process_frame(frame)
-                if similarity_ratio >= self.scanner.similarity_threshold:
-                    identified_invader = self.identified_invader_class(
-                        self.scanner.invader_target,
-                        frame,
-                        similarity_ratio,
-                        frame_coords,
-                    )
-                    self.identified_invaders.append(identified_invader)
+            if self.is_worth_processing_frame(frame_signal_bits_amount):
+                self.process_frame_coords(frame_coords)
+            else:
+                pruned_frames += 1
+        self.record_pruned_frames(pruned_frames)
+
+    def rescan(
+        self, changes: Iterable[tuple[int, int, int]]
+    ) -> tuple[list[IdentifiedInvader], list[IdentifiedInvader]]:
+        """
+        Apply the changed cells to the map, and update the identified invaders of a
+        previous scan without scanning the whole map again: the DP matrix is updated
+        from the first changed row, and only the frames that overlap a changed cell
+        are processed again.
+        :param changes: The (x, y, value) of the changed cells.
+        :return: The identified invaders that were added and the ones that were
+        removed. An invader whose frame or similarity changed is in both.
+        """
+        changes = list(changes)
+        # reject an invalid batch before the identified invaders are touched
+        self.map.validate_changes(changes)
+        cells = [(x, y) for x, y, _ in changes]
+        frames_top_lefts = {
+            frame_size: self.get_frames_overlapping_cells(cells, frame_size)
+            for frame_size in self.get_frame_sizes()
+        }
+
+        def is_stale(identified_invader: IdentifiedInvader) -> bool:
+            [x, y], _ = identified_invader.frame_coords_on_map
+            invader = identified_invader.original_invader
+            return (x, y) in frames_top_lefts[(invader.width, invader.height)]
+
+        kept, stale = [], []
+        for identified_invader in self.identified_invaders:
+            if is_stale(identified_invader):
+                # the frame may be a view of the map, keep it as it was before the change
+                identified_invader.pattern = self.detach_frame(
+                    identified_invader.pattern
+                )
+                stale.append(identified_invader)
+            else:
+                kept.append(identified_invader)
+
+        changed_cells = self.map.apply_changes(changes)
+        if not changed_cells:
+            return [], []
+        self.update_signal_tables(min(y for _, y in changed_cells))
+
+        self.identified_invaders = []
+        self.rescan_frames(frames_top_lefts)
+
+        stale_by_frame = {
+            (
+                identified_invader.original_invader,
+                *identified_invader.frame_coords_on_map[0],
+            ): identified_invader
+            for identified_invader in stale
+        }
+        added, unchanged = [], set()
+        for identified_invader in self.identified_invaders:
+            previous = stale_by_frame.get(
+                (
+                    identified_invader.original_invader,
+                    *identified_invader.frame_coords_on_map[0],
+                )
+            )
+            if (
+                previous is not None
+                and previous.similarity_ratio == identified_invader.similarity_ratio
+                and self.get_frame_cells(previous.pattern)
+                == self.get_frame_cells(identified_invader.pattern)
+            ):
+                unchanged.add(id(previous))
+            else:
+                added.append(identified_invader)
+
+        self.identified_invaders = sorted(
+            kept + self.identified_invaders, key=self.get_scan_order_key
+        )
+        removed = [
+            identified_invader
+            for identified_invader in stale
+            if id(identified_invader) not in unchanged
+        ]
+        return added, removed
 
     def get_identified_invaders(self) -> list[IdentifiedInvader]:
         return self.identified_invaders
@@ -4,6 +4,7 @@ from core.exceptions import MapTooSmallException
 from invaders.base import IdentifiedInvader
 from invaders.identified import AsciiIdentifiedInvader
 from maps.base import Map
+from radars.suppression import NonMaximumSuppressor
 from scanners.base import Scanner
 
 
@@ -13,6 +14,8 @@ class Radar(ABC):
     """
 
     identified_invader_class: IdentifiedInvader = AsciiIdentifiedInvader
+    # whether frames can wrap around the borders of the map
+    wraps_around: bool = False
 
     def __init__(self, map_: Map, scanner: Scanner):
         self.map = map_
@@ -41,3 +44,18 @@ class Radar(ABC):
             raise MapTooSmallException(
                 "Invader pattern size cannot be bigger than map size."
             )
+
+    def get_map_size(self) -> tuple[int, int]:
+        return self.map.width, self.map.height
+
+    def get_non_overlapping_identified_invaders(self) -> list[IdentifiedInvader]:
+        """
+        Same as `get_identified_invaders`, but only the most similar invader of each
+        group of overlapping ones is kept.
+        :return: The identified invaders, without the overlapping ones.
+        """
+        map_width, map_height = (
+            self.get_map_size() if self.wraps_around else (None, None)
+        )
+        suppressor = NonMaximumSuppressor(map_width, map_height)
+        return suppressor.suppress(self.get_identified_invaders())
@@ -0,0 +1,101 @@
+from itertools import accumulate
+from operator import add, sub
+
+from core.cache import SummedAreaTableCache
+from invaders.base import IdentifiedInvader
+from maps.base import Map
+from radars.area import DPAreaRadar
+from radars.spherical import DPSphericalRadar
+from scanners.cascade import CascadeScanner
+
+
+class CascadeDPAreaRadar(DPAreaRadar):
+    """
+    A Radar that treats the provided Map as a rectangular area of space, and filters
+    the frames through the stages of a `CascadeScanner` before matching them.
+
+    Next to the DP matrix, the per-row and per-column prefix sums of the map are
+    computed, so that the rows and columns profiles of a frame cost O(h) and O(w).
+    They are memoized on the map as well.
+    """
+
+    def __init__(
+        self,
+        map_: Map,
+        scanner: CascadeScanner,
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
+        super().__init__(map_, scanner, bulk=bulk, dp_cache=dp_cache)
+        self.rows_prefix_sums = map_.get_derived(
+            ("rows_prefix_sums", *self.dp_padding),
+            lambda: self.compute_rows_prefix_sums(map_, *self.dp_padding),
+        )
+        self.columns_prefix_sums = map_.get_derived(
+            ("columns_prefix_sums", *self.dp_padding),
+            lambda: self.compute_columns_prefix_sums(map_, *self.dp_padding),
+        )
+
+    def update_signal_tables(self, from_row: int):
+        super().update_signal_tables(from_row)
+        rows = self.iter_padded_rows(self.map, *self.dp_padding, from_row=from_row)
+        for y, row in enumerate(rows, start=from_row):
+            self.rows_prefix_sums[y] = [0, *accumulate(row)]
+            self.columns_prefix_sums[y + 1] = list(
+                map(add, self.columns_prefix_sums[y], row)
+            )
+        self.map.set_derived(
+            ("rows_prefix_sums", *self.dp_padding), self.rows_prefix_sums
+        )
+        self.map.set_derived(
+            ("columns_prefix_sums", *self.dp_padding), self.columns_prefix_sums
+        )
+
+    def compute_rows_signal_bits(self, x: int, y: int) -> list[int]:
+        """
+        Compute the amount of signal bits in each row of the frame whose top left
+        corner is at (x, y).
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        x_end, y_end = x + invader_width, y + invader_height
+        return [row[x_end] - row[x] for row in self.rows_prefix_sums[y:y_end]]
+
+    def compute_columns_signal_bits(self, x: int, y: int) -> list[int]:
+        """
+        Compute the amount of signal bits in each column of the frame whose top left
+        corner is at (x, y).
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        x_end, y_end = x + invader_width, y + invader_height
+        top, bottom = self.columns_prefix_sums[y], self.columns_prefix_sums[y_end]
+        return list(map(sub, bottom[x:x_end], top[x:x_end]))
+
+    def match_frame_coords(
+        self, frame_coords: [[int, int], [int, int]]
+    ) -> list[IdentifiedInvader]:
+        """
+        Match the frame only if it passes the rows and the columns stages of the
+        scanner. The frames reaching this point already passed the signal stage.
+        :param frame_coords: The coordinates of the frame to process.
+        :return: The identified invader if the frame is similar enough to the invader
+        target, nothing otherwise.
+        """
+        # the padding of the prefix sums lets frames that wrap around a spherical map
+        # be addressed with their top left corner only
+        [x, y], _ = frame_coords
+        if not self.scanner.is_worth_processing_rows(
+            self.compute_rows_signal_bits(x, y)
+        ):
+            return []
+        if not self.scanner.is_worth_processing_columns(
+            self.compute_columns_signal_bits(x, y)
+        ):
+            return []
+        return super().match_frame_coords(frame_coords)
+
+
+class CascadeDPSphericalRadar(CascadeDPAreaRadar, DPSphericalRadar):
+    """
+    A Radar that treats the provided Map as a sphere, and filters the frames through
+    the stages of a `CascadeScanner` before matching them.
+    """
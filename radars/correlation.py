@@ -0,0 +1,150 @@
+from core.types import Frame
+from core.utils import np, require_numpy
+from invaders.base import IdentifiedInvader
+from maps.base import Map
+from radars.base import Radar
+from scanners.base import Scanner
+
+
+class CorrelationAreaRadar(Radar):
+    """
+    A Radar that treats the provided Map as a rectangular area of space.
+    Scores every frame of the map in one pass, using FFT cross-correlation,
+    instead of matching the frames one by one.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    def __init__(self, map_: Map, scanner: Scanner):
+        require_numpy("CorrelationAreaRadar")
+        super().__init__(map_, scanner)
+        self.identified_invaders: list[IdentifiedInvader] = []
+
+    def to_array(self, binary_matrix: Frame):
+        if isinstance(binary_matrix, np.ndarray):
+            return binary_matrix.astype(np.float64)
+        return np.array(list(binary_matrix), dtype=np.float64)
+
+    def correlate(self, map_spectrum, kernel: Frame):
+        """
+        Compute the circular cross-correlation of the map with a kernel, i.e. the cell
+        at [y][x] of the result is the sum of the kernel multiplied by the frame of the
+        map whose top left corner is at (x, y), wrapping around the map borders.
+
+        :param map_spectrum: The 2D real FFT of the map.
+        :param kernel: The kernel to correlate the map with.
+        :return: The correlation matrix, rounded to integers.
+        """
+        map_shape = (self.map.height, self.map.width)
+        padded_kernel = np.zeros(map_shape)
+        kernel = self.to_array(kernel)
+        padded_kernel[: kernel.shape[0], : kernel.shape[1]] = kernel
+        kernel_spectrum = np.fft.rfft2(padded_kernel)
+        correlation = np.fft.irfft2(
+            map_spectrum * np.conj(kernel_spectrum), s=map_shape
+        )
+        return np.rint(correlation).astype(np.int64)
+
+    def compute_frames_scores(self):
+        """
+        Compute the signal bits and the matching bits of every frame of the map at once.
+
+        The amount of matching bits of a frame is `corr(map, pattern) + corr(1 - map, 1 - pattern)`.
+        Expanding the second term, it can be computed as `2 * corr(map, pattern) + N - S - K`,
+        where `N` is the size of the pattern, `S` the signal bits of the frame (which is
+        `corr(map, ones)`) and `K` the signal bits of the pattern. Thus, only two
+        correlations are needed.
+
+        :return: Two matrices, holding the signal bits and the matching bits of the frame
+        whose top left corner is at (x, y), in their [y][x] cell.
+        """
+        invader = self.scanner.invader_target
+        # the spectrum of the map does not depend on the invader, so it is shared
+        map_spectrum = self.map.get_derived(
+            ("spectrum",),
+            lambda: np.fft.rfft2(self.to_array(self.map.get_binary_representation())),
+        )
+
+        signal_bits = self.correlate(
+            map_spectrum, np.ones((invader.height, invader.width))
+        )
+        pattern_correlation = self.correlate(map_spectrum, invader.pattern)
+        matching_bits = (
+            2 * pattern_correlation
+            + invader.number_of_total_bits
+            - signal_bits
+            - invader.number_of_signal_bits
+        )
+        return signal_bits, matching_bits
+
+    def get_frames_scores(self):
+        """
+        Keep only the scores of the frames that fit within the map.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        signal_bits, matching_bits = self.compute_frames_scores()
+        rows = self.map.height - invader_height + 1
+        cols = self.map.width - invader_width + 1
+        return signal_bits[:rows, :cols], matching_bits[:rows, :cols]
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [[x, y], [x + invader_width - 1, y + invader_height - 1]]
+
+    def scan(self):
+        """
+        Score all frames at once and keep the ones that pass both the signal
+        threshold and the similarity threshold of the scanner.
+        """
+        total_bits = self.scanner.invader_target.number_of_total_bits
+        signal_bits, matching_bits = self.get_frames_scores()
+        is_worth_processing = np.array(
+            [
+                self.scanner.is_worth_processing_frame(amount)
+                for amount in range(total_bits + 1)
+            ]
+        )
+        is_similar = matching_bits / total_bits >= self.scanner.similarity_threshold
+
+        is_worth_processing_frame = is_worth_processing[signal_bits]
+        self.scanner.record_pruned_frames(
+            is_worth_processing_frame.size - int(is_worth_processing_frame.sum())
+        )
+        ys, xs = np.nonzero(is_worth_processing_frame & is_similar)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            frame_coords = self.get_frame_coords_at(x, y)
+            [x_start, y_start], [x_end, y_end] = frame_coords
+            identified_invader = self.identified_invader_class(
+                self.scanner.invader_target,
+                self.map.get_frame_at(x_start, y_start, x_end, y_end),
+                int(matching_bits[y, x]) / total_bits,
+                frame_coords,
+            )
+            self.identified_invaders.append(identified_invader)
+
+    def get_identified_invaders(self) -> list[IdentifiedInvader]:
+        return self.identified_invaders
+
+
+class CorrelationSphericalRadar(CorrelationAreaRadar):
+    """
+    A Radar that treats the provided Map as a sphere. The FFT cross-correlation is
+    circular, so frames that wrap around the map are scored at no extra cost.
+
+    Requires the optional `numpy` dependency.
+    """
+
+    wraps_around = True
+
+    def get_frames_scores(self):
+        return self.compute_frames_scores()
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [
+            [x, y],
+            [
+                (x + invader_width - 1) % self.map.width,
+                (y + invader_height - 1) % self.map.height,
+            ],
+        ]
@@ -0,0 +1,187 @@
+from collections.abc import Iterator
+
+from core.cache import SummedAreaTableCache
+from core.exceptions import MapTooSmallException, NoScannerException
+from invaders.base import IdentifiedInvader, Invader
+from maps.base import Map
+from radars.area import DPAreaRadar
+from radars.spherical import DPSphericalRadar
+from scanners.base import Scanner
+from scanners.basic import BasicScanner
+
+
+class MultiTargetDPAreaRadar(DPAreaRadar):
+    """
+    A Radar that searches for several invaders at once, each with its own Scanner,
+    treating the provided Map as a rectangular area of space.
+
+    The DP matrix is computed only once, and scanners that require the same frame
+    size are grouped, so that the frames of the map are enumerated and their signal
+    bits are computed only once per group.
+    """
+
+    def __init__(
+        self,
+        map_: Map,
+        scanners: list[Scanner],
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
+        if not scanners:
+            raise NoScannerException("A radar needs at least one scanner.")
+
+        self.scanners = scanners
+        self.scanner_groups: dict[tuple[int, int], list[Scanner]] = {}
+        for scanner in scanners:
+            frame_size = tuple(scanner.required_frame_coords)
+            self.scanner_groups.setdefault(frame_size, []).append(scanner)
+
+        # the first scanner of a group drives the enumeration of the frames
+        super().__init__(map_, scanners[0], bulk=bulk, dp_cache=dp_cache)
+        self.active_scanners = [self.scanner]
+
+    @classmethod
+    def from_invaders(
+        cls,
+        map_: Map,
+        invaders: list[Invader],
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+        **scanner_kwargs,
+    ):
+        """
+        Build a radar that searches for all the provided invaders, using a `BasicScanner`
+        for each of them.
+        :param map_: The map to scan.
+        :param invaders: The invaders to search for.
+        :param bulk: Whether to compute the signal bits of all frames at once.
+        :param dp_cache: The cache to load the DP matrix from, if any.
+        :param scanner_kwargs: Extra arguments for the scanners (e.g. thresholds).
+        :return: The radar.
+        """
+        scanners = [BasicScanner(invader, **scanner_kwargs) for invader in invaders]
+        return cls(map_, scanners, bulk=bulk, dp_cache=dp_cache)
+
+    def validate_inputs(self):
+        for scanner in self.scanners:
+            invader_width, invader_height = scanner.required_frame_coords
+            if invader_width > self.map.width or invader_height > self.map.height:
+                raise MapTooSmallException(
+                    "Invader pattern size cannot be bigger than map size."
+                )
+
+    def is_worth_processing_frame(self, signal_bits_in_frame: int) -> bool:
+        return any(
+            scanner.is_worth_processing_frame(signal_bits_in_frame)
+            for scanner in self.active_scanners
+        )
+
+    def record_pruned_frames(self, number_of_frames: int):
+        # frames are only pruned when no scanner of the group is interested in them
+        for scanner in self.active_scanners:
+            scanner.record_pruned_frames(number_of_frames)
+
+    def match_frame_coords(
+        self, frame_coords: [[int, int], [int, int]]
+    ) -> list[IdentifiedInvader]:
+        """
+        Analyze the frame with every scanner of the current group that considers it
+        worth processing. The frame is retrieved from the map only once.
+        :param frame_coords: The coordinates of the frame to process.
+        :return: The identified invaders, one per scanner the frame is similar enough to.
+        """
+        [x_start, y_start], [x_end, y_end] = frame_coords
+        frame = self.map.get_frame_at(x_start, y_start, x_end, y_end)
+
+        identified_invaders = []
+        for scanner in self.get_interested_scanners(frame_coords):
+            similarity_ratio = scanner.process_frame(frame)
+            if similarity_ratio >= scanner.similarity_threshold:
+                identified_invader = self.identified_invader_class(
+                    scanner.invader_target,
+                    frame,
+                    similarity_ratio,
+                    frame_coords,
+                )
+                identified_invaders.append(identified_invader)
+        return identified_invaders
+
+    def get_interested_scanners(
+        self, frame_coords: [[int, int], [int, int]]
+    ) -> list[Scanner]:
+        """
+        Select the scanners of the current group that consider the frame worth
+        processing, the other ones are told that the frame was pruned.
+        :param frame_coords: The coordinates of the frame.
+        :return: The scanners to process the frame with.
+        """
+        frame_signal_bits_amount = self.compute_frame_signal_bits_amount(frame_coords)
+        interested_scanners = []
+        for scanner in self.active_scanners:
+            if scanner.is_worth_processing_frame(frame_signal_bits_amount):
+                interested_scanners.append(scanner)
+            else:
+                scanner.record_pruned_frames(1)
+        return interested_scanners
+
+    def iter_identified_invaders(self) -> Iterator[IdentifiedInvader]:
+        """
+        Scan the map once per group of scanners that require the same frame size.
+        """
+        for scanners in self.scanner_groups.values():
+            self.scanner = scanners[0]
+            self.active_scanners = scanners
+            self.current_coords = [0, 0]
+            self.map_scanned = False
+            yield from super().iter_identified_invaders()
+
+    def get_scanners(self) -> list[Scanner]:
+        return self.scanners
+
+    def get_frame_sizes(self) -> list[tuple[int, int]]:
+        return list(self.scanner_groups)
+
+    def get_scan_order_key(self, identified_invader: IdentifiedInvader) -> tuple:
+        # groups are scanned one after the other, and the scanners of a group are
+        # applied to each frame in turn
+        invader = identified_invader.original_invader
+        for group_index, scanners in enumerate(self.scanner_groups.values()):
+            for scanner_index, scanner in enumerate(scanners):
+                if scanner.invader_target is invader:
+                    y, x = super().get_scan_order_key(identified_invader)
+                    return group_index, y, x, scanner_index
+
+    def rescan_frames(self, frames_top_lefts: dict[tuple[int, int], set]):
+        for scanners in self.scanner_groups.values():
+            self.scanner = scanners[0]
+            self.active_scanners = scanners
+            super().rescan_frames(frames_top_lefts)
+
+    def get_identified_invaders_by_invader(
+        self,
+    ) -> dict[Invader, list[IdentifiedInvader]]:
+        """
+        Group the identified invaders by the original invader they were matched against.
+        :return: A dict mapping each searched invader to its identified invaders.
+        """
+        identified_invaders = {scanner.invader_target: [] for scanner in self.scanners}
+        for identified_invader in self.identified_invaders:
+            identified_invaders[identified_invader.original_invader].append(
+                identified_invader
+            )
+        return identified_invaders
+
+
+class MultiTargetDPSphericalRadar(MultiTargetDPAreaRadar, DPSphericalRadar):
+    """
+    A Radar that searches for several invaders at once, treating the provided Map
+    as a sphere.
+    """
+
+    def get_dp_matrix_padding(self) -> tuple[int, int]:
+        # the DP matrix is shared, so it is padded for the biggest frames
+        frame_sizes = self.scanner_groups.keys()
+        return (
+            max(invader_width for invader_width, _ in frame_sizes) - 1,
+            max(invader_height for _, invader_height in frame_sizes) - 1,
+        )
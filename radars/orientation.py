@@ -0,0 +1,75 @@
+from core.cache import SummedAreaTableCache
+from invaders.base import IdentifiedInvader, Invader
+from maps.base import Map
+from radars.multi import MultiTargetDPAreaRadar, MultiTargetDPSphericalRadar
+from scanners.base import Scanner
+
+
+class OrientationInvariantDPAreaRadar(MultiTargetDPAreaRadar):
+    """
+    A Radar that searches for an invader in all its distinct orientations (see
+    `Invader.variants`), treating the provided Map as a rectangular area of space.
+
+    Each orientation is searched with a copy of the provided scanner. The orientations
+    of the same size share a single pass over the map: the signal bits of a frame do
+    not depend on the orientation, so they are computed and checked once per frame,
+    and only the matching is done for every orientation.
+    """
+
+    def __init__(
+        self,
+        map_: Map,
+        scanner: Scanner,
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
+        variants = scanner.invader_target.variants
+        self.orientations: dict[Invader, str] = {
+            variant: name for name, variant in variants.items()
+        }
+        scanners = [scanner] + [
+            scanner.for_invader(variant)
+            for name, variant in variants.items()
+            if name != "identity"
+        ]
+        super().__init__(map_, scanners, bulk=bulk, dp_cache=dp_cache)
+
+    def is_worth_processing_frame(self, signal_bits_in_frame: int) -> bool:
+        # the orientations have the same signal bits and thresholds, so the scanners
+        # all agree
+        return self.scanner.is_worth_processing_frame(signal_bits_in_frame)
+
+    def get_interested_scanners(
+        self, frame_coords: [[int, int], [int, int]]
+    ) -> list[Scanner]:
+        # the frame already passed the signal check of the scanners
+        return self.active_scanners
+
+    def get_orientation(self, identified_invader: IdentifiedInvader) -> str:
+        """
+        :return: The name of the orientation the identified invader was matched in.
+        """
+        return self.orientations[identified_invader.original_invader]
+
+    def get_identified_invaders_by_orientation(
+        self,
+    ) -> dict[str, list[IdentifiedInvader]]:
+        """
+        Group the identified invaders by the orientation they were matched in.
+        :return: A dict mapping the name of each orientation to its identified invaders.
+        """
+        return {
+            self.orientations[invader]: identified_invaders
+            for invader, identified_invaders in (
+                self.get_identified_invaders_by_invader().items()
+            )
+        }
+
+
+class OrientationInvariantDPSphericalRadar(
+    OrientationInvariantDPAreaRadar, MultiTargetDPSphericalRadar
+):
+    """
+    A Radar that searches for an invader in all its distinct orientations, treating
+    the provided Map as a sphere.
+    """
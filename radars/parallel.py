@@ -0,0 +1,206 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+from core.cache import SummedAreaTableCache
+from core.types import Frame
+from invaders.base import IdentifiedInvader
+from maps.base import Map
+from radars.area import DPAreaRadar
+from radars.base import Radar
+from scanners.base import Scanner
+
+
+def scan_tile(
+    map_class: type[Map],
+    tile: Frame,
+    scanner: Scanner,
+    bulk: bool,
+    dp_cache: SummedAreaTableCache | None = None,
+) -> list[tuple[Frame, float, list[list[int]]]]:
+    """
+    Scan a single tile of a map as a rectangular area. Runs in a worker process.
+
+    :param map_class: The class of the map the tile was cut from.
+    :param tile: The binary matrix of the tile, including its halo.
+    :param scanner: The scanner to use.
+    :param bulk: Whether to compute the signal bits of all frames at once.
+    :param dp_cache: The cache to load the DP matrix of the tile from, if any.
+    :return: The frame, similarity ratio and coordinates (relative to the tile) of
+    each identified invader.
+    """
+    radar = DPAreaRadar(
+        map_class.from_binary_matrix(tile), scanner, bulk=bulk, dp_cache=dp_cache
+    )
+    radar.scan()
+    return [
+        (inv.pattern, inv.similarity_ratio, inv.frame_coords_on_map)
+        for inv in radar.get_identified_invaders()
+    ]
+
+
+class ParallelDPAreaRadar(Radar):
+    """
+    A Radar that treats the provided Map as a rectangular area of space, and scans
+    it in parallel, with a `DPAreaRadar` per tile in a process pool.
+
+    Each tile owns a rectangle of frame top left corners and is cut from the map
+    with a halo of `invader.width - 1` columns and `invader.height - 1` rows, so that
+    all the frames it owns fit in it. Since the owned rectangles do not overlap,
+    every frame is scanned by exactly one tile and no frames are duplicated.
+
+    When a `dp_cache` is provided, the DP matrix of each tile is loaded from it, so
+    that scanning the same sample again with the same tiles computes none of them.
+    """
+
+    def __init__(
+        self,
+        map_: Map,
+        scanner: Scanner,
+        max_workers: int | None = None,
+        tile_rows: int | None = None,
+        tile_columns: int = 1,
+        bulk: bool = False,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
+        super().__init__(map_, scanner)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tile_rows = tile_rows or self.max_workers
+        self.tile_columns = tile_columns
+        self.bulk = bulk
+        self.dp_cache = dp_cache
+        self.identified_invaders: list[IdentifiedInvader] = []
+
+    @staticmethod
+    def split_range(length: int, parts: int) -> list[tuple[int, int]]:
+        """
+        Split the range [0, length) into at most `parts` contiguous chunks of similar size.
+        :return: A list of (start, end) pairs, `end` being exclusive.
+        """
+        chunk = ceil(length / max(1, min(parts, length)))
+        return [
+            (start, min(start + chunk, length)) for start in range(0, length, chunk)
+        ]
+
+    def get_tiles(self) -> list[tuple[int, int, int, int]]:
+        """
+        Split the top left corners of all frames of the map into tiles.
+        :return: A list of (x_start, y_start, x_end, y_end) owned ranges, with the
+        end coordinates being exclusive.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        columns = self.split_range(
+            self.map.width - invader_width + 1, self.tile_columns
+        )
+        rows = self.split_range(self.map.height - invader_height + 1, self.tile_rows)
+        return [
+            (x_start, y_start, x_end, y_end)
+            for y_start, y_end in rows
+            for x_start, x_end in columns
+        ]
+
+    def get_tile_frame_coords(
+        self, tile: tuple[int, int, int, int]
+    ) -> [[int, int], [int, int]]:
+        """
+        Compute the coordinates of the part of the map to cut for a tile, including its halo.
+        :param tile: The owned range of the tile.
+        :return: A list made of the coordinates of the top left and bottom right points.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        x_start, y_start, x_end, y_end = tile
+        return [
+            [x_start, y_start],
+            [x_end + invader_width - 2, y_end + invader_height - 2],
+        ]
+
+    def to_map_coords(
+        self, frame_coords: [[int, int], [int, int]], x_offset: int, y_offset: int
+    ) -> [[int, int], [int, int]]:
+        return [[x + x_offset, y + y_offset] for x, y in frame_coords]
+
+    def scan(self):
+        """
+        Scan all tiles in a process pool and merge the identified invaders, ordered by
+        their position on the map, as a sequential scan would.
+        """
+        tiles = self.get_tiles()
+        tiles_matrices = []
+        for tile in tiles:
+            [x_start, y_start], [x_end, y_end] = self.get_tile_frame_coords(tile)
+            tiles_matrices.append(self.map.get_frame_at(x_start, y_start, x_end, y_end))
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            tiles_results = executor.map(
+                scan_tile,
+                [type(self.map)] * len(tiles),
+                tiles_matrices,
+                [self.scanner] * len(tiles),
+                [self.bulk] * len(tiles),
+                [self.dp_cache] * len(tiles),
+            )
+
+            identified_invaders = []
+            for (x_offset, y_offset, _, _), tile_results in zip(tiles, tiles_results):
+                for frame, similarity_ratio, frame_coords in tile_results:
+                    identified_invader = self.identified_invader_class(
+                        self.scanner.invader_target,
+                        frame,
+                        similarity_ratio,
+                        self.to_map_coords(frame_coords, x_offset, y_offset),
+                    )
+                    identified_invaders.append(identified_invader)
+
+        identified_invaders.sort(
+            key=lambda inv: (
+                inv.frame_coords_on_map[0][1],
+                inv.frame_coords_on_map[0][0],
+            )
+        )
+        self.identified_invaders.extend(identified_invaders)
+
+    def get_identified_invaders(self) -> list[IdentifiedInvader]:
+        return self.identified_invaders
+
+
+class ParallelDPSphericalRadar(ParallelDPAreaRadar):
+    """
+    A Radar that treats the provided Map as a sphere, and scans it in parallel.
+
+    The halos of the tiles on the edges of the map wrap around to the other side.
+    Since a tile and its halo must fit in the map, tiles own at most
+    `map.width - invader.width + 1` columns and `map.height - invader.height + 1` rows.
+    """
+
+    wraps_around = True
+
+    def get_tiles(self) -> list[tuple[int, int, int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        map_width, map_height = self.map.width, self.map.height
+        tile_columns = max(
+            self.tile_columns, ceil(map_width / (map_width - invader_width + 1))
+        )
+        tile_rows = max(
+            self.tile_rows, ceil(map_height / (map_height - invader_height + 1))
+        )
+        columns = self.split_range(map_width, tile_columns)
+        rows = self.split_range(map_height, tile_rows)
+        return [
+            (x_start, y_start, x_end, y_end)
+            for y_start, y_end in rows
+            for x_start, x_end in columns
+        ]
+
+    def get_tile_frame_coords(
+        self, tile: tuple[int, int, int, int]
+    ) -> [[int, int], [int, int]]:
+        [x_start, y_start], [x_end, y_end] = super().get_tile_frame_coords(tile)
+        return [[x_start, y_start], [x_end % self.map.width, y_end % self.map.height]]
+
+    def to_map_coords(
+        self, frame_coords: [[int, int], [int, int]], x_offset: int, y_offset: int
+    ) -> [[int, int], [int, int]]:
+        return [
+            [(x + x_offset) % self.map.width, (y + y_offset) % self.map.height]
+            for x, y in frame_coords
+        ]
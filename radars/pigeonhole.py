@@ -0,0 +1,232 @@
+from math import ceil
+
+from core.mixins import DynamicProgrammingMixin
+from invaders.base import IdentifiedInvader
+from maps.base import Map
+from radars.base import Radar
+from scanners.base import Scanner
+
+
+class PigeonholeAreaRadar(DynamicProgrammingMixin, Radar):
+    """
+    A Radar that treats the provided Map as a rectangular area of space, and only
+    matches the frames that are anchored by an exact occurrence of a block of the
+    invader pattern.
+
+    A frame that reaches the similarity threshold mismatches the pattern on at most
+    `d` bits. If the pattern is split into `d + 1` disjoint blocks, at least one of
+    them holds no mismatch, so every such frame contains an exact copy of one of the
+    blocks at the right offset. The occurrences of the blocks are found with rolling
+    hashes of the map, and only the frames they anchor are matched.
+
+    This pays off at high similarity thresholds, where the pattern is split into few
+    large blocks, and its cost does not depend on the density of noise of the map. The
+    signal threshold of the scanner is not used, every frame reaching the similarity
+    threshold is identified.
+    """
+
+    def __init__(self, map_: Map, scanner: Scanner):
+        super().__init__(map_, scanner)
+        self.identified_invaders: list[IdentifiedInvader] = []
+
+    def get_map_padding(self) -> tuple[int, int]:
+        """
+        Frames never wrap around a rectangular area, so the map is not padded.
+        :return: The number of columns and rows to pad the map with.
+        """
+        return 0, 0
+
+    def split_pattern_into_blocks(
+        self, number_of_blocks: int
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Split the invader pattern into at least `number_of_blocks` disjoint blocks of
+        similar size, made of bands of rows further split into columns, and keep the
+        `number_of_blocks` biggest ones.
+        :param number_of_blocks: The number of blocks needed, at most the number of
+        bits of the pattern.
+        :return: A list of (x, y, width, height) blocks, relative to the pattern.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        rows = min(invader_height, number_of_blocks)
+        columns = ceil(number_of_blocks / rows)
+        rows_bounds = [i * invader_height // rows for i in range(rows + 1)]
+        columns_bounds = [i * invader_width // columns for i in range(columns + 1)]
+        blocks = [
+            (x_start, y_start, x_end - x_start, y_end - y_start)
+            for y_start, y_end in zip(rows_bounds, rows_bounds[1:])
+            for x_start, x_end in zip(columns_bounds, columns_bounds[1:])
+        ]
+        blocks.sort(key=lambda block: -block[2] * block[3])
+        return blocks[:number_of_blocks]
+
+    @staticmethod
+    def compute_rows_hashes(rows: list[list[int]], width: int) -> list[list[int]]:
+        """
+        Compute the hash of every `width` cells long segment of each row, the cell at
+        [y][x] being the hash of the segment starting at column x of row y.
+
+        The hash of a segment is its cells read as the bits of an integer, the first
+        cell being the lowest bit, so it can be rolled to the next column with a shift.
+        """
+        rows_hashes = []
+        highest_bit = width - 1
+        for row in rows:
+            segment_hash = sum(bit << i for i, bit in enumerate(row[:width]))
+            row_hashes = [segment_hash]
+            for bit in row[width:]:
+                segment_hash = (segment_hash >> 1) | (bit << highest_bit)
+                row_hashes.append(segment_hash)
+            rows_hashes.append(row_hashes)
+        return rows_hashes
+
+    def iter_blocks_hashes(self, rows: list[list[int]], width: int, height: int):
+        """
+        Roll the hash of a `width` x `height` block over the rows of the map, the hash
+        of a block being the hashes of its row segments concatenated, the first row
+        being the lowest bits. Rolling to the next row is a shift as well.
+        :param rows: The rows of the map.
+        :param width: The width of the blocks.
+        :param height: The height of the blocks.
+        :return: A generator of (y, hashes) pairs, hashes[x] being the hash of the
+        block whose top left corner is at (x, y).
+        """
+        rows_hashes = self.compute_rows_hashes(rows, width)
+        highest_row_shift = width * (height - 1)
+        blocks_hashes = [0] * len(rows_hashes[0])
+        for j, row_hashes in enumerate(rows_hashes[:height]):
+            blocks_hashes = [
+                block_hash | (row_hash << (width * j))
+                for block_hash, row_hash in zip(blocks_hashes, row_hashes)
+            ]
+        yield 0, blocks_hashes
+
+        for y, row_hashes in enumerate(rows_hashes[height:], start=1):
+            blocks_hashes = [
+                (block_hash >> width) | (row_hash << highest_row_shift)
+                for block_hash, row_hash in zip(blocks_hashes, row_hashes)
+            ]
+            yield y, blocks_hashes
+
+    def compute_pattern_block_hash(self, block: tuple[int, int, int, int]) -> int:
+        x, y, width, height = block
+        pattern = self.scanner.invader_target.pattern
+        x_end, y_end = x + width, y + height
+        rows = [[int(bit) for bit in pattern[i][x:x_end]] for i in range(y, y_end)]
+        _, blocks_hashes = next(self.iter_blocks_hashes(rows, width, height))
+        return blocks_hashes[0]
+
+    def get_anchor(self, x: int, y: int) -> tuple[int, int] | None:
+        """
+        Compute the top left corner of the frame anchored at (x, y), given by the
+        occurrence of a block minus the offset of the block in the pattern.
+        :return: The top left corner, or None if the frame does not fit in the map.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        if (
+            0 <= x <= self.map.width - invader_width
+            and 0 <= y <= self.map.height - invader_height
+        ):
+            return x, y
+        return None
+
+    def get_candidate_anchors(self) -> list[tuple[int, int]]:
+        """
+        Find the top left corners of the frames that contain an exact occurrence of
+        one of the blocks of the pattern.
+        :return: The top left corners, in the order of a sequential scan.
+        """
+        invader = self.scanner.invader_target
+        max_mismatched_bits = invader.get_max_mismatched_bits(
+            self.scanner.similarity_threshold
+        )
+        if max_mismatched_bits < 0:
+            return []
+
+        if max_mismatched_bits >= invader.number_of_total_bits:
+            # every frame reaches the threshold, there is nothing to prune
+            anchors = {
+                self.get_anchor(x, y)
+                for y in range(self.map.height)
+                for x in range(self.map.width)
+            }
+            anchors.discard(None)
+            return sorted(anchors, key=lambda anchor: (anchor[1], anchor[0]))
+
+        padding = self.get_map_padding()
+        rows = self.map.get_derived(
+            ("padded_rows", *padding),
+            lambda: list(self.iter_padded_rows(self.map, *padding)),
+        )
+        anchors = set()
+        # group the blocks by size, so that each size is hashed over the map once
+        blocks_by_size: dict[tuple[int, int], dict[int, list[tuple[int, int]]]] = {}
+        for block in self.split_pattern_into_blocks(max_mismatched_bits + 1):
+            x, y, width, height = block
+            blocks_by_hash = blocks_by_size.setdefault((width, height), {})
+            block_hash = self.compute_pattern_block_hash(block)
+            blocks_by_hash.setdefault(block_hash, []).append((x, y))
+
+        for (width, height), blocks_by_hash in blocks_by_size.items():
+            for y, blocks_hashes in self.iter_blocks_hashes(rows, width, height):
+                for x, block_hash in enumerate(blocks_hashes):
+                    for x_offset, y_offset in blocks_by_hash.get(block_hash, ()):
+                        anchors.add(self.get_anchor(x - x_offset, y - y_offset))
+
+        anchors.discard(None)
+        return sorted(anchors, key=lambda anchor: (anchor[1], anchor[0]))
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [[x, y], [x + invader_width - 1, y + invader_height - 1]]
+
+    def scan(self):
+        """
+        Match the frames anchored by an occurrence of a block of the pattern, and keep
+        the ones that are similar enough to the invader.
+        """
+        for x, y in self.get_candidate_anchors():
+            frame_coords = self.get_frame_coords_at(x, y)
+            [x_start, y_start], [x_end, y_end] = frame_coords
+            frame = self.map.get_frame_at(x_start, y_start, x_end, y_end)
+            similarity_ratio = self.scanner.process_frame(frame)
+            if similarity_ratio >= self.scanner.similarity_threshold:
+                identified_invader = self.identified_invader_class(
+                    self.scanner.invader_target,
+                    frame,
+                    similarity_ratio,
+                    frame_coords,
+                )
+                self.identified_invaders.append(identified_invader)
+
+    def get_identified_invaders(self) -> list[IdentifiedInvader]:
+        return self.identified_invaders
+
+
+class PigeonholeSphericalRadar(PigeonholeAreaRadar):
+    """
+    A Radar that treats the provided Map as a sphere, and only matches the frames that
+    are anchored by an exact occurrence of a block of the invader pattern.
+
+    The map is padded toroidally, so that the occurrences of the blocks in the frames
+    that wrap around the map are found as well.
+    """
+
+    wraps_around = True
+
+    def get_map_padding(self) -> tuple[int, int]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return invader_width - 1, invader_height - 1
+
+    def get_anchor(self, x: int, y: int) -> tuple[int, int]:
+        return x % self.map.width, y % self.map.height
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [
+            [x, y],
+            [
+                (x + invader_width - 1) % self.map.width,
+                (y + invader_height - 1) % self.map.height,
+            ],
+        ]
@@ -0,0 +1,117 @@
+from core.cache import SummedAreaTableCache
+from maps.base import Map
+from radars.area import DPAreaRadar
+from radars.spherical import DPSphericalRadar
+from scanners.base import Scanner
+
+
+class PyramidDPAreaRadar(DPAreaRadar):
+    """
+    A Radar that treats the provided Map as a rectangular area of space, and searches
+    it coarse-to-fine.
+
+    The top left corners of the frames are grouped into cells of `cell_size` x
+    `cell_size`. All the frames of a cell contain the intersection of the frames at
+    the corners of the cell, and are contained in their union, so the signal bits of
+    these two rectangles, computed in O(1) from the DP matrix, bound the signal bits
+    of every frame of the cell. Cells whose bounds cannot satisfy the scanner are
+    thrown away as a whole, and the frames of the other ones are refined one by one,
+    as `DPAreaRadar` does.
+
+    On large and mostly empty maps, most frames are discarded at the cost of two
+    lookups per cell instead of one per frame.
+    """
+
+    def __init__(
+        self,
+        map_: Map,
+        scanner: Scanner,
+        cell_size: int = 4,
+        dp_cache: SummedAreaTableCache | None = None,
+    ):
+        super().__init__(map_, scanner, dp_cache=dp_cache)
+        self.cell_size = cell_size
+        self.pruned_cells = 0
+
+    def get_frames_grid_size(self) -> tuple[int, int]:
+        """
+        :return: The number of columns and rows of top left corners of frames.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return (
+            self.map.width - invader_width + 1,
+            self.map.height - invader_height + 1,
+        )
+
+    def is_worth_processing_cell(
+        self, x_start: int, y_start: int, x_end: int, y_end: int
+    ) -> bool:
+        """
+        Decide, with the help of the scanner, whether any frame whose top left corner
+        lies in the cell is worth processing.
+        :param x_start: X coordinate of the first top left corner of the cell.
+        :param y_start: Y coordinate of the first top left corner of the cell.
+        :param x_end: X coordinate of the last top left corner of the cell (inclusive).
+        :param y_end: Y coordinate of the last top left corner of the cell (inclusive).
+        :return: A boolean whether the frames of the cell should be refined.
+        """
+        invader_width, invader_height = self.scanner.required_frame_coords
+        # coordinates are not wrapped: the DP matrix of spherical radars is padded
+        max_signal_bits = self.compute_frame_signal_bits_amount(
+            [
+                [x_start, y_start],
+                [x_end + invader_width - 1, y_end + invader_height - 1],
+            ]
+        )
+        min_signal_bits = 0
+        if x_end < x_start + invader_width and y_end < y_start + invader_height:
+            min_signal_bits = self.compute_frame_signal_bits_amount(
+                [
+                    [x_end, y_end],
+                    [x_start + invader_width - 1, y_start + invader_height - 1],
+                ]
+            )
+        return self.scanner.is_worth_processing_frames(min_signal_bits, max_signal_bits)
+
+    def get_candidate_frames_coords(self):
+        """
+        Yield the coordinates of the frames that, based on the signal threshold, are
+        worth analyzing more in-depth, in the same order as a sequential scan.
+        :return: A generator of frame coordinates.
+        """
+        columns, rows = self.get_frames_grid_size()
+        pruned_frames = 0
+
+        for y_start in range(0, rows, self.cell_size):
+            y_end = min(y_start + self.cell_size, rows) - 1
+            cells = []
+            for x_start in range(0, columns, self.cell_size):
+                x_end = min(x_start + self.cell_size, columns) - 1
+                if self.is_worth_processing_cell(x_start, y_start, x_end, y_end):
+                    cells.append((x_start, x_end))
+                else:
+                    self.pruned_cells += 1
+                    pruned_frames += (x_end - x_start + 1) * (y_end - y_start + 1)
+
+            for y in range(y_start, y_end + 1):
+                for x_start, x_end in cells:
+                    for x in range(x_start, x_end + 1):
+                        frame_coords = self.get_frame_coords_at(x, y)
+                        frame_signal_bits_amount = (
+                            self.compute_frame_signal_bits_amount(frame_coords)
+                        )
+                        if self.is_worth_processing_frame(frame_signal_bits_amount):
+                            yield frame_coords
+                        else:
+                            pruned_frames += 1
+
+        self.record_pruned_frames(pruned_frames)
+
+
+class PyramidDPSphericalRadar(PyramidDPAreaRadar, DPSphericalRadar):
+    """
+    A Radar that treats the provided Map as a sphere, and searches it coarse-to-fine.
+    """
+
+    def get_frames_grid_size(self) -> tuple[int, int]:
+        return self.map.width, self.map.height
@@ -1,3 +1,6 @@
+from collections.abc import Iterable
+
+from core.utils import np
 from radars.area import DPAreaRadar
 
 
@@ -5,8 +8,18 @@ class DPSphericalRadar(DPAreaRadar):
     """
     A Radar that treats the provided Map as a sphere.
     Uses dynamic programming to improve performance of search.
+
+    The DP matrix is padded toroidally by the invader width and height minus one, so
+    the frames that wrap around the map are computed with the same four lookups as
+    the ones that do not.
     """
 
+    wraps_around = True
+
+    def get_dp_matrix_padding(self) -> tuple[int, int]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return invader_width - 1, invader_height - 1
+
     def get_next_frame_coords(self) -> [[int, int], [int, int]]:
         """
         Compute the coordinates of the next available frame within the map.
@@ -59,13 +72,46 @@ class DPSphericalRadar(DPAreaRadar):
             self.current_coords = [0, current_y + 1]
             return self.get_next_frame_coords()
 
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [
+            [x, y],
+            [
+                (x + invader_width - 1) % self.map.width,
+                (y + invader_height - 1) % self.map.height,
+            ],
+        ]
+
+    def get_overlapping_frames_starts(
+        self, position: int, length: int, size: int
+    ) -> Iterable[int]:
+        # frames start anywhere and wrap, so they may start after the cell
+        return {(position - offset) % size for offset in range(length)}
+
+    def compute_frames_signal_bits_amounts(self) -> list[list[int]]:
+        """
+        Frames of a spherical map can start at any cell. Thanks to the padding of the
+        DP matrix, the frames that wrap are computed at once with the others.
+        :return: A matrix where the cell at [y][x] holds the signal bits amount of the
+        frame whose top left corner is at (x, y).
+        """
+        amounts = super().compute_frames_signal_bits_amounts()
+
+        # the DP matrix may be padded for bigger frames, in which case there are
+        # more windows than cells in the map
+        map_width, map_height = self.map.width, self.map.height
+        if np is not None and isinstance(amounts, np.ndarray):
+            return amounts[:map_height, :map_width]
+        return [row[:map_width] for row in amounts[:map_height]]
+
     def compute_frame_signal_bits_amount(
         self, frame_coords: [[int, int], [int, int]]
     ) -> int:
         """
-        If the frame does not wrap around on any direction, use the inherited way
-        of DP matrix, which is optimized.
-        Otherwise, compute signal ratio of the wrapped areas and add them up.
+        If the frame does not wrap around on any direction, or if it fits in the padded
+        DP matrix once unwrapped, use the inherited way of DP matrix, which is optimized.
+        Otherwise (i.e. the frame is bigger than the padding), compute signal ratio of
+        the wrapped areas and add them up.
 
         The worst case scenario is when the map wraps around both horizontally
         and vertically.
@@ -89,6 +135,20 @@ class DPSphericalRadar(DPAreaRadar):
         if top_x <= bottom_x and top_y <= bottom_y:
             return super().compute_frame_signal_bits_amount(frame_coords)
 
+        # unwrap the bottom-right corner into the padding of the DP matrix
+        map_width, map_height = self.map.width, self.map.height
+        pad_width, pad_height = self.dp_padding
+        if bottom_x < top_x:
+            bottom_x += map_width
+        if bottom_y < top_y:
+            bottom_y += map_height
+        if bottom_x < map_width + pad_width and bottom_y < map_height + pad_height:
+            return super().compute_frame_signal_bits_amount(
+                [[top_x, top_y], [bottom_x, bottom_y]]
+            )
+        bottom_x %= map_width
+        bottom_y %= map_height
+
         a_signal_bits = 0
         b_signal_bits = 0
         c_signal_bits = 0
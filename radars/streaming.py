@@ -0,0 +1,159 @@
+from collections import deque
+from collections.abc import Iterator
+from itertools import accumulate
+from operator import add, sub
+
+from core.exceptions import MapTooSmallException
+from core.types import Frame
+from invaders.base import IdentifiedInvader
+from maps.streaming import AsciiStreamMap
+from radars.base import Radar
+from scanners.base import Scanner
+
+
+class StreamingDPAreaRadar(Radar):
+    """
+    A Radar that treats the provided streamed Map as a rectangular area of space.
+
+    Only the last `invader.height` rows of the map are kept in memory, along with the
+    amount of signal bits of each of their columns, which acts as a rolling band of the
+    DP matrix. Every time a row is read, the band of frames ending at that row is
+    scanned, and the identified invaders are emitted right away.
+    """
+
+    def __init__(self, map_: AsciiStreamMap, scanner: Scanner):
+        super().__init__(map_, scanner)
+        self.identified_invaders: list[IdentifiedInvader] = []
+
+    def validate_inputs(self):
+        """
+        The size of a streamed map is unknown until it is read, so it is validated
+        while scanning.
+        """
+
+    def validate_map_width(self, map_width: int):
+        invader_width, _ = self.scanner.required_frame_coords
+        if invader_width > map_width:
+            raise MapTooSmallException(
+                "Invader pattern size cannot be bigger than map size."
+            )
+
+    def iter_rows(self) -> Iterator[list[int]]:
+        for row in self.map.iter_rows():
+            self.validate_map_width(len(row))
+            yield row
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        return [[x, y], [x + invader_width - 1, y + invader_height - 1]]
+
+    def scan_band(
+        self, band: deque[list[int]], columns_signal_bits: list[int], y: int
+    ) -> Iterator[IdentifiedInvader]:
+        """
+        Scan all the frames whose top row is the first row of the band.
+
+        :param band: The last `invader.height` rows of the map.
+        :param columns_signal_bits: The amount of signal bits in each column of the band.
+        :param y: The Y coordinate of the first row of the band.
+        :return: A generator of the identified invaders.
+        """
+        invader_width, _ = self.scanner.required_frame_coords
+        cumulative_signal_bits = [0, *accumulate(columns_signal_bits)]
+        pruned_frames = 0
+
+        for x in range(len(columns_signal_bits) - invader_width + 1):
+            frame_signal_bits_amount = (
+                cumulative_signal_bits[x + invader_width] - cumulative_signal_bits[x]
+            )
+            if not self.scanner.is_worth_processing_frame(frame_signal_bits_amount):
+                pruned_frames += 1
+                continue
+
+            frame = Frame([row[x : x + invader_width] for row in band])
+            similarity_ratio = self.scanner.process_frame(frame)
+            if similarity_ratio >= self.scanner.similarity_threshold:
+                yield self.identified_invader_class(
+                    self.scanner.invader_target,
+                    frame,
+                    similarity_ratio,
+                    self.get_frame_coords_at(x, y),
+                )
+
+        self.scanner.record_pruned_frames(pruned_frames)
+
+    def iter_scan(self) -> Iterator[IdentifiedInvader]:
+        """
+        Scan the map one row at a time, emitting identified invaders as soon as the
+        band of frames they belong to is complete.
+        :return: A generator of the identified invaders.
+        """
+        _, invader_height = self.scanner.required_frame_coords
+        band = deque(maxlen=invader_height)
+        columns_signal_bits = None
+
+        for y, row in enumerate(self.iter_rows()):
+            if columns_signal_bits is None:
+                columns_signal_bits = [0] * len(row)
+            if len(band) == invader_height:
+                columns_signal_bits = list(map(sub, columns_signal_bits, band[0]))
+
+            band.append(row)
+            columns_signal_bits = list(map(add, columns_signal_bits, row))
+
+            if len(band) == invader_height:
+                yield from self.scan_band(
+                    band, columns_signal_bits, y - invader_height + 1
+                )
+
+        if len(band) < invader_height:
+            raise MapTooSmallException(
+                "Invader pattern size cannot be bigger than map size."
+            )
+
+    def scan(self):
+        for identified_invader in self.iter_scan():
+            self.identified_invaders.append(identified_invader)
+
+    def get_identified_invaders(self) -> list[IdentifiedInvader]:
+        return self.identified_invaders
+
+
+class StreamingDPSphericalRadar(StreamingDPAreaRadar):
+    """
+    A Radar that treats the provided streamed Map as a sphere.
+
+    Each row is extended with its first `invader.width - 1` cells, and the first
+    `invader.height - 1` rows are kept aside to be scanned again once the map ends,
+    so that frames can wrap around in both directions.
+    """
+
+    wraps_around = True
+
+    def get_map_size(self) -> tuple[int, int]:
+        # the size of a streamed map is only known once it was scanned
+        return self.map_width, self.map_height
+
+    def iter_rows(self) -> Iterator[list[int]]:
+        invader_width, invader_height = self.scanner.required_frame_coords
+        self.map_height = 0
+        first_rows = []
+
+        for row in self.map.iter_rows():
+            self.validate_map_width(len(row))
+            self.map_width = len(row)
+            self.map_height += 1
+            extended_row = row + row[: invader_width - 1]
+            if len(first_rows) < invader_height - 1:
+                first_rows.append(extended_row)
+            yield extended_row
+
+        if self.map_height >= invader_height:
+            yield from first_rows
+
+    def get_frame_coords_at(self, x: int, y: int) -> [[int, int], [int, int]]:
+        [x_start, y_start], [x_end, y_end] = super().get_frame_coords_at(x, y)
+        return [
+            [x_start, y_start],
+            [x_end % self.map_width, y_end % self.map_height],
+        ]
@@ -0,0 +1,149 @@
+from invaders.base import IdentifiedInvader
+
+
+class NonMaximumSuppressor:
+    """
+    Groups the identified invaders whose frames overlap, and keeps the most similar
+    one of each group.
+
+    The identified invaders are visited from the most to the least similar one, and
+    each of them is either kept, or suppressed by the first kept invader of the same
+    original invader it overlaps with. Kept invaders are indexed in a grid of buckets
+    as big as the frames, so only the neighbouring buckets are searched for overlaps.
+
+    When the map size is provided, frames wrap around the map borders, as they do on
+    spherical maps.
+    """
+
+    def __init__(self, map_width: int | None = None, map_height: int | None = None):
+        self.map_width = map_width
+        self.map_height = map_height
+
+    @property
+    def wraps_around(self) -> bool:
+        return self.map_width is not None and self.map_height is not None
+
+    def get_frame_rectangle(
+        self, identified_invader: IdentifiedInvader
+    ) -> tuple[int, int, int, int]:
+        """
+        :return: The top left corner, width and height of the frame of the invader.
+        """
+        [x_start, y_start], [x_end, y_end] = identified_invader.frame_coords_on_map
+        if self.wraps_around:
+            return (
+                x_start,
+                y_start,
+                (x_end - x_start) % self.map_width + 1,
+                (y_end - y_start) % self.map_height + 1,
+            )
+        return x_start, y_start, x_end - x_start + 1, y_end - y_start + 1
+
+    def overlap_on_axis(
+        self, start: int, length: int, other_start: int, other_length: int, size: int
+    ) -> bool:
+        """
+        Check whether two segments of an axis overlap, wrapping around the axis of the
+        map if its size is provided.
+        """
+        if size is None:
+            return other_start < start + length and start < other_start + other_length
+        distance = (other_start - start) % size
+        return distance < length or size - distance < other_length
+
+    def overlap(
+        self, rectangle: tuple[int, int, int, int], other: tuple[int, int, int, int]
+    ) -> bool:
+        x, y, width, height = rectangle
+        other_x, other_y, other_width, other_height = other
+        return self.overlap_on_axis(
+            x, width, other_x, other_width, self.map_width
+        ) and self.overlap_on_axis(y, height, other_y, other_height, self.map_height)
+
+    def cluster(
+        self, identified_invaders: list[IdentifiedInvader]
+    ) -> list[list[IdentifiedInvader]]:
+        """
+        Group the identified invaders whose frames overlap.
+        :param identified_invaders: The identified invaders, in the order of the scan.
+        :return: The groups, in the order of the scan of their first identified
+        invader. The first identified invader of each group is the most similar one.
+        """
+        if not identified_invaders:
+            return []
+
+        rectangles = [self.get_frame_rectangle(inv) for inv in identified_invaders]
+        bucket_size = (
+            max(width for _, _, width, _ in rectangles),
+            max(height for _, _, _, height in rectangles),
+        )
+
+        buckets: dict[tuple[int, int], list[int]] = {}
+        clusters: dict[int, list[int]] = {}
+        order = sorted(
+            range(len(identified_invaders)),
+            key=lambda index: -identified_invaders[index].similarity_ratio,
+        )
+        rank = {index: position for position, index in enumerate(order)}
+
+        for index in order:
+            x, y, _, _ = rectangles[index]
+            bucket = self.get_bucket(x, y, bucket_size)
+            original_invader = identified_invaders[index].original_invader
+            overlapping_kept_indices = [
+                kept_index
+                for neighbour in self.get_neighbour_buckets(bucket, bucket_size)
+                for kept_index in buckets.get(neighbour, ())
+                if identified_invaders[kept_index].original_invader is original_invader
+                and self.overlap(rectangles[kept_index], rectangles[index])
+            ]
+            if overlapping_kept_indices:
+                # the most similar kept invader suppresses this one
+                kept_index = min(overlapping_kept_indices, key=rank.__getitem__)
+                clusters[kept_index].append(index)
+            else:
+                buckets.setdefault(bucket, []).append(index)
+                clusters[index] = [index]
+
+        return [
+            [identified_invaders[index] for index in clusters[kept_index]]
+            for kept_index in sorted(clusters)
+        ]
+
+    def get_grid_size(self, bucket_size: tuple[int, int]) -> tuple[int, int]:
+        """
+        When wrapping, the map is split into as many buckets as fit in it, the last
+        ones absorbing the remainder, so that every bucket is at least as big as the
+        frames and overlapping frames always lie in neighbouring buckets.
+        """
+        bucket_width, bucket_height = bucket_size
+        return self.map_width // bucket_width, self.map_height // bucket_height
+
+    def get_bucket(
+        self, x: int, y: int, bucket_size: tuple[int, int]
+    ) -> tuple[int, int]:
+        bucket_width, bucket_height = bucket_size
+        if not self.wraps_around:
+            return x // bucket_width, y // bucket_height
+        columns, rows = self.get_grid_size(bucket_size)
+        return min(x // bucket_width, columns - 1), min(y // bucket_height, rows - 1)
+
+    def get_neighbour_buckets(
+        self, bucket: tuple[int, int], bucket_size: tuple[int, int]
+    ) -> set[tuple[int, int]]:
+        column, row = bucket
+        neighbours = {(column + dx, row + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+        if not self.wraps_around:
+            return neighbours
+        columns, rows = self.get_grid_size(bucket_size)
+        return {(x % columns, y % rows) for x, y in neighbours}
+
+    def suppress(
+        self, identified_invaders: list[IdentifiedInvader]
+    ) -> list[IdentifiedInvader]:
+        """
+        Keep only the most similar identified invader of each group of overlapping ones.
+        :param identified_invaders: The identified invaders, in the order of the scan.
+        :return: The kept identified invaders, in the order of the scan.
+        """
+        return [cluster[0] for cluster in self.cluster(identified_invaders)]
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from copy import copy
 
 from core.types import Frame
 from invaders.base import Invader
@@ -14,8 +15,28 @@ class Scanner(ABC):
 
     def __init__(self, invader: Invader, similarity_threshold: float):
         self.invader_target = invader
+        self.set_similarity_threshold(similarity_threshold)
+
+    def set_similarity_threshold(self, similarity_threshold: float):
+        """
+        Change the similarity ratio a frame must reach to be identified, e.g. to prune
+        the frames that cannot beat the best ones found so far.
+        :param similarity_threshold: The new similarity threshold.
+        """
         self.similarity_threshold = similarity_threshold
 
+    def for_invader(self, invader: Invader) -> "Scanner":
+        """
+        Build a scanner with the same settings that searches for another invader, e.g.
+        another orientation of the invader target.
+        :param invader: The invader to search for.
+        :return: The scanner.
+        """
+        scanner = copy(self)
+        scanner.invader_target = invader
+        scanner.set_similarity_threshold(self.similarity_threshold)
+        return scanner
+
     @abstractmethod
     def process_frame(self, frame: Frame) -> float:
         """
@@ -35,6 +56,30 @@ class Scanner(ABC):
         """
         raise NotImplementedError("Method not implemented.")
 
+    def is_worth_processing_frames(
+        self, min_signal_bits_in_frames: int, max_signal_bits_in_frames: int
+    ) -> bool:
+        """
+        Decide whether any frame of a group should be processed, knowing only bounds of
+        the amounts of information the frames hold.
+        :param min_signal_bits_in_frames: The least amount of information in a frame.
+        :param max_signal_bits_in_frames: The greatest amount of information in a frame.
+        :return: A boolean whether some frames of the group may undergo processing.
+        """
+        return any(
+            self.is_worth_processing_frame(signal_bits_in_frame)
+            for signal_bits_in_frame in range(
+                min_signal_bits_in_frames, max_signal_bits_in_frames + 1
+            )
+        )
+
+    def record_pruned_frames(self, number_of_frames: int):
+        """
+        Called by radars with the number of frames that were not worth processing.
+        Does nothing by default, scanners that keep statistics can override it.
+        :param number_of_frames: The number of frames that were pruned.
+        """
+
     @property
     def required_frame_coords(self) -> tuple[int, int]:
         """
@@ -30,11 +30,15 @@ class BasicScanner(Scanner):
 
     def process_frame(self, frame: Frame) -> float:
         """
-        Compute the ratio of similarity of the frame to the invader.
+        Compute the ratio of similarity of the frame to the invader. The matching stops
+        as soon as the frame cannot reach the similarity threshold anymore.
         :param frame: The frame to process.
-        :return: The similarity ratio to the invader.
+        :return: The similarity ratio to the invader, or a ratio below the similarity
+        threshold if the frame was rejected early.
         """
-        return self.invader_target.match_against_frame(frame)
+        return self.invader_target.match_against_frame_with_threshold(
+            frame, self.similarity_threshold
+        )
 
     def is_worth_processing_frame(self, signal_bits_in_frame: int) -> bool:
         """
@@ -46,3 +50,9 @@ class BasicScanner(Scanner):
             signal_bits_in_frame / self.invader_target.number_of_total_bits
         )
         return frame_signal_ratio >= self.signal_threshold
+
+    def is_worth_processing_frames(
+        self, min_signal_bits_in_frames: int, max_signal_bits_in_frames: int
+    ) -> bool:
+        # the more signal, the more worth processing, so the upper bound decides
+        return self.is_worth_processing_frame(max_signal_bits_in_frames)
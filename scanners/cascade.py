@@ -0,0 +1,87 @@
+from operator import sub
+
+from core.types import Frame
+from invaders.base import Invader
+from scanners.lossless import LosslessScanner
+
+
+class CascadeScanner(LosslessScanner):
+    """
+    A lossless scanner that filters frames through a cascade of lower bounds on the
+    number of bits they mismatch the invader with, from the cheapest to the most
+    expensive, before matching them:
+
+    1. the amount of signal bits of the whole frame (see `LosslessScanner`),
+    2. the amount of signal bits of each row: a row with `r` signal bits differs from
+       a pattern row with `p` signal bits on at least `|r - p|` cells,
+    3. the amount of signal bits of each column, likewise.
+
+    The radar provides the rows and columns profiles of the frames, which it can
+    compute in O(h) and O(w) time. The number of frames that each stage gives up on
+    is kept in `pruned_frames`, `pruned_frames_by_rows`, `pruned_frames_by_columns`
+    and `rejected_frames` (frames that were matched but are not similar enough).
+    """
+
+    def __init__(self, target: Invader, similarity_threshold=None):
+        super().__init__(target, similarity_threshold)
+        self.rows_signal_bits = [int(sum(row)) for row in target.pattern]
+        self.columns_signal_bits = [int(sum(column)) for column in zip(*target.pattern)]
+        self.pruned_frames_by_rows = 0
+        self.pruned_frames_by_columns = 0
+        self.rejected_frames = 0
+
+    def for_invader(self, invader: Invader) -> "CascadeScanner":
+        scanner = super().for_invader(invader)
+        scanner.rows_signal_bits = [int(sum(row)) for row in invader.pattern]
+        scanner.columns_signal_bits = [
+            int(sum(column)) for column in zip(*invader.pattern)
+        ]
+        return scanner
+
+    def compute_profile_distance(
+        self, frame_profile: list[int], pattern_profile: list[int]
+    ) -> int:
+        """
+        Compute a lower bound of the number of mismatched bits between a frame and the
+        pattern, given their amounts of signal bits per row (or per column).
+        :param frame_profile: The amount of signal bits per row (or column) of the frame.
+        :param pattern_profile: The same for the pattern.
+        :return: The lower bound of mismatched bits.
+        """
+        return sum(map(abs, map(sub, frame_profile, pattern_profile)))
+
+    def is_worth_processing_rows(self, rows_signal_bits: list[int]) -> bool:
+        """
+        Check if the amounts of signal bits of the rows of the frame are close enough
+        to the invader's ones for the frame to reach the similarity threshold.
+        :param rows_signal_bits: Amount of signal bits in each row of the frame.
+        :return: A boolean whether the frame can be similar enough to the invader.
+        """
+        distance = self.compute_profile_distance(
+            rows_signal_bits, self.rows_signal_bits
+        )
+        if distance > self.max_mismatched_bits:
+            self.pruned_frames_by_rows += 1
+            return False
+        return True
+
+    def is_worth_processing_columns(self, columns_signal_bits: list[int]) -> bool:
+        """
+        Check if the amounts of signal bits of the columns of the frame are close
+        enough to the invader's ones for the frame to reach the similarity threshold.
+        :param columns_signal_bits: Amount of signal bits in each column of the frame.
+        :return: A boolean whether the frame can be similar enough to the invader.
+        """
+        distance = self.compute_profile_distance(
+            columns_signal_bits, self.columns_signal_bits
+        )
+        if distance > self.max_mismatched_bits:
+            self.pruned_frames_by_columns += 1
+            return False
+        return True
+
+    def process_frame(self, frame: Frame) -> float:
+        similarity_ratio = super().process_frame(frame)
+        if similarity_ratio < self.similarity_threshold:
+            self.rejected_frames += 1
+        return similarity_ratio
@@ -0,0 +1,63 @@
+from core.types import Frame
+from invaders.base import Invader
+from scanners.base import Scanner
+
+
+class LosslessScanner(Scanner):
+    """
+    A scanner that only prunes the frames that cannot possibly be the target invader.
+
+    A frame with `s` signal bits differs from an invader with `k` signal bits on at
+    least `|s - k|` cells, so at most `N - |s - k|` of its `N` cells can match. With
+    `d` being the number of mismatched bits allowed by the similarity threshold, a
+    frame is processed only if `k - d <= s <= k + d`. Unlike the signal threshold of
+    the `BasicScanner`, this never drops a frame that would have been identified.
+
+    The number of pruned frames is reported by the radars in `pruned_frames`.
+    """
+
+    def __init__(self, target: Invader, similarity_threshold=None):
+        if not similarity_threshold:
+            similarity_threshold = 0.7
+
+        super().__init__(target, similarity_threshold)
+        self.pruned_frames = 0
+
+    def set_similarity_threshold(self, similarity_threshold: float):
+        super().set_similarity_threshold(similarity_threshold)
+        target = self.invader_target
+        self.max_mismatched_bits = target.get_max_mismatched_bits(similarity_threshold)
+        self.min_signal_bits = target.number_of_signal_bits - self.max_mismatched_bits
+        self.max_signal_bits = target.number_of_signal_bits + self.max_mismatched_bits
+
+    def process_frame(self, frame: Frame) -> float:
+        """
+        Compute the ratio of similarity of the frame to the invader. The matching stops
+        as soon as the frame cannot reach the similarity threshold anymore.
+        :param frame: The frame to process.
+        :return: The similarity ratio to the invader, or a ratio below the similarity
+        threshold if the frame was rejected early.
+        """
+        return self.invader_target.match_against_frame_with_threshold(
+            frame, self.similarity_threshold
+        )
+
+    def is_worth_processing_frame(self, signal_bits_in_frame: int) -> bool:
+        """
+        Check if the frame's signal bits are close enough to the invader's ones for the
+        frame to reach the similarity threshold.
+        :param signal_bits_in_frame: Amount of signal bits in frame.
+        :return: A boolean whether the frame can be similar enough to the invader.
+        """
+        return self.min_signal_bits <= signal_bits_in_frame <= self.max_signal_bits
+
+    def is_worth_processing_frames(
+        self, min_signal_bits_in_frames: int, max_signal_bits_in_frames: int
+    ) -> bool:
+        return (
+            min_signal_bits_in_frames <= self.max_signal_bits
+            and max_signal_bits_in_frames >= self.min_signal_bits
+        )
+
+    def record_pruned_frames(self, number_of_frames: int):
+        self.pruned_frames += number_of_frames
@@ -0,0 +1,123 @@
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.baseline import find_regressions, load_baseline, save_baseline
+from benchmarks.suite import BENCHMARKS, BenchmarkCase, iter_cases, run_benchmarks
+from core.exceptions import InvalidBaselineException
+
+
+def test_benchmark_case_get_sample():
+    # setup
+    case = BenchmarkCase(size=60, density=0.2, invaders=3)
+
+    # run
+    sample = case.get_sample()
+
+    # assert
+    assert (
+        sample.ascii_string
+        == BenchmarkCase(60, 0.2, invaders=1).get_sample().ascii_string
+    )
+    assert [len(row) for row in sample.ascii_string.split("\n")] == [60] * 60
+    assert len(sample.placed_invaders) == 1
+    assert len(case.get_invaders()) == 3
+
+
+def test_run_benchmarks():
+    # setup
+    cases = list(iter_cases([20], [0.1, 0.3], [1, 2]))
+
+    # run
+    results = run_benchmarks(cases, repeat=1)
+
+    # assert
+    assert len(results) == 2 * 2 + 2 * 2 * (len(BENCHMARKS) - 2)
+    assert "parse_map[ascii,size=20,density=0.1,flip_rate=0.0]" in results
+    assert (
+        "dp_area_radar_scan[ascii,size=20,density=0.3,flip_rate=0.0,invaders=2,"
+        "signal_threshold=None]" in results
+    )
+    assert all(timings["best"] <= timings["median"] for timings in results.values())
+    assert all(
+        0 <= timings["recall"] <= 1
+        for name, timings in results.items()
+        if name.startswith("dp_")
+    )
+
+
+def test_run_benchmarks_with_signal_thresholds():
+    # setup
+    cases = list(iter_cases([20], [0.1], [1], signal_thresholds=[None, 0.5]))
+
+    # run
+    results = run_benchmarks(cases, repeat=1)
+
+    # assert
+    assert (
+        "dp_area_radar_scan[ascii,size=20,density=0.1,flip_rate=0.0,invaders=1,"
+        "signal_threshold=None]" in results
+    )
+    assert (
+        "dp_area_radar_scan[ascii,size=20,density=0.1,flip_rate=0.0,invaders=1,"
+        "signal_threshold=0.5]" in results
+    )
+    assert len(results) == 2 + 2 * 2 + 1
+
+
+def test_find_regressions():
+    # setup
+    baseline = {"a": {"best": 1.0}, "b": {"best": 1.0}, "c": {"best": 1.0}}
+    results = {"a": {"best": 1.05}, "b": {"best": 1.5}, "d": {"best": 9.0}}
+
+    # run
+    regressions = find_regressions(results, baseline, tolerance=0.1)
+
+    # assert
+    assert regressions == {"b": 1.5}
+
+
+def test_save_and_load_baseline(tmp_path):
+    # setup
+    path = tmp_path / "baseline.json"
+    results = {"a": {"best": 1.0, "median": 2.0, "repeat": 3}}
+
+    # run
+    save_baseline(path, results)
+
+    # assert
+    assert load_baseline(path) == results
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "not json",
+        '{"results": {}}',
+        '{"version": 1, "sample_version": 2, "results": {}}',
+        '{"version": 2, "results": {}}',
+        '{"version": 2, "sample_version": 0, "results": {}}',
+    ],
+)
+def test_load_baseline_raises(tmp_path, content):
+    # setup
+    path = tmp_path / "baseline.json"
+    path.write_text(content)
+
+    # run & assert
+    with pytest.raises(InvalidBaselineException):
+        load_baseline(path)
+
+
+def test_main_fails_on_regressions(tmp_path):
+    # setup
+    path = tmp_path / "baseline.json"
+    arguments = ["--sizes", "20", "--densities", "0.2", "--invaders", "1"]
+    arguments += ["--only", "parse_map", "--repeat", "1"]
+    main([*arguments, "--save", str(path)])
+    save_baseline(path, {name: {"best": 1e-9} for name in load_baseline(path)})
+
+    # run
+    exit_status = main([*arguments, "--compare", str(path), "--tolerance", "0.5"])
+
+    # assert
+    assert exit_status == 1
@@ -3,11 +3,18 @@ import pytest
 from core.exceptions import (
     EmptyFrameException,
     EmptyInvaderException,
+    InvalidCompiledInvaderException,
     NonMatchingFramesException,
     NoSignalException,
 )
-from core.types import Frame
+from core.types import Frame, PackedFrame
+from core.utils import np
+from invaders.array import ArrayAsciiInvader
 from invaders.ascii import AsciiInvader
+from invaders.bitset import BitsetAsciiInvader
+from invaders.compiled import CompiledInvader, InvaderCache
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
 
 
 def test_invader_raises_exception_on_empty_signal():
@@ -62,6 +69,49 @@ def test_ascii_invader_match_against_frame():
     assert match_probability == expected_probability
 
 
+@pytest.mark.parametrize("invader_class", [AsciiInvader, BitsetAsciiInvader])
+@pytest.mark.parametrize(
+    "frame,similarity_threshold,expected_result",
+    [
+        ([[1, 1, 0, 0], [1, 1, 1, 1], [0, 0, 1, 1]], 0.9, 1.0),  # exact match
+        ([[1, 1, 0, 0], [1, 1, 1, 0], [0, 0, 1, 1]], 0.9, 11 / 12),  # one flip
+        ([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]], 0.9, 10 / 12),  # first row only
+        ([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]], 0.0, 4 / 12),  # no early exit
+    ],
+)
+def test_invader_match_against_frame_with_threshold(
+    invader_class, frame, similarity_threshold, expected_result
+):
+    # setup
+    invader = invader_class("oo--\n" "oooo\n" "--oo\n")
+
+    # run
+    actual_result = invader.match_against_frame_with_threshold(
+        Frame(frame), similarity_threshold
+    )
+
+    # assert
+    assert invader.match_order == [0, 2, 1]
+    assert actual_result == expected_result
+    if expected_result >= similarity_threshold:
+        assert actual_result == invader.match_against_frame(Frame(frame))
+
+
+@pytest.mark.parametrize(
+    "similarity_threshold,expected_result",
+    [(0.9, 1), (0.75, 3), (0.0, 12), (1.0, 0), (1.1, -1)],
+)
+def test_invader_get_max_mismatched_bits(similarity_threshold, expected_result):
+    # setup
+    invader = AsciiInvader("oo--\n" "oooo\n" "--oo\n")
+
+    # run
+    actual_result = invader.get_max_mismatched_bits(similarity_threshold)
+
+    # assert
+    assert actual_result == expected_result
+
+
 def test_ascii_invader_pretty_representation():
     # setup
     invader = AsciiInvader("~~~\n" "oo--\n" "oooo\n" "--oo\n" "~~~")
@@ -72,3 +122,240 @@ def test_ascii_invader_pretty_representation():
 
     # assert
     assert actual_result == expected_result
+
+
+@requires_numpy
+def test_array_ascii_invader_match_against_frame():
+    # setup
+    frame = np.array(
+        [
+            [0, 1, 0, 0],
+            [1, 1, 1, 1],
+            [0, 0, 0, 0],
+        ],
+        dtype=np.uint8,
+    )
+    invader = ArrayAsciiInvader("~~~\n" "oo--\n" "oooo\n" "--oo\n" "~~~")
+
+    # run
+    match_probability = invader.match_against_frame(frame)
+
+    # assert
+    assert match_probability == 0.75
+    assert invader.number_of_signal_bits == 8
+    assert invader.pretty_representation() == "oo--\n" "oooo\n" "--oo\n"
+
+
+@requires_numpy
+def test_array_ascii_invader_validate_frame_raises_non_matching_frames_exception():
+    # setup
+    invader = ArrayAsciiInvader("-o")
+
+    # run & assert
+    with pytest.raises(NonMatchingFramesException):
+        invader.validate_frame(np.array([[0, 1, 0]], dtype=np.uint8))
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        Frame([[0, 1, 0, 0], [1, 1, 1, 1], [0, 0, 0, 0]]),
+        PackedFrame([0b0010, 0b1111, 0b0000], 4),
+    ],
+)
+def test_bitset_ascii_invader_match_against_frame(frame):
+    # setup
+    invader = BitsetAsciiInvader("~~~\n" "oo--\n" "oooo\n" "--oo\n" "~~~")
+
+    # run
+    match_probability = invader.match_against_frame(frame)
+
+    # assert
+    assert match_probability == 0.75
+    assert invader.row_masks == [0b0011, 0b1111, 0b1100]
+    assert invader.number_of_signal_bits == 8
+    assert (invader.width, invader.height) == (4, 3)
+
+
+def test_bitset_ascii_invader_validate_frame_raises_non_matching_frames_exception():
+    # setup
+    invader = BitsetAsciiInvader("-o")
+
+    # run & assert
+    with pytest.raises(NonMatchingFramesException):
+        invader.validate_frame(PackedFrame([0b010], 3))
+
+
+@pytest.mark.parametrize(
+    "invader_class",
+    [
+        AsciiInvader,
+        BitsetAsciiInvader,
+        pytest.param(ArrayAsciiInvader, marks=requires_numpy),
+    ],
+)
+def test_invader_variants(invader_class):
+    # setup
+    invader = invader_class("oo-\n" "-o-\n")
+    expected_patterns = {
+        "identity": [[1, 1, 0], [0, 1, 0]],
+        "rotate_90": [[0, 1], [1, 1], [0, 0]],
+        "rotate_180": [[0, 1, 0], [0, 1, 1]],
+        "rotate_270": [[0, 0], [1, 1], [1, 0]],
+        "mirror": [[0, 1, 1], [0, 1, 0]],
+        "mirror_rotate_90": [[0, 0], [1, 1], [0, 1]],
+        "mirror_rotate_180": [[0, 1, 0], [1, 1, 0]],
+        "mirror_rotate_270": [[1, 0], [1, 1], [0, 0]],
+    }
+
+    # run
+    variants = invader.variants
+
+    # assert
+    assert variants["identity"] is invader
+    assert all(type(variant) is invader_class for variant in variants.values())
+    assert {
+        name: [list(map(int, row)) for row in variant.pattern]
+        for name, variant in variants.items()
+    } == expected_patterns
+
+
+@pytest.mark.parametrize(
+    "ascii_string,expected_orientations",
+    [
+        ("o-o\n" "ooo\n", ["identity", "rotate_90", "rotate_180", "rotate_270"]),
+        ("o-\n" "-o\n", ["identity", "rotate_90"]),
+        ("oo\n" "oo\n", ["identity"]),
+    ],
+)
+def test_invader_variants_leave_out_symmetric_orientations(
+    ascii_string, expected_orientations
+):
+    # setup
+    invader = AsciiInvader(ascii_string)
+
+    # run
+    variants = invader.variants
+
+    # assert
+    assert list(variants) == expected_orientations
+
+
+def test_invader_content_hash_does_not_depend_on_the_kind_of_invader():
+    # setup
+    ascii_string = "oo-\n" "-o-\n"
+    invader_classes = [AsciiInvader, BitsetAsciiInvader]
+    if np is not None:
+        invader_classes.append(ArrayAsciiInvader)
+
+    # run
+    content_hashes = {
+        invader_class(ascii_string).content_hash for invader_class in invader_classes
+    }
+
+    # assert
+    assert len(content_hashes) == 1
+    assert AsciiInvader("oo\n" "-o\n").content_hash not in content_hashes
+
+
+def test_compiled_invader_to_bytes_and_back():
+    # setup
+    invader = AsciiInvader("--o-----o--\n" "---o---o---\n" "--ooooooo--\n")
+    compiled = CompiledInvader.from_invader(invader)
+
+    # run
+    actual_result = CompiledInvader.from_bytes(compiled.to_bytes())
+    lazy_result = CompiledInvader.from_bytes(compiled.to_bytes(), lazy=True)
+
+    # assert
+    assert lazy_result.identity.rows == compiled.patterns["identity"].rows
+    assert list(lazy_result.patterns) == list(invader.variants)
+    assert list(actual_result.patterns) == list(invader.variants)
+    for name, pattern in actual_result.patterns.items():
+        variant = invader.variants[name]
+        assert (pattern.width, pattern.height) == (variant.width, variant.height)
+        assert pattern.number_of_signal_bits == variant.number_of_signal_bits
+        assert pattern.match_order == variant.match_order
+
+
+@pytest.mark.parametrize("data", [b"", b"INVC\x02\x01", b"INVC\x01\x01\x08identity"])
+def test_compiled_invader_from_bytes_raises(data):
+    # run & assert
+    with pytest.raises(InvalidCompiledInvaderException):
+        CompiledInvader.from_bytes(data)
+    with pytest.raises(InvalidCompiledInvaderException):
+        CompiledInvader.from_bytes(data, lazy=True).identity
+
+
+@pytest.mark.parametrize(
+    "invader_class",
+    [
+        AsciiInvader,
+        BitsetAsciiInvader,
+        pytest.param(ArrayAsciiInvader, marks=requires_numpy),
+    ],
+)
+def test_invader_cache_get(tmp_path, invader_class):
+    # setup
+    ascii_string = "oo-\n" "-o-\n"
+    cache = InvaderCache(tmp_path / "invaders.bundle")
+    expected_invader = invader_class(ascii_string)
+
+    # run
+    compiled_invader = cache.get(ascii_string, invader_class)
+    loaded_invader = InvaderCache(cache.path).get(ascii_string, invader_class)
+
+    # assert
+    assert cache.path.exists()
+    assert compiled_invader.compiled is None
+    assert loaded_invader.compiled is not None
+    assert type(loaded_invader) is invader_class
+    assert [list(map(int, row)) for row in loaded_invader.pattern] == [
+        [1, 1, 0],
+        [0, 1, 0],
+    ]
+    assert loaded_invader.number_of_signal_bits == 3
+    assert loaded_invader.match_order == expected_invader.match_order
+    assert loaded_invader.match_against_frame([[1, 1, 0], [0, 1, 1]]) == 5 / 6
+    assert {
+        name: [list(map(int, row)) for row in variant.pattern]
+        for name, variant in loaded_invader.variants.items()
+    } == {
+        name: [list(map(int, row)) for row in variant.pattern]
+        for name, variant in expected_invader.variants.items()
+    }
+
+
+def test_invader_cache_appends_to_the_bundle(tmp_path):
+    # setup
+    cache = InvaderCache(tmp_path / "invaders.bundle")
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    cache.get("oo-\n" "-o-\n", AsciiInvader)
+
+    # run
+    cache.get("o\n" "o\n", AsciiInvader)
+    other_cache = InvaderCache(cache.path)
+
+    # assert
+    assert other_cache.load(invader.content_hash, AsciiInvader).width == 3
+    assert other_cache.get("~o\no\n~", AsciiInvader).compiled is not None
+    assert other_cache.load("0" * 64, AsciiInvader) is None
+
+
+@pytest.mark.parametrize("corruption", [slice(-1, None), slice(-3, -2), slice(0, 1)])
+def test_invader_cache_get_recompiles_corrupted_records(tmp_path, corruption):
+    # setup
+    path = tmp_path / "invaders.bundle"
+    InvaderCache(path).get("oo-\n" "-o-\n", AsciiInvader)
+    data = bytearray(path.read_bytes())
+    data[corruption] = b"x"
+    path.write_bytes(data)
+
+    # run
+    recompiled_invader = InvaderCache(path).get("oo-\n" "-o-\n", AsciiInvader)
+    loaded_invader = InvaderCache(path).get("oo-\n" "-o-\n", AsciiInvader)
+
+    # assert
+    assert recompiled_invader.compiled is None
+    assert loaded_invader.compiled is not None
+    assert loaded_invader.number_of_signal_bits == 3
@@ -1,9 +1,26 @@
+import pickle
 from unittest.mock import patch
 
 import pytest
 
-from core.exceptions import EmptyMapException
+from core.exceptions import (
+    EmptyMapException,
+    IncompatibleMapViewException,
+    InvalidAsciiCharacterException,
+    InvalidMapChangeException,
+    MapTooSmallException,
+    NonRectangularMatrixException,
+)
+from core.utils import np
+from invaders.ascii import AsciiInvader
+from invaders.identified import AsciiIdentifiedInvader
+from maps.array import ArrayAsciiMap, ArrayAsciiSphericalMap
 from maps.ascii import AsciiMap, AsciiSphericalMap
+from maps.bitset import BitsetAsciiMap, BitsetAsciiSphericalMap
+from maps.streaming import AsciiStreamMap
+from maps.synthetic import SyntheticSample, SyntheticSampleGenerator
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
 
 
 @pytest.fixture
@@ -84,3 +101,440 @@ def test_ascii_spherical_map_get_frame_at(
 
     # assert
     assert frame == expected_result
+
+
+def test_ascii_spherical_map_get_frame_at_is_a_view(map_binary_repr):
+    # setup
+    ascii_map = AsciiSphericalMap.from_binary_matrix(map_binary_repr)
+    frame = ascii_map.get_frame_at(4, 2, 1, 1)
+
+    # run
+    ascii_map.representation[0][0] = 1
+
+    # assert
+    assert frame.representation is ascii_map.representation
+    assert frame == [[0, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert frame.materialize() == [[0, 0, 0], [0, 1, 0], [0, 0, 1]]
+    assert pickle.loads(pickle.dumps(frame)) == [[0, 0, 0], [0, 1, 0], [0, 0, 1]]
+
+
+@requires_numpy
+def test_array_ascii_map_initialization(map_binary_repr):
+    # setup
+    ascii_string = "~~~\n--o--\n-o-o-\n--o--\n~~~"
+
+    # run
+    array_map = ArrayAsciiMap(ascii_string)
+
+    # assert
+    assert array_map.representation.dtype == np.uint8
+    assert array_map.representation.tolist() == map_binary_repr
+    assert (array_map.width, array_map.height) == (5, 3)
+
+
+@requires_numpy
+def test_array_ascii_map_get_frame_at():
+    # setup
+    array_map = ArrayAsciiMap("--o--\n-o-o-\n--o--")
+
+    # run
+    frame = array_map.get_frame_at(1, 1, 3, 2)
+
+    # assert
+    assert frame.tolist() == [[1, 0, 1], [0, 1, 0]]
+
+
+@requires_numpy
+@pytest.mark.parametrize(
+    "x_start,y_start,x_end,y_end,expected_result",
+    [
+        (1, 1, 3, 2, [[1, 0, 1], [0, 1, 0]]),  # doesn't wrap
+        (4, 1, 1, 2, [[0, 0, 1], [0, 0, 0]]),  # wrap horizontally
+        (1, 2, 3, 0, [[0, 1, 0], [0, 1, 0]]),  # wrap vertically
+        (4, 2, 1, 1, [[0, 0, 0], [0, 0, 0], [0, 0, 1]]),  # wrap both ways
+    ],
+)
+def test_array_ascii_spherical_map_get_frame_at(
+    x_start, y_start, x_end, y_end, expected_result
+):
+    # setup
+    array_map = ArrayAsciiSphericalMap("--o--\n-o-o-\n--o--")
+
+    # run
+    frame = array_map.get_frame_at(x_start, y_start, x_end, y_end)
+
+    # assert
+    assert frame.tolist() == expected_result
+
+
+def test_bitset_ascii_map_initialization(map_binary_repr):
+    # setup
+    ascii_string = "~~~\n--o--\n-o-o-\n--o--\n~~~"
+
+    # run
+    bitset_map = BitsetAsciiMap(ascii_string)
+
+    # assert
+    assert bitset_map.representation.rows == [0b00100, 0b01010, 0b00100]
+    assert bitset_map.representation == map_binary_repr
+    assert (bitset_map.width, bitset_map.height) == (5, 3)
+
+
+def test_bitset_ascii_map_get_frame_at():
+    # setup
+    bitset_map = BitsetAsciiMap("--o--\n-o-o-\n--o--")
+
+    # run
+    frame = bitset_map.get_frame_at(1, 1, 3, 2)
+
+    # assert
+    assert frame.width == 3
+    assert frame == [[1, 0, 1], [0, 1, 0]]
+
+
+@pytest.mark.parametrize(
+    "x_start,y_start,x_end,y_end,expected_result",
+    [
+        (1, 1, 3, 2, [[1, 0, 1], [0, 1, 0]]),  # doesn't wrap
+        (4, 1, 1, 2, [[0, 0, 1], [0, 0, 0]]),  # wrap horizontally
+        (1, 2, 3, 0, [[0, 1, 0], [0, 1, 0]]),  # wrap vertically
+        (4, 2, 1, 1, [[0, 0, 0], [0, 0, 0], [0, 0, 1]]),  # wrap both ways
+    ],
+)
+def test_bitset_ascii_spherical_map_get_frame_at(
+    x_start, y_start, x_end, y_end, expected_result
+):
+    # setup
+    bitset_map = BitsetAsciiSphericalMap("--o--\n-o-o-\n--o--")
+
+    # run
+    frame = bitset_map.get_frame_at(x_start, y_start, x_end, y_end)
+
+    # assert
+    assert frame == expected_result
+
+
+def test_ascii_stream_map_iter_rows(map_binary_repr):
+    # setup
+    lines = ["~~~~\n", "--o--\n", "-o-o-\n", "\n", "--o--\n", "~~~~\n"]
+    stream_map = AsciiStreamMap(iter(lines))
+
+    # run
+    rows = list(stream_map.iter_rows())
+
+    # assert
+    assert rows == map_binary_repr
+    assert stream_map.width == 5
+
+
+def test_ascii_stream_map_from_file(tmp_path, map_binary_repr):
+    # setup
+    path = tmp_path / "sample.txt"
+    path.write_text("~~~~\n--o--\n-o-o-\n--o--\n~~~~\n")
+
+    # run
+    rows = list(AsciiStreamMap.from_file(str(path)).iter_rows())
+
+    # assert
+    assert rows == map_binary_repr
+
+
+@pytest.mark.parametrize(
+    "lines,exception",
+    [
+        (["~~~~", "~~~~"], EmptyMapException),
+        (["--o--", "-o-"], NonRectangularMatrixException),
+    ],
+)
+def test_ascii_stream_map_iter_rows_raises(lines, exception):
+    # setup
+    stream_map = AsciiStreamMap(lines)
+
+    # run & assert
+    with pytest.raises(exception):
+        list(stream_map.iter_rows())
+
+
+@pytest.mark.parametrize(
+    "map_class",
+    [
+        AsciiMap,
+        AsciiSphericalMap,
+        BitsetAsciiMap,
+        BitsetAsciiSphericalMap,
+        pytest.param(ArrayAsciiMap, marks=requires_numpy),
+        pytest.param(ArrayAsciiSphericalMap, marks=requires_numpy),
+    ],
+)
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_ascii_map_from_file(tmp_path, map_class, newline, map_binary_repr):
+    # setup
+    path = tmp_path / "sample.txt"
+    path.write_bytes(
+        newline.join(["", "~~~~", "--o--", "-o-o-", "--o--", "~~~~", ""]).encode()
+    )
+
+    # run
+    map_ = map_class.from_file(path)
+
+    # assert
+    assert isinstance(map_, map_class)
+    assert [list(row) for row in map_.representation] == map_binary_repr
+    assert (map_.width, map_.height) == (5, 3)
+
+
+@pytest.mark.parametrize(
+    "map_class",
+    [AsciiMap, BitsetAsciiMap, pytest.param(ArrayAsciiMap, marks=requires_numpy)],
+)
+@pytest.mark.parametrize(
+    "content,exception",
+    [
+        ("", EmptyMapException),
+        ("~~~~\n~~~~\n", EmptyMapException),
+        ("~~~~\n--o--\n-o-o\n--o--\n~~~~", NonRectangularMatrixException),
+        ("~~~~\n--o--\n-o-o-\n--o-\n~~~~", NonRectangularMatrixException),
+        ("~~~~\n--o--\n-oxo-\n--o--\n~~~~", InvalidAsciiCharacterException),
+    ],
+)
+def test_ascii_map_from_file_raises(tmp_path, map_class, content, exception):
+    # setup
+    path = tmp_path / "sample.txt"
+    path.write_text(content)
+
+    # run & assert
+    with pytest.raises(exception):
+        map_class.from_file(path)
+
+
+@pytest.mark.parametrize(
+    "map_class",
+    [
+        AsciiMap,
+        BitsetAsciiSphericalMap,
+        pytest.param(ArrayAsciiMap, marks=requires_numpy),
+    ],
+)
+def test_ascii_map_apply_changes(map_class):
+    # setup
+    map_ = map_class("--o--\n" "-o-o-\n" "--o--\n")
+    expected_binary_repr = [
+        [1, 0, 1, 0, 0],
+        [0, 1, 0, 1, 0],
+        [0, 0, 0, 0, 1],
+    ]
+
+    # run
+    changed_cells = map_.apply_changes([(0, 0, 1), (2, 2, 0), (1, 1, 1), (4, 2, 1)])
+
+    # assert
+    assert changed_cells == [(0, 0), (2, 2), (4, 2)]
+    assert [list(map(int, row)) for row in map_.representation] == expected_binary_repr
+    assert map_.get_cell(4, 2) == 1
+
+
+@pytest.mark.parametrize("change", [(5, 0, 1), (0, -1, 1), (0, 0, 2)])
+def test_ascii_map_apply_changes_raises(change):
+    # setup
+    map_ = AsciiMap("--o--\n" "-o-o-\n" "--o--\n")
+
+    # run & assert
+    with pytest.raises(InvalidMapChangeException):
+        map_.apply_changes([(0, 0, 1), (1, 1, 0), change])
+    assert str(map_) == "00100\n" "01010\n" "00100"
+
+
+def test_maps_content_hash():
+    # setup
+    ascii_string = "--o--\n" "-o-o-\n" "--o--\n"
+    map_classes = [AsciiMap, AsciiSphericalMap, BitsetAsciiMap]
+    if np is not None:
+        map_classes.append(ArrayAsciiMap)
+
+    # run
+    content_hashes = {map_class(ascii_string).content_hash for map_class in map_classes}
+    changed_map = AsciiMap(ascii_string)
+    changed_map.apply_changes([(0, 0, 1)])
+
+    # assert
+    assert len(content_hashes) == 1
+    assert changed_map.content_hash not in content_hashes
+    assert AsciiMap("--o--\n" "-o-o-\n").content_hash not in content_hashes
+
+
+def test_map_get_derived_is_invalidated_by_changes():
+    # setup
+    map_ = AsciiMap("--o--\n" "-o-o-\n")
+    derived = map_.get_derived("key", lambda: [1])
+
+    # run
+    cached_derived = map_.get_derived("key", lambda: [2])
+    map_.apply_changes([(0, 0, 0)])
+    unchanged_derived = map_.get_derived("key", lambda: [3])
+    map_.apply_changes([(0, 0, 1)])
+    changed_derived = map_.get_derived("key", lambda: [4])
+
+    # assert
+    assert cached_derived is derived
+    assert unchanged_derived is derived
+    assert changed_derived == [4]
+    assert pickle.loads(pickle.dumps(map_)).get_derived("key", lambda: [5]) == [5]
+
+
+def test_map_get_derived_is_invalidated_when_changes_fail():
+    # setup
+    map_ = AsciiMap("--o--\n" "-o-o-\n")
+    map_.get_derived("key", lambda: [1])
+    set_cell = map_.set_cell
+
+    def fail_on_second_cell(x, y, value):
+        if (x, y) == (1, 0):
+            raise MemoryError
+        set_cell(x, y, value)
+
+    # run
+    with patch.object(map_, "set_cell", side_effect=fail_on_second_cell):
+        with pytest.raises(MemoryError):
+            map_.apply_changes([(0, 0, 1), (1, 0, 1)])
+    derived = map_.get_derived("key", lambda: [2])
+
+    # assert
+    assert map_.get_cell(0, 0) == 1
+    assert derived == [2]
+
+
+@pytest.mark.parametrize(
+    "map_class,view_class",
+    [
+        (AsciiMap, AsciiSphericalMap),
+        (BitsetAsciiSphericalMap, BitsetAsciiMap),
+        pytest.param(ArrayAsciiMap, ArrayAsciiSphericalMap, marks=requires_numpy),
+    ],
+)
+def test_map_view_as(map_class, view_class):
+    # setup
+    map_ = map_class("--o--\n" "-o-o-\n" "--o--\n")
+    derived = map_.get_derived("key", lambda: [1])
+
+    # run
+    view = map_.view_as(view_class)
+    view.apply_changes([(4, 2, 1)])
+
+    # assert
+    assert type(view) is view_class
+    assert view.representation is map_.representation
+    assert map_.get_cell(4, 2) == 1
+    assert view.get_derived("key", lambda: [2]) is not derived
+    assert map_.get_derived("key", lambda: [3]) == [2]
+
+
+@pytest.mark.parametrize(
+    "view_class",
+    [BitsetAsciiMap, pytest.param(ArrayAsciiSphericalMap, marks=requires_numpy)],
+)
+def test_map_view_as_raises(view_class):
+    # setup
+    map_ = AsciiMap("--o--\n" "-o-o-\n" "--o--\n")
+
+    # run & assert
+    with pytest.raises(IncompatibleMapViewException):
+        map_.view_as(view_class)
+
+
+@pytest.mark.parametrize("spherical", [False, True])
+def test_synthetic_sample_generator_generate(spherical):
+    # setup
+    invaders = [AsciiInvader("oo-\n" "-o-\n"), AsciiInvader("o-\n" "oo\n" "-o\n")]
+    generator = SyntheticSampleGenerator(
+        invaders, background_density=0.3, orientations=True, spherical=spherical, seed=3
+    )
+
+    # run
+    sample = generator.generate(12, 9, 6)
+
+    # assert
+    map_ = sample.to_map()
+    assert (map_.width, map_.height) == (12, 9)
+    assert isinstance(map_, AsciiSphericalMap if spherical else AsciiMap)
+    occupied_cells = set()
+    for placed in sample.placed_invaders:
+        invader = invaders[placed.invader_index]
+        variant = invader.variants[placed.orientation]
+        [x_start, y_start], [x_end, y_end] = placed.frame_coords
+        frame = map_.get_frame_at(x_start, y_start, x_end, y_end)
+        assert list(map(list, frame)) == variant.pattern
+        assert placed.content_hash == variant.content_hash
+        assert placed.flipped_bits == 0
+        cells = {
+            ((x_start + i) % 12, (y_start + j) % 9)
+            for j in range(variant.height)
+            for i in range(variant.width)
+        }
+        assert occupied_cells.isdisjoint(cells)
+        occupied_cells |= cells
+    assert [placed.invader_index for placed in sample.placed_invaders] == [0, 1] * 3
+
+
+def test_synthetic_sample_generator_generate_flips_bits():
+    # setup
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    generator = SyntheticSampleGenerator(
+        [invader], false_positive_rate=1.0, false_negative_rate=1.0, seed=0
+    )
+
+    # run
+    sample = generator.generate(5, 5, 1)
+
+    # assert
+    [placed] = sample.placed_invaders
+    [x_start, y_start], [x_end, y_end] = placed.frame_coords
+    frame = sample.to_map().get_frame_at(x_start, y_start, x_end, y_end)
+    assert list(map(list, frame)) == [[0, 0, 1], [1, 0, 1]]
+    assert placed.flipped_bits == 6
+
+
+def test_synthetic_sample_generator_generate_raises():
+    # setup
+    generator = SyntheticSampleGenerator([AsciiInvader("oo\n" "oo\n")], seed=0)
+
+    # run & assert
+    with pytest.raises(MapTooSmallException):
+        generator.generate(1, 5, 1)
+    with pytest.raises(MapTooSmallException):
+        generator.generate(3, 3, 2)
+
+
+def test_synthetic_sample_save_and_load(tmp_path):
+    # setup
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    sample = SyntheticSampleGenerator([invader], seed=0).generate(8, 6, 2)
+    path = tmp_path / "sample.txt"
+
+    # run
+    sample.save(path)
+    loaded_sample = SyntheticSample.load(path)
+
+    # assert
+    assert AsciiMap.from_file(path).representation == sample.to_map().representation
+    assert loaded_sample.get_ground_truth() == sample.get_ground_truth()
+    assert loaded_sample.ascii_string == sample.ascii_string
+
+
+def test_synthetic_sample_compute_recall():
+    # setup
+    invaders = [AsciiInvader("oo-\n" "-o-\n"), AsciiInvader("o-\n" "oo\n" "-o\n")]
+    sample = SyntheticSampleGenerator(invaders, seed=0).generate(12, 9, 4)
+    found, _, missed, _ = sample.placed_invaders
+    identified_invaders = [
+        AsciiIdentifiedInvader(invaders[0], [], 1.0, found.frame_coords),
+        AsciiIdentifiedInvader(invaders[1], [], 1.0, found.frame_coords),
+    ]
+
+    # run
+    recall = sample.compute_recall(identified_invaders)
+    recall_of_first_invader = sample.compute_recall(identified_invaders, invaders[:1])
+
+    # assert
+    assert (found.invader_index, missed.invader_index) == (0, 0)
+    assert recall == 0.25
+    assert recall_of_first_invader == 0.5
@@ -1,8 +1,25 @@
+import os
+
 import pytest
 
-from core.exceptions import InvalidAsciiCharacterException
-from core.mixins import AsciiToBinaryMixin, DynamicProgrammingMixin
+from core.cache import SummedAreaTableCache
+from core.exceptions import (
+    InvalidAsciiCharacterException,
+    NonRectangularMatrixException,
+)
+from core.mixins import (
+    AsciiToArrayMixin,
+    AsciiToBitsetMixin,
+    AsciiToBinaryMixin,
+    BinaryToAsciiMixin,
+    DynamicProgrammingMixin,
+)
+from core.utils import np
+from maps.array import ArrayAsciiMap
 from maps.ascii import AsciiMap
+from maps.bitset import BitsetAsciiMap
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
 
 
 def test_ascii_to_binary_mixin_convert_ascii_to_binary_matrix():
@@ -66,3 +83,280 @@ def test_dp_programming_mixin_compute_dp_matrix():
 
     # assert
     assert actual_result == expected_result
+
+
+@pytest.mark.parametrize("map_class", [AsciiMap, BitsetAsciiMap])
+def test_dp_programming_mixin_compute_dp_matrix_with_padding(map_class):
+    # setup
+    map_ = map_class("o-oo-\n" "o-o-o\n" "oo--o\n")
+    expected_result = [
+        [1, 1, 2, 3, 3, 4],
+        [2, 2, 4, 5, 6, 8],
+        [3, 4, 6, 7, 9, 12],
+        [4, 5, 8, 10, 12, 16],
+    ]
+
+    # run
+    actual_result = DynamicProgrammingMixin.compute_dp_matrix(
+        map_, pad_width=1, pad_height=1
+    )
+
+    # assert
+    assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    "map_class",
+    [AsciiMap, BitsetAsciiMap, pytest.param(ArrayAsciiMap, marks=requires_numpy)],
+)
+@pytest.mark.parametrize("from_row", [0, 1, 2])
+def test_dp_programming_mixin_update_dp_matrix(map_class, from_row):
+    # setup
+    map_ = map_class("o-oo-\n" "o-o-o\n" "oo--o\n")
+    dp_matrix = DynamicProgrammingMixin.compute_dp_matrix(map_, 1, 1)
+    map_.apply_changes([(0, 2, 0), (4, 2, 0)] if from_row == 2 else [(0, from_row, 0)])
+    expected_result = DynamicProgrammingMixin.compute_dp_matrix(map_, 1, 1)
+
+    # run
+    DynamicProgrammingMixin.update_dp_matrix(dp_matrix, map_, from_row, 1, 1)
+
+    # assert
+    assert list(map(list, dp_matrix)) == list(map(list, expected_result))
+
+
+@pytest.mark.parametrize("map_class", [AsciiMap, BitsetAsciiMap])
+def test_dp_programming_mixin_compute_rows_and_columns_prefix_sums(map_class):
+    # setup
+    map_ = map_class("o-oo-\n" "oo--o\n")
+    expected_rows_prefix_sums = [
+        [0, 1, 1, 2, 3, 3, 4],
+        [0, 1, 2, 2, 2, 3, 4],
+        [0, 1, 1, 2, 3, 3, 4],
+    ]
+    expected_columns_prefix_sums = [
+        [0, 0, 0, 0, 0, 0],
+        [1, 0, 1, 1, 0, 1],
+        [2, 1, 1, 1, 1, 2],
+        [3, 1, 2, 2, 1, 3],
+    ]
+
+    # run
+    rows_prefix_sums = DynamicProgrammingMixin.compute_rows_prefix_sums(map_, 1, 1)
+    columns_prefix_sums = DynamicProgrammingMixin.compute_columns_prefix_sums(
+        map_, 1, 1
+    )
+
+    # assert
+    assert rows_prefix_sums == expected_rows_prefix_sums
+    assert columns_prefix_sums == expected_columns_prefix_sums
+
+
+@requires_numpy
+def test_ascii_to_array_mixin_raises_non_rectangular_matrix_exception():
+    # run & assert
+    with pytest.raises(NonRectangularMatrixException):
+        AsciiToArrayMixin.convert_ascii_to_binary_matrix("--o\n-o")
+
+
+@requires_numpy
+def test_ascii_to_array_mixin_raises_invalid_character_exception():
+    # run & assert
+    with pytest.raises(InvalidAsciiCharacterException):
+        AsciiToArrayMixin.convert_ascii_to_binary_matrix("--o\n-x-")
+
+
+@requires_numpy
+def test_dp_programming_mixin_compute_dp_matrix_on_array_map():
+    # setup
+    map_ = ArrayAsciiMap("o-oo-\n" "o-o-o\n" "oo--o\n")
+    expected_result = [
+        [1, 1, 2, 3, 3],
+        [2, 2, 4, 5, 6],
+        [3, 4, 6, 7, 9],
+    ]
+
+    # run
+    actual_result = DynamicProgrammingMixin.compute_dp_matrix(map_)
+
+    # assert
+    assert actual_result.tolist() == expected_result
+
+
+def test_ascii_to_bitset_mixin_convert_ascii_to_binary_matrix():
+    # setup
+    ascii_string = "--o--\n-o-oo\n--o--"
+
+    # run
+    actual_result = AsciiToBitsetMixin.convert_ascii_to_binary_matrix(ascii_string)
+
+    # assert
+    assert actual_result.width == 5
+    assert actual_result.rows == [0b00100, 0b11010, 0b00100]
+
+
+def test_ascii_to_bitset_mixin_raises_non_rectangular_matrix_exception():
+    # run & assert
+    with pytest.raises(NonRectangularMatrixException):
+        AsciiToBitsetMixin.convert_ascii_to_binary_matrix("--o\n-o")
+
+
+def test_dp_programming_mixin_compute_window_signal_bits_amounts():
+    # setup
+    dp_matrix = [
+        [1, 1, 2, 3, 3],
+        [2, 2, 4, 5, 6],
+        [3, 4, 6, 7, 9],
+    ]
+    expected_result = [
+        [4, 3, 4],
+        [4, 2, 3],
+    ]
+
+    # run
+    actual_result = DynamicProgrammingMixin.compute_window_signal_bits_amounts(
+        dp_matrix, 3, 2
+    )
+
+    # assert
+    assert actual_result == expected_result
+
+
+@requires_numpy
+def test_dp_programming_mixin_compute_window_signal_bits_amounts_on_array():
+    # setup
+    dp_matrix = np.array(
+        [
+            [1, 1, 2, 3, 3],
+            [2, 2, 4, 5, 6],
+            [3, 4, 6, 7, 9],
+        ]
+    )
+    expected_result = [
+        [4, 3, 4],
+        [4, 2, 3],
+    ]
+
+    # run
+    actual_result = DynamicProgrammingMixin.compute_window_signal_bits_amounts(
+        dp_matrix, 3, 2
+    )
+
+    # assert
+    assert actual_result.tolist() == expected_result
+
+
+def test_convert_ascii_to_binary_matrix_reports_invalid_character_position():
+    # setup
+    ascii_string = "--o--\n" "-o-o-\n" "--o-x\n" "-a---"
+
+    # run & assert
+    with pytest.raises(
+        InvalidAsciiCharacterException, match="x character at row 2, column 4"
+    ):
+        AsciiToBinaryMixin.convert_ascii_to_binary_matrix(ascii_string)
+
+
+def test_convert_ascii_to_binary_matrix_raises_non_rectangular_matrix_exception():
+    # run & assert
+    with pytest.raises(NonRectangularMatrixException):
+        AsciiToBinaryMixin.convert_ascii_to_binary_matrix("--o--\n" "-o-o\n")
+
+
+def test_binary_to_ascii_mixin_convert_binary_matrix_to_ascii():
+    # setup
+    binary_matrix = [[0, 0, 1, 0, 0], [0, 1, 0, 1, 0]]
+    expected_result = "--o--\n" "-o-o-\n"
+
+    # run
+    actual_result = BinaryToAsciiMixin.convert_binary_matrix_to_ascii(binary_matrix)
+
+    # assert
+    assert actual_result == expected_result
+
+
+@requires_numpy
+def test_binary_to_ascii_mixin_convert_binary_matrix_to_ascii_on_array():
+    # setup
+    binary_matrix = np.array([[0, 0, 1, 0, 0], [0, 1, 0, 1, 0]], dtype=np.uint8)
+    expected_result = "--o--\n" "-o-o-\n"
+
+    # run
+    actual_result = BinaryToAsciiMixin.convert_binary_matrix_to_ascii(binary_matrix)
+
+    # assert
+    assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    "mixin_class",
+    [
+        AsciiToBinaryMixin,
+        AsciiToBitsetMixin,
+        pytest.param(AsciiToArrayMixin, marks=requires_numpy),
+    ],
+)
+def test_ascii_mixins_convert_packed_rows_to_binary_matrix(mixin_class):
+    # setup
+    expected_result = [[1, 1, 0, 0, 1], [0, 0, 0, 0, 0]]
+
+    # run
+    actual_result = mixin_class.convert_packed_rows_to_binary_matrix([0b10011, 0], 5)
+
+    # assert
+    assert [list(map(int, row)) for row in actual_result] == expected_result
+
+
+@requires_numpy
+@pytest.mark.parametrize("map_class", [AsciiMap, BitsetAsciiMap, ArrayAsciiMap])
+def test_summed_area_table_cache_get_dp_matrix(tmp_path, map_class):
+    # setup
+    cache = SummedAreaTableCache(tmp_path)
+    map_ = map_class("--o--\n" "-o-o-\n" "--o--\n")
+    expected_result = DynamicProgrammingMixin.compute_dp_matrix(map_, 1, 2)
+
+    # run
+    missed_result = cache.get_dp_matrix(map_, 1, 2)
+    hit_result = cache.get_dp_matrix(map_, 1, 2)
+
+    # assert
+    assert os.listdir(tmp_path) == [f"{map_.content_hash}-1x2.npy"]
+    assert np.array_equal(np.asarray(missed_result), np.asarray(expected_result))
+    assert np.array_equal(np.asarray(hit_result), np.asarray(expected_result))
+    if map_class is ArrayAsciiMap:
+        assert isinstance(hit_result, np.memmap)
+    else:
+        assert isinstance(hit_result, list)
+
+
+@requires_numpy
+def test_summed_area_table_cache_get_dp_matrix_recomputes_corrupted_file(tmp_path):
+    # setup
+    cache = SummedAreaTableCache(tmp_path)
+    map_ = AsciiMap("--o--\n" "-o-o-\n" "--o--\n")
+    cache.get_path(map_.content_hash, 0, 0).write_bytes(b"corrupted")
+
+    # run
+    actual_result = cache.get_dp_matrix(map_)
+
+    # assert
+    assert actual_result == DynamicProgrammingMixin.compute_dp_matrix(map_)
+    assert cache.get_dp_matrix(map_) == actual_result
+
+
+@requires_numpy
+def test_summed_area_table_cache_evicts_least_recently_used_files(tmp_path):
+    # setup
+    maps = [AsciiMap("o-\n" "--\n"), AsciiMap("-o\n" "--\n"), AsciiMap("--\n" "o-\n")]
+    cache = SummedAreaTableCache(tmp_path)
+    for i, map_ in enumerate(maps[:2]):
+        cache.get_dp_matrix(map_)
+        os.utime(cache.get_path(map_.content_hash, 0, 0), (i, i))
+    cache.max_size = 2 * cache.get_path(maps[0].content_hash, 0, 0).stat().st_size
+
+    # run
+    cache.get_dp_matrix(maps[2])
+
+    # assert
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f"{map_.content_hash}-0x0.npy" for map_ in maps[1:]
+    )
@@ -1,13 +1,57 @@
+import os
 from unittest import mock
 
 import pytest
 
-from core.exceptions import MapTooSmallException
+from core.cache import SummedAreaTableCache
+from core.exceptions import (
+    InvalidMapChangeException,
+    MapTooSmallException,
+    NoScannerException,
+)
 from core.types import Frame
+from core.utils import np
+from invaders.array import ArrayAsciiInvader
+from invaders.ascii import AsciiInvader
+from invaders.bitset import BitsetAsciiInvader
 from invaders.identified import AsciiIdentifiedInvader
-from maps.ascii import AsciiMap
+from maps.array import ArrayAsciiMap, ArrayAsciiSphericalMap
+from maps.ascii import AsciiMap, AsciiSphericalMap
+from maps.streaming import AsciiStreamMap
 from radars.area import DPAreaRadar
+from radars.cascade import CascadeDPAreaRadar, CascadeDPSphericalRadar
+from radars.correlation import CorrelationAreaRadar, CorrelationSphericalRadar
+from radars.multi import MultiTargetDPAreaRadar, MultiTargetDPSphericalRadar
+from radars.orientation import (
+    OrientationInvariantDPAreaRadar,
+    OrientationInvariantDPSphericalRadar,
+)
+from radars.parallel import ParallelDPAreaRadar, ParallelDPSphericalRadar
+from radars.pigeonhole import PigeonholeAreaRadar, PigeonholeSphericalRadar
+from radars.pyramid import PyramidDPAreaRadar, PyramidDPSphericalRadar
+from radars.streaming import StreamingDPAreaRadar, StreamingDPSphericalRadar
 from radars.spherical import DPSphericalRadar
+from radars.suppression import NonMaximumSuppressor
+from scanners.basic import BasicScanner
+from scanners.cascade import CascadeScanner
+from scanners.lossless import LosslessScanner
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+
+@pytest.fixture
+def noisy_map_string():
+    # fmt: off
+    # one row of the map per line, that black would join otherwise
+    return (
+        "-o--o-oo\n"
+        "ooo-o---\n"
+        "-o-o-ooo\n"
+        "o--o-oo-\n"
+        "-oo-ooo-\n"
+        "o-o--o-o\n"
+    )
+    # fmt: on
 
 
 @mock.patch.object(DPAreaRadar, "compute_dp_matrix")
@@ -16,6 +60,7 @@ def test_dp_area_radar_validate_inputs_successfully(mock_compute_dp_matrix):
     map_ = mock.Mock()
     map_.width = 3
     map_.height = 3
+    map_.get_derived.side_effect = lambda key, factory: factory()
     scanner = mock.Mock()
     scanner.required_frame_coords = [2, 3]
 
@@ -287,3 +332,943 @@ def test_dp_spherical_radar_compute_frame_signal_bits_amount_case_frame_wraps_bo
 
     # assert
     assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    "frame_coords,expected_result",
+    [
+        ([[2, 0], [0, 1]], 4),  # wrap horizontally
+        ([[1, 2], [3, 0]], 4),  # wrap vertically
+        ([[3, 2], [1, 0]], 4),  # wrap both ways
+    ],
+)
+def test_dp_spherical_radar_compute_frame_signal_bits_amount_uses_padded_dp_matrix(
+    frame_coords, expected_result
+):
+    # setup
+    map_ = AsciiSphericalMap("-ooo\n" "o-o-\n" "o--o\n")
+    scanner = mock.Mock()
+    scanner.required_frame_coords = [3, 2]
+    radar = DPSphericalRadar(map_, scanner)
+
+    # run
+    actual_result = radar.compute_frame_signal_bits_amount(frame_coords)
+
+    # assert
+    assert radar.dp_padding == (2, 1)
+    assert len(radar.dp_matrix) == 4
+    assert len(radar.dp_matrix[0]) == 6
+    assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    "radar_class,map_class",
+    [(DPAreaRadar, AsciiMap), (DPSphericalRadar, AsciiSphericalMap)],
+)
+def test_dp_radar_bulk_scan_matches_sequential_scan(
+    radar_class, map_class, noisy_map_string
+):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    radar = radar_class(map_class(noisy_map_string), scanner)
+    bulk_radar = radar_class(map_class(noisy_map_string), scanner, bulk=True)
+
+    # run
+    radar.scan()
+    bulk_radar.scan()
+
+    # assert
+    assert len(bulk_radar.get_identified_invaders()) > 0
+    assert [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in bulk_radar.get_identified_invaders()
+    ] == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in radar.get_identified_invaders()
+    ]
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+@pytest.mark.parametrize(
+    "radar_class,map_class",
+    [(DPAreaRadar, AsciiMap), (DPSphericalRadar, AsciiSphericalMap)],
+)
+def test_dp_radar_scan_with_lossless_scanner_misses_no_invader(
+    radar_class, map_class, bulk, noisy_map_string
+):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    scanner = LosslessScanner(invader, similarity_threshold=0.8)
+    radar = radar_class(map_class(noisy_map_string), scanner, bulk=bulk)
+    # a signal threshold of (almost) zero makes the reference radar process all frames
+    reference_scanner = BasicScanner(
+        invader, signal_threshold=1e-9, similarity_threshold=0.8
+    )
+    reference_radar = radar_class(map_class(noisy_map_string), reference_scanner)
+    expected_pruned_frames = sum(
+        not 3 <= amount <= 5
+        for row in radar.compute_frames_signal_bits_amounts()
+        for amount in row
+    )
+
+    # run
+    radar.scan()
+    reference_radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in radar.get_identified_invaders()
+    ] == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in reference_radar.get_identified_invaders()
+    ]
+    assert scanner.pruned_frames == expected_pruned_frames > 0
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (CascadeDPAreaRadar, DPAreaRadar, AsciiMap),
+        (CascadeDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_cascade_radar_scan_matches_lossless_scan(
+    radar_class, reference_radar_class, map_class, bulk, noisy_map_string
+):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    scanner = CascadeScanner(invader, similarity_threshold=0.8)
+    radar = radar_class(map_class(noisy_map_string), scanner, bulk=bulk)
+    reference_radar = reference_radar_class(
+        map_class(noisy_map_string), LosslessScanner(invader, 0.8)
+    )
+    total_frames = sum(len(row) for row in radar.compute_frames_signal_bits_amounts())
+
+    # run
+    radar.scan()
+    reference_radar.scan()
+
+    # assert
+    identified_invaders = [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in radar.get_identified_invaders()
+    ]
+    assert len(identified_invaders) > 0
+    assert identified_invaders == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in reference_radar.get_identified_invaders()
+    ]
+    assert scanner.pruned_frames_by_rows + scanner.pruned_frames_by_columns > 0
+    assert total_frames == (
+        scanner.pruned_frames
+        + scanner.pruned_frames_by_rows
+        + scanner.pruned_frames_by_columns
+        + scanner.rejected_frames
+        + len(identified_invaders)
+    )
+
+
+@pytest.mark.parametrize(
+    "similarity_threshold,expected_result",
+    [
+        (0.8, [(0, 0, 3, 1), (0, 1, 3, 1)]),
+        (0.6, [(1, 0, 2, 1), (1, 1, 2, 1), (0, 0, 1, 1)]),
+    ],
+)
+def test_pigeonhole_radar_split_pattern_into_blocks(
+    similarity_threshold, expected_result, noisy_map_string
+):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    scanner = LosslessScanner(invader, similarity_threshold)
+    radar = PigeonholeAreaRadar(AsciiMap(noisy_map_string), scanner)
+    number_of_blocks = invader.get_max_mismatched_bits(similarity_threshold) + 1
+
+    # run
+    actual_result = radar.split_pattern_into_blocks(number_of_blocks)
+
+    # assert
+    assert actual_result == expected_result
+
+
+@pytest.mark.parametrize("similarity_threshold", [0.6, 0.8, 1.0])
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (PigeonholeAreaRadar, DPAreaRadar, AsciiMap),
+        (PigeonholeSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_pigeonhole_radar_scan_matches_lossless_scan(
+    radar_class,
+    reference_radar_class,
+    map_class,
+    similarity_threshold,
+    noisy_map_string,
+):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    radar = radar_class(
+        map_class(noisy_map_string), LosslessScanner(invader, similarity_threshold)
+    )
+    reference_radar = reference_radar_class(
+        map_class(noisy_map_string), LosslessScanner(invader, similarity_threshold)
+    )
+
+    # run
+    radar.scan()
+    reference_radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in radar.get_identified_invaders()
+    ] == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+@pytest.mark.parametrize("cell_size", [1, 2, 3, 16])
+@pytest.mark.parametrize("scanner_class", [BasicScanner, LosslessScanner])
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (PyramidDPAreaRadar, DPAreaRadar, AsciiMap),
+        (PyramidDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_pyramid_radar_scan_matches_sequential_scan(
+    radar_class,
+    reference_radar_class,
+    map_class,
+    scanner_class,
+    cell_size,
+    noisy_map_string,
+):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    radar = radar_class(
+        map_class(noisy_map_string),
+        scanner_class(invader, similarity_threshold=0.8),
+        cell_size=cell_size,
+    )
+    reference_radar = reference_radar_class(
+        map_class(noisy_map_string), scanner_class(invader, similarity_threshold=0.8)
+    )
+
+    # run
+    radar.scan()
+    reference_radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in radar.get_identified_invaders()
+    ] == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+def test_pyramid_radar_scan_prunes_empty_cells():
+    # setup
+    map_ = AsciiMap("--------\n" "--------\n" "--------\n" "-----o--\n" "----ooo-\n")
+    scanner = LosslessScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.8)
+    radar = PyramidDPAreaRadar(map_, scanner, cell_size=2)
+
+    # run
+    radar.scan()
+
+    # assert
+    assert [inv.frame_coords_on_map for inv in radar.get_identified_invaders()] == [
+        [[4, 3], [6, 4]]
+    ]
+    assert radar.pruned_cells == 4
+    assert scanner.pruned_frames == 4 * 6 - 3
+
+
+def test_dp_spherical_radar_compute_frames_signal_bits_amounts():
+    # setup
+    map_ = AsciiSphericalMap("-ooo\n" "o-o-\n" "o--o\n")
+    scanner = mock.Mock()
+    scanner.required_frame_coords = [2, 2]
+    radar = DPSphericalRadar(map_, scanner)
+    expected_result = [
+        [2, 3, 3, 2],
+        [2, 1, 2, 3],
+        [2, 2, 3, 3],
+    ]
+
+    # run
+    actual_result = radar.compute_frames_signal_bits_amounts()
+
+    # assert
+    assert actual_result == expected_result
+
+
+@requires_numpy
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (CorrelationAreaRadar, DPAreaRadar, AsciiMap),
+        (CorrelationSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_correlation_radar_scan_matches_dp_radar_scan(
+    radar_class, reference_radar_class, map_class, noisy_map_string
+):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    radar = radar_class(map_class(noisy_map_string), scanner)
+    reference_radar = reference_radar_class(map_class(noisy_map_string), scanner)
+    reference_radar.scan()
+
+    # run
+    radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [inv.pretty_representation() for inv in radar.get_identified_invaders()] == [
+        inv.pretty_representation() for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+@requires_numpy
+def test_correlation_spherical_radar_compute_frames_scores():
+    # setup
+    map_ = AsciiSphericalMap("-ooo\n" "o-o-\n" "o--o\n")
+    scanner = BasicScanner(AsciiInvader("oo\n" "-o\n"))
+    radar = CorrelationSphericalRadar(map_, scanner)
+    expected_signal_bits = [
+        [2, 3, 3, 2],
+        [2, 1, 2, 3],
+        [2, 2, 3, 3],
+    ]
+
+    # run
+    signal_bits, matching_bits = radar.compute_frames_scores()
+
+    # assert
+    assert signal_bits.tolist() == expected_signal_bits
+    assert matching_bits[0, 1] == 4
+    assert matching_bits[0, 0] == 1
+    assert matching_bits[2, 3] == 2  # wraps both ways
+
+
+def test_multi_target_dp_area_radar_groups_scanners_by_frame_size():
+    # setup
+    map_ = AsciiMap("-ooo\n" "o-o-\n" "o--o\n")
+    scanners = [
+        BasicScanner(AsciiInvader("oo\n" "-o\n")),
+        BasicScanner(AsciiInvader("ooo\n")),
+        BasicScanner(AsciiInvader("o-\n" "oo\n")),
+    ]
+
+    # run
+    radar = MultiTargetDPAreaRadar(map_, scanners)
+
+    # assert
+    assert radar.scanner_groups == {
+        (2, 2): [scanners[0], scanners[2]],
+        (3, 1): [scanners[1]],
+    }
+
+
+@pytest.mark.parametrize(
+    "radar_class", [MultiTargetDPAreaRadar, MultiTargetDPSphericalRadar]
+)
+def test_multi_target_dp_radar_without_scanners_raises_exception(radar_class):
+    # setup
+    map_ = AsciiMap("-ooo\n" "o-o-\n" "o--o\n")
+
+    # run & assert
+    with pytest.raises(NoScannerException):
+        radar_class(map_, [])
+
+
+def test_multi_target_dp_area_radar_validate_inputs_raises_exception():
+    # setup
+    map_ = AsciiMap("-ooo\n" "o-o-\n" "o--o\n")
+    invaders = [AsciiInvader("oo\n"), AsciiInvader("o\n" "o\n" "o\n" "o\n")]
+
+    # run & assert
+    with pytest.raises(MapTooSmallException):
+        MultiTargetDPAreaRadar.from_invaders(map_, invaders)
+
+
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (MultiTargetDPAreaRadar, DPAreaRadar, AsciiMap),
+        (MultiTargetDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_multi_target_radar_scan_matches_one_radar_per_invader(
+    radar_class, reference_radar_class, map_class, noisy_map_string
+):
+    # setup
+    map_ = map_class(noisy_map_string)
+    scanners = [
+        BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6),
+        BasicScanner(AsciiInvader("o-o\n" "-o-\n"), similarity_threshold=0.6),
+        BasicScanner(AsciiInvader("oo\n" "o-\n"), similarity_threshold=0.7),
+    ]
+    radar = radar_class(map_, scanners)
+    expected_result = {}
+    for scanner in scanners:
+        reference_radar = reference_radar_class(map_, scanner)
+        reference_radar.scan()
+        expected_result[scanner.invader_target] = [
+            (inv.frame_coords_on_map, inv.similarity_ratio)
+            for inv in reference_radar.get_identified_invaders()
+        ]
+
+    # run
+    with mock.patch.object(
+        radar_class, "compute_dp_matrix", wraps=radar.compute_dp_matrix
+    ) as mocked_compute_dp:
+        radar.scan()
+
+    # assert
+    mocked_compute_dp.assert_not_called()
+    actual_result = {
+        invader: [(inv.frame_coords_on_map, inv.similarity_ratio) for inv in found]
+        for invader, found in radar.get_identified_invaders_by_invader().items()
+    }
+    assert actual_result == expected_result
+    assert len(radar.get_identified_invaders()) == sum(
+        len(found) for found in expected_result.values()
+    )
+
+
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (ParallelDPAreaRadar, DPAreaRadar, AsciiMap),
+        (ParallelDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_parallel_radar_scan_matches_sequential_scan(
+    radar_class, reference_radar_class, map_class, noisy_map_string
+):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    radar = radar_class(
+        map_class(noisy_map_string), scanner, max_workers=2, tile_rows=3, tile_columns=2
+    )
+    reference_radar = reference_radar_class(map_class(noisy_map_string), scanner)
+    reference_radar.scan()
+
+    # run
+    radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [inv.pretty_representation() for inv in radar.get_identified_invaders()] == [
+        inv.pretty_representation() for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+def test_parallel_spherical_radar_get_tiles():
+    # setup
+    map_ = AsciiSphericalMap("-ooo\n" "o-o-\n" "o--o\n")
+    scanner = BasicScanner(AsciiInvader("ooo\n" "-o-\n"))
+    radar = ParallelDPSphericalRadar(map_, scanner, max_workers=1)
+    expected_result = [(0, 0, 2, 2), (2, 0, 4, 2), (0, 2, 2, 3), (2, 2, 4, 3)]
+
+    # run
+    actual_result = radar.get_tiles()
+
+    # assert
+    assert actual_result == expected_result
+    assert radar.get_tile_frame_coords((2, 2, 4, 3)) == [[2, 2], [1, 0]]
+
+
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (StreamingDPAreaRadar, DPAreaRadar, AsciiMap),
+        (StreamingDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_streaming_radar_scan_matches_dp_radar_scan(
+    radar_class, reference_radar_class, map_class, noisy_map_string
+):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    stream_map = AsciiStreamMap(noisy_map_string.splitlines())
+    radar = radar_class(stream_map, scanner)
+    reference_radar = reference_radar_class(map_class(noisy_map_string), scanner)
+    reference_radar.scan()
+
+    # run
+    radar.scan()
+
+    # assert
+    assert len(radar.get_identified_invaders()) > 0
+    assert [inv.pretty_representation() for inv in radar.get_identified_invaders()] == [
+        inv.pretty_representation() for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+def test_streaming_dp_area_radar_iter_scan_emits_invaders_before_the_map_ends():
+    # setup
+    scanner = BasicScanner(AsciiInvader("oo\n" "oo\n"))
+    lines = iter(["oo---", "oo---", "-----", "-----"])
+    radar = StreamingDPAreaRadar(AsciiStreamMap(lines), scanner)
+
+    # run
+    identified_invader = next(radar.iter_scan())
+
+    # assert
+    assert identified_invader.frame_coords_on_map == [[0, 0], [1, 1]]
+    assert list(lines) == ["-----", "-----"]
+
+
+@pytest.mark.parametrize(
+    "lines", [["ooo", "ooo"], ["oooo", "oooo", "oooo"]], ids=["too_short", "too_narrow"]
+)
+def test_streaming_dp_area_radar_scan_raises_map_too_small_exception(lines):
+    # setup
+    scanner = BasicScanner(AsciiInvader("ooooo\n" "ooooo\n" "ooooo\n"))
+    radar = StreamingDPAreaRadar(AsciiStreamMap(lines), scanner)
+
+    # run & assert
+    with pytest.raises(MapTooSmallException):
+        radar.scan()
+
+
+def test_non_maximum_suppressor_suppress():
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    other_invader = AsciiInvader("o-o\n" "-o-\n")
+    detections = [
+        (invader, [[0, 0], [2, 1]], 0.9),
+        (invader, [[1, 0], [3, 1]], 0.8),
+        (other_invader, [[1, 0], [3, 1]], 0.7),
+        (invader, [[2, 1], [4, 2]], 0.8),
+        (invader, [[3, 1], [5, 2]], 0.85),
+    ]
+    identified_invaders = [
+        AsciiIdentifiedInvader(original, [[0] * 3] * 2, ratio, coords)
+        for original, coords, ratio in detections
+    ]
+    suppressor = NonMaximumSuppressor()
+
+    # run
+    actual_result = suppressor.suppress(identified_invaders)
+    clusters = suppressor.cluster(identified_invaders)
+
+    # assert
+    assert [
+        (inv.original_invader, inv.frame_coords_on_map) for inv in actual_result
+    ] == [
+        (invader, [[0, 0], [2, 1]]),
+        (other_invader, [[1, 0], [3, 1]]),
+        (invader, [[3, 1], [5, 2]]),
+    ]
+    assert [len(cluster) for cluster in clusters] == [3, 1, 1]
+    assert [cluster[0] for cluster in clusters] == actual_result
+
+
+def test_non_maximum_suppressor_suppress_wraps_around_the_map():
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    detections = [
+        ([[0, 0], [2, 1]], 0.8),
+        ([[4, 2], [6, 3]], 0.7),
+        ([[7, 4], [1, 0]], 0.9),
+    ]
+    identified_invaders = [
+        AsciiIdentifiedInvader(invader, [[0] * 3] * 2, ratio, coords)
+        for coords, ratio in detections
+    ]
+    suppressor = NonMaximumSuppressor(map_width=8, map_height=5)
+
+    # run
+    actual_result = suppressor.suppress(identified_invaders)
+
+    # assert
+    assert [inv.frame_coords_on_map for inv in actual_result] == [
+        [[4, 2], [6, 3]],
+        [[7, 4], [1, 0]],
+    ]
+
+
+@pytest.mark.parametrize(
+    "radar_class,map_class",
+    [(DPAreaRadar, AsciiMap), (DPSphericalRadar, AsciiSphericalMap)],
+)
+def test_radar_get_non_overlapping_identified_invaders(
+    radar_class, map_class, noisy_map_string
+):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    radar = radar_class(map_class(noisy_map_string), scanner)
+    radar.scan()
+    suppressor = NonMaximumSuppressor(
+        *(radar.get_map_size() if radar.wraps_around else (None, None))
+    )
+
+    # run
+    actual_result = radar.get_non_overlapping_identified_invaders()
+
+    # assert
+    assert 0 < len(actual_result) < len(radar.get_identified_invaders())
+    rectangles = [suppressor.get_frame_rectangle(inv) for inv in actual_result]
+    assert not any(
+        suppressor.overlap(rectangle, other)
+        for i, rectangle in enumerate(rectangles)
+        for j, other in enumerate(rectangles)
+        if i < j
+    )
+
+
+@pytest.mark.parametrize(
+    "radar_factory,map_class",
+    [
+        (lambda map_, invaders: DPAreaRadar(map_, BasicScanner(invaders[0])), AsciiMap),
+        (
+            lambda map_, invaders: DPSphericalRadar(map_, BasicScanner(invaders[0])),
+            AsciiSphericalMap,
+        ),
+        (
+            lambda map_, invaders: CascadeDPSphericalRadar(
+                map_, CascadeScanner(invaders[0], similarity_threshold=0.8)
+            ),
+            AsciiSphericalMap,
+        ),
+        (
+            lambda map_, invaders: MultiTargetDPSphericalRadar.from_invaders(
+                map_, invaders, similarity_threshold=0.8
+            ),
+            AsciiSphericalMap,
+        ),
+    ],
+)
+def test_dp_radar_rescan_matches_full_scan(radar_factory, map_class, noisy_map_string):
+    # setup
+    invaders = [AsciiInvader("-o-\n" "ooo\n"), AsciiInvader("o-\n" "-o\n" "o-\n")]
+    changes = [(1, 0, 0), (4, 2, 1), (7, 5, 1), (0, 3, 1), (2, 2, 0)]
+    radar = radar_factory(map_class(noisy_map_string), invaders)
+    radar.scan()
+    previous_identified_invaders = [
+        (inv.original_invader, inv.frame_coords_on_map, list(map(list, inv.pattern)))
+        for inv in radar.get_identified_invaders()
+    ]
+    changed_map = map_class(noisy_map_string)
+    changed_map.apply_changes(changes)
+    reference_radar = radar_factory(changed_map, invaders)
+    reference_radar.scan()
+
+    # run
+    added, removed = radar.rescan(changes)
+
+    # assert
+    identified_invaders = [
+        (inv.original_invader, inv.frame_coords_on_map, list(map(list, inv.pattern)))
+        for inv in radar.get_identified_invaders()
+    ]
+    assert identified_invaders == [
+        (inv.original_invader, inv.frame_coords_on_map, list(map(list, inv.pattern)))
+        for inv in reference_radar.get_identified_invaders()
+    ]
+    assert len(added) > 0 and len(removed) > 0
+    assert [
+        (inv.original_invader, inv.frame_coords_on_map, list(map(list, inv.pattern)))
+        for inv in added
+    ] == [inv for inv in identified_invaders if inv not in previous_identified_invaders]
+    assert [
+        (inv.original_invader, inv.frame_coords_on_map, list(map(list, inv.pattern)))
+        for inv in removed
+    ] == [inv for inv in previous_identified_invaders if inv not in identified_invaders]
+    assert radar.dp_matrix == reference_radar.dp_matrix
+
+
+def test_dp_radar_rescan_without_changes():
+    # setup
+    radar = DPAreaRadar(
+        AsciiMap("o-o\n" "-o-\n"), BasicScanner(AsciiInvader("o-\n" "-o\n"))
+    )
+    radar.scan()
+
+    # run
+    added, removed = radar.rescan([(0, 0, 1), (1, 0, 0)])
+
+    # assert
+    assert added == removed == []
+    assert len(radar.get_identified_invaders()) == 1
+
+
+def test_dp_radar_rescan_rejects_invalid_changes():
+    # setup
+    map_ = AsciiMap("----\n" "----\n" "----\n")
+    invader = AsciiInvader("oo\n" "oo\n")
+    radar = DPAreaRadar(map_, BasicScanner(invader))
+    radar.scan()
+    changes = [(0, 0, 1), (1, 0, 1), (0, 1, 1), (1, 1, 1), (99, 0, 1)]
+
+    # run
+    with pytest.raises(InvalidMapChangeException):
+        radar.rescan(changes)
+    rejected_map = str(map_)
+    rejected_identified_invaders = radar.get_identified_invaders()
+    rejected_dp_matrix = [list(row) for row in radar.dp_matrix]
+    added, removed = radar.rescan(changes[:-1])
+
+    # assert
+    assert rejected_map == "0000\n" "0000\n" "0000"
+    assert rejected_identified_invaders == []
+    assert rejected_dp_matrix == DPAreaRadar.compute_dp_matrix(AsciiMap("----\n" * 3))
+    assert [inv.frame_coords_on_map for inv in added] == [[[0, 0], [1, 1]]]
+    assert removed == []
+    assert radar.dp_matrix == DPAreaRadar.compute_dp_matrix(map_)
+
+
+@pytest.mark.parametrize(
+    "radar_class,map_class",
+    [(DPAreaRadar, AsciiMap), (DPSphericalRadar, AsciiSphericalMap)],
+)
+def test_dp_radar_iter_scan_with_limit(radar_class, map_class, noisy_map_string):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    radar = radar_class(map_class(noisy_map_string), LosslessScanner(invader, 0.8))
+    reference_radar = radar_class(
+        map_class(noisy_map_string), LosslessScanner(invader, 0.8)
+    )
+    reference_radar.scan()
+
+    # run
+    identified_invaders = list(radar.iter_scan(limit=2))
+
+    # assert
+    assert [inv.frame_coords_on_map for inv in identified_invaders] == [
+        inv.frame_coords_on_map for inv in reference_radar.get_identified_invaders()[:2]
+    ]
+    assert radar.get_identified_invaders() == []
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 100])
+@pytest.mark.parametrize(
+    "radar_class,map_class",
+    [(DPAreaRadar, AsciiMap), (DPSphericalRadar, AsciiSphericalMap)],
+)
+def test_dp_radar_iter_scan_with_top_k(radar_class, map_class, top_k, noisy_map_string):
+    # setup
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    scanner = LosslessScanner(invader, 0.6)
+    radar = radar_class(map_class(noisy_map_string), scanner)
+    reference_scanner = LosslessScanner(invader, 0.6)
+    reference_radar = radar_class(map_class(noisy_map_string), reference_scanner)
+    reference_radar.scan()
+    expected_identified_invaders = sorted(
+        reference_radar.get_identified_invaders(),
+        key=lambda inv: -inv.similarity_ratio,
+    )[:top_k]
+
+    # run
+    identified_invaders = list(radar.iter_scan(top_k=top_k))
+
+    # assert
+    assert [
+        (inv.frame_coords_on_map, inv.similarity_ratio) for inv in identified_invaders
+    ] == [
+        (inv.frame_coords_on_map, inv.similarity_ratio)
+        for inv in expected_identified_invaders
+    ]
+    assert scanner.similarity_threshold == 0.6
+    assert scanner.min_signal_bits == reference_scanner.min_signal_bits
+    if top_k < len(reference_radar.get_identified_invaders()):
+        # the raised cutoff prunes the frames that cannot make it into the top
+        assert scanner.pruned_frames > reference_scanner.pruned_frames
+
+
+def test_multi_target_radar_iter_scan_with_top_k(noisy_map_string):
+    # setup
+    invaders = [AsciiInvader("-o-\n" "ooo\n"), AsciiInvader("o-\n" "-o\n" "o-\n")]
+    radar = MultiTargetDPSphericalRadar.from_invaders(
+        AsciiSphericalMap(noisy_map_string), invaders, similarity_threshold=0.8
+    )
+    reference_radar = MultiTargetDPSphericalRadar.from_invaders(
+        AsciiSphericalMap(noisy_map_string), invaders, similarity_threshold=0.8
+    )
+    reference_radar.scan()
+
+    # run
+    identified_invaders = list(radar.iter_scan(top_k=4))
+
+    # assert
+    assert [
+        (inv.original_invader, inv.frame_coords_on_map) for inv in identified_invaders
+    ] == [
+        (inv.original_invader, inv.frame_coords_on_map)
+        for inv in sorted(
+            reference_radar.get_identified_invaders(),
+            key=lambda inv: -inv.similarity_ratio,
+        )[:4]
+    ]
+    assert all(scanner.similarity_threshold == 0.8 for scanner in radar.scanners)
+
+
+@pytest.mark.parametrize(
+    "radar_class,reference_radar_class,map_class",
+    [
+        (OrientationInvariantDPAreaRadar, DPAreaRadar, AsciiMap),
+        (OrientationInvariantDPSphericalRadar, DPSphericalRadar, AsciiSphericalMap),
+    ],
+)
+def test_orientation_invariant_radar_scan(
+    radar_class, reference_radar_class, map_class, noisy_map_string
+):
+    # setup
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    radar = radar_class(map_class(noisy_map_string), LosslessScanner(invader, 0.8))
+    expected_identified_invaders = {}
+    for name, variant in invader.variants.items():
+        reference_radar = reference_radar_class(
+            map_class(noisy_map_string), LosslessScanner(variant, 0.8)
+        )
+        reference_radar.scan()
+        expected_identified_invaders[name] = [
+            (inv.frame_coords_on_map, inv.similarity_ratio)
+            for inv in reference_radar.get_identified_invaders()
+        ]
+
+    # run
+    radar.scan()
+
+    # assert
+    assert len(radar.scanners) == 8
+    identified_invaders = {
+        name: [
+            (inv.frame_coords_on_map, inv.similarity_ratio)
+            for inv in identified_invaders
+        ]
+        for name, identified_invaders in (
+            radar.get_identified_invaders_by_orientation().items()
+        )
+    }
+    assert identified_invaders == expected_identified_invaders
+    assert any(identified_invaders[name] for name in ("rotate_90", "mirror"))
+    assert all(
+        radar.get_orientation(inv) in invader.variants
+        for inv in radar.get_identified_invaders()
+    )
+
+
+@requires_numpy
+@pytest.mark.parametrize(
+    "radar_class,map_class,invader_class",
+    [
+        (DPAreaRadar, AsciiMap, AsciiInvader),
+        (DPSphericalRadar, AsciiSphericalMap, AsciiInvader),
+        (DPSphericalRadar, ArrayAsciiSphericalMap, ArrayAsciiInvader),
+        (CascadeDPSphericalRadar, AsciiSphericalMap, AsciiInvader),
+    ],
+)
+def test_dp_radar_scan_with_dp_cache(
+    tmp_path, radar_class, map_class, invader_class, noisy_map_string
+):
+    # setup
+    invader = invader_class("-o-\n" "ooo\n")
+    cache = SummedAreaTableCache(tmp_path)
+    reference_radar = radar_class(map_class(noisy_map_string), CascadeScanner(invader))
+    reference_radar.scan()
+    radar_class(map_class(noisy_map_string), CascadeScanner(invader), dp_cache=cache)
+
+    # run
+    radar = radar_class(
+        map_class(noisy_map_string), CascadeScanner(invader), dp_cache=cache
+    )
+    radar.scan()
+
+    # assert
+    assert len(os.listdir(tmp_path)) == 1
+    assert [inv.frame_coords_on_map for inv in radar.get_identified_invaders()] == [
+        inv.frame_coords_on_map for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+@requires_numpy
+def test_parallel_radar_scan_with_dp_cache(tmp_path, noisy_map_string):
+    # setup
+    scanner = BasicScanner(AsciiInvader("-o-\n" "ooo\n"), similarity_threshold=0.6)
+    cache = SummedAreaTableCache(tmp_path)
+    reference_radar = DPAreaRadar(AsciiMap(noisy_map_string), scanner)
+    reference_radar.scan()
+    ParallelDPAreaRadar(
+        AsciiMap(noisy_map_string), scanner, max_workers=2, dp_cache=cache
+    ).scan()
+
+    # run
+    radar = ParallelDPAreaRadar(
+        AsciiMap(noisy_map_string), scanner, max_workers=2, dp_cache=cache
+    )
+    radar.scan()
+
+    # assert
+    assert len(os.listdir(tmp_path)) == 2
+    assert [inv.frame_coords_on_map for inv in radar.get_identified_invaders()] == [
+        inv.frame_coords_on_map for inv in reference_radar.get_identified_invaders()
+    ]
+
+
+def test_radars_share_the_derived_structures_of_their_map(noisy_map_string):
+    # setup
+    map_ = AsciiMap(noisy_map_string)
+    spherical_map = map_.view_as(AsciiSphericalMap)
+    invader = AsciiInvader("-o-\n" "ooo\n")
+    radar = DPAreaRadar(map_, BasicScanner(invader))
+    cascade_radar = CascadeDPSphericalRadar(spherical_map, CascadeScanner(invader))
+
+    # run
+    other_radar = DPAreaRadar(map_, BasicScanner(AsciiInvader("o-\n" "-o\n")))
+    spherical_radar = DPSphericalRadar(spherical_map, BasicScanner(invader))
+    other_cascade_radar = CascadeDPSphericalRadar(map_, CascadeScanner(invader))
+    radar.scan()
+    radar.rescan([(0, 0, 1), (3, 4, 0)])
+    rescanned_radar = DPAreaRadar(map_, BasicScanner(invader))
+
+    # assert
+    assert other_radar.dp_matrix is radar.dp_matrix
+    assert spherical_radar.dp_matrix is cascade_radar.dp_matrix
+    assert spherical_radar.dp_matrix is not radar.dp_matrix
+    assert other_cascade_radar.rows_prefix_sums is cascade_radar.rows_prefix_sums
+    assert rescanned_radar.dp_matrix is radar.dp_matrix
+    assert radar.dp_matrix == DPAreaRadar.compute_dp_matrix(map_)
+    assert DPSphericalRadar(spherical_map, BasicScanner(invader)).dp_matrix == (
+        DPSphericalRadar.compute_dp_matrix(map_, 2, 1)
+    )
+
+
+@requires_numpy
+@pytest.mark.parametrize("invader_class", [AsciiInvader, BitsetAsciiInvader])
+@pytest.mark.parametrize(
+    "radar_class,map_class,array_map_class",
+    [
+        (DPAreaRadar, AsciiMap, ArrayAsciiMap),
+        (DPSphericalRadar, AsciiSphericalMap, ArrayAsciiSphericalMap),
+    ],
+)
+def test_dp_radar_scan_array_map_with_non_array_invader(
+    radar_class, map_class, array_map_class, invader_class, noisy_map_string
+):
+    # setup
+    invader = invader_class("-o-\n" "ooo\n")
+    reference_radar = radar_class(map_class(noisy_map_string), BasicScanner(invader))
+    reference_radar.scan()
+
+    # run
+    radar = radar_class(array_map_class(noisy_map_string), BasicScanner(invader))
+    radar.scan()
+
+    # assert
+    assert [inv.frame_coords_on_map for inv in radar.get_identified_invaders()] == [
+        inv.frame_coords_on_map for inv in reference_radar.get_identified_invaders()
+    ]
@@ -3,7 +3,10 @@ from unittest import mock
 import pytest
 
 from core.types import Frame
+from invaders.ascii import AsciiInvader
 from scanners.basic import BasicScanner
+from scanners.cascade import CascadeScanner
+from scanners.lossless import LosslessScanner
 
 
 @pytest.mark.parametrize(
@@ -34,7 +37,7 @@ def test_basic_scanner_init(
 def test_basic_scanner_process_frame():
     # setup
     invader = mock.Mock()
-    invader.match_against_frame.return_value = 0.2
+    invader.match_against_frame_with_threshold.return_value = 0.2
     invader.signal_ratio = 0.4
     scanner = BasicScanner(invader)
     frame = Frame([[1, 2]])
@@ -45,7 +48,7 @@ def test_basic_scanner_process_frame():
 
     # assert
     assert actual_result == expected_result
-    invader.match_against_frame.assert_called_once_with(frame)
+    invader.match_against_frame_with_threshold.assert_called_once_with(frame, 0.7)
 
 
 def test_basic_scanner_is_worth_processing_frame():
@@ -80,3 +83,142 @@ def test_basic_scanner_required_frame_size():
 
     # assert
     assert actual_result == expected_result
+
+
+@pytest.mark.parametrize(
+    "signal_bits,expected_result",
+    [(2, False), (3, True), (5, True), (7, True), (8, False)],
+)
+def test_lossless_scanner_is_worth_processing_frame(signal_bits, expected_result):
+    # setup
+    invader = mock.Mock()
+    invader.number_of_signal_bits = 5
+    invader.get_max_mismatched_bits.return_value = 2
+    scanner = LosslessScanner(invader, similarity_threshold=0.8)
+
+    # run
+    actual_result = scanner.is_worth_processing_frame(signal_bits)
+
+    # assert
+    assert actual_result == expected_result
+    invader.get_max_mismatched_bits.assert_called_once_with(0.8)
+
+
+def test_lossless_scanner_set_similarity_threshold():
+    # setup
+    invader = mock.Mock()
+    invader.number_of_signal_bits = 5
+    invader.get_max_mismatched_bits.side_effect = [2, 1]
+    scanner = LosslessScanner(invader, similarity_threshold=0.8)
+
+    # run
+    scanner.set_similarity_threshold(0.9)
+
+    # assert
+    assert scanner.similarity_threshold == 0.9
+    assert (scanner.min_signal_bits, scanner.max_signal_bits) == (4, 6)
+    invader.get_max_mismatched_bits.assert_called_with(0.9)
+
+
+def test_lossless_scanner_record_pruned_frames():
+    # setup
+    invader = mock.Mock()
+    invader.number_of_signal_bits = 5
+    invader.get_max_mismatched_bits.return_value = 2
+    scanner = LosslessScanner(invader)
+
+    # run
+    scanner.record_pruned_frames(3)
+    scanner.record_pruned_frames(4)
+
+    # assert
+    assert scanner.pruned_frames == 7
+
+
+@pytest.mark.parametrize(
+    "rows_signal_bits,columns_signal_bits,expected_result",
+    [
+        ([2, 4, 2], [2, 3, 2, 1], (True, True)),
+        ([3, 4, 1], [2, 3, 1, 1], (False, True)),
+        ([2, 4, 2], [2, 2, 2, 2], (True, False)),
+    ],
+)
+def test_cascade_scanner_stages(rows_signal_bits, columns_signal_bits, expected_result):
+    # setup
+    invader = AsciiInvader("oo--\n" "oooo\n" "-oo-\n")
+    scanner = CascadeScanner(invader, similarity_threshold=0.9)
+
+    # run
+    actual_result = (
+        scanner.is_worth_processing_rows(rows_signal_bits),
+        scanner.is_worth_processing_columns(columns_signal_bits),
+    )
+
+    # assert
+    assert scanner.rows_signal_bits == [2, 4, 2]
+    assert scanner.columns_signal_bits == [2, 3, 2, 1]
+    assert actual_result == expected_result
+    assert scanner.pruned_frames_by_rows == (not expected_result[0])
+    assert scanner.pruned_frames_by_columns == (not expected_result[1])
+
+
+@pytest.mark.parametrize(
+    "min_signal_bits,max_signal_bits,expected_result",
+    [(0, 2, False), (0, 3, True), (5, 9, True), (8, 9, False)],
+)
+def test_scanners_is_worth_processing_frames(
+    min_signal_bits, max_signal_bits, expected_result
+):
+    # setup
+    invader = mock.Mock()
+    invader.number_of_total_bits = 10
+    invader.number_of_signal_bits = 5
+    invader.get_max_mismatched_bits.return_value = 2
+    invader.signal_ratio = 0.4
+    lossless_scanner = LosslessScanner(invader)
+    basic_scanner = BasicScanner(invader, signal_threshold=0.3)
+
+    # run
+    actual_result = lossless_scanner.is_worth_processing_frames(
+        min_signal_bits, max_signal_bits
+    )
+
+    # assert
+    assert actual_result == expected_result
+    assert basic_scanner.is_worth_processing_frames(
+        min_signal_bits, max_signal_bits
+    ) == (max_signal_bits >= 3)
+
+
+@pytest.mark.parametrize(
+    "scanner_class", [BasicScanner, LosslessScanner, CascadeScanner]
+)
+def test_scanner_for_invader(scanner_class):
+    # setup
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    variant = invader.variants["rotate_90"]
+    scanner = scanner_class(invader, similarity_threshold=0.8)
+
+    # run
+    variant_scanner = scanner.for_invader(variant)
+
+    # assert
+    assert type(variant_scanner) is scanner_class
+    assert variant_scanner.invader_target is variant
+    assert scanner.invader_target is invader
+    assert variant_scanner.similarity_threshold == 0.8
+    assert variant_scanner.required_frame_coords == (2, 3)
+
+
+def test_cascade_scanner_for_invader_profiles():
+    # setup
+    invader = AsciiInvader("oo-\n" "-o-\n")
+    scanner = CascadeScanner(invader, similarity_threshold=0.8)
+
+    # run
+    variant_scanner = scanner.for_invader(invader.variants["rotate_90"])
+
+    # assert
+    assert variant_scanner.rows_signal_bits == [1, 2, 0]
+    assert variant_scanner.columns_signal_bits == [1, 2]
+    assert scanner.rows_signal_bits == [2, 1]